@@ -2,7 +2,12 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ------------------------------------------------------------------------------
 from azdata.cli.core.deploy import DeploymentConfigUtil
-from azdata.cli.commands.arc.constants import CONFIG_DIR
+from azdata.cli.commands.arc.constants import (
+    CONFIG_DIR,
+    EXPORT_DEFAULT_PARALLELISM,
+    EXPORT_TASK_TIMEOUT,
+    UPLOAD_DEFAULT_PARALLELISM)
+from azdata.cli.commands.arc.trace_util import TRACE_FILE_HELP
 
 
 def load_arguments(self, _):
@@ -87,6 +92,12 @@ def load_arguments(self, _):
             help=_("Comma-separated list of labels to apply to all external data controller services.")
         )
 
+        arg_context.argument(
+            "trace_file",
+            options_list=("--trace-file"),
+            help=_(TRACE_FILE_HELP)
+        )
+
     with ArgumentsContext(self, "arc dc delete") as arg_context:
         arg_context.argument(
             "name",
@@ -452,6 +463,44 @@ def load_arguments(self, _):
             help=_("Force create output file. Overwrites any existing file at the same path.")
         )
 
+        arg_context.argument(
+            "parallelism",
+            options_list=("--parallelism"),
+            type=int,
+            help=_("The maximum number of data files to download, and of data controllers to export from, "
+                   "concurrently. Each download holds a whole data file in memory. "
+                   "Defaults to {}.").format(EXPORT_DEFAULT_PARALLELISM)
+        )
+
+        arg_context.argument(
+            "timeout",
+            options_list=("--timeout"),
+            type=int,
+            help=_("The maximum time in seconds to wait for the export task to complete. Defaults to {}.").format(
+                EXPORT_TASK_TIMEOUT)
+        )
+
+        arg_context.argument(
+            "namespaces",
+            options_list=("--namespaces"),
+            help=_("A comma separated list of namespaces whose data controllers are exported. Each data controller "
+                   "is exported to its own file, named by adding the namespace to the file name of --path.")
+        )
+
+        arg_context.argument(
+            "all_namespaces",
+            options_list=("--all-namespaces"),
+            action="store_true",
+            help=_("Export from every data controller in the cluster. Each data controller is exported to its own "
+                   "file, named by adding the namespace to the file name of --path.")
+        )
+
+        arg_context.argument(
+            "trace_file",
+            options_list=("--trace-file"),
+            help=_(TRACE_FILE_HELP)
+        )
+
     with ArgumentsContext(self, "arc dc upload") as arg_context:
         arg_context.argument(
             "path",
@@ -459,6 +508,21 @@ def load_arguments(self, _):
             help=_("The full or relative path including the file name of the file to be uploaded.")
         )
 
+        arg_context.argument(
+            "parallelism",
+            options_list=("--parallelism"),
+            type=int,
+            help=_("The maximum number of Azure resources to create or delete concurrently, and of instances "
+                   "whose logs are uploaded to Log Analytics concurrently. Defaults to {}.").format(
+                UPLOAD_DEFAULT_PARALLELISM)
+        )
+
+        arg_context.argument(
+            "trace_file",
+            options_list=("--trace-file"),
+            help=_(TRACE_FILE_HELP)
+        )
+
     with ArgumentsContext(self, "arc resource-kind get") as arg_context:
         arg_context.argument(
             "kind",
@@ -4,10 +4,14 @@
 import atexit
 import json
 import os
+import tempfile
+import threading
+import time
 
 import msal
 from azdata.cli.commands.arc.azure.models.spn import Spn
 from azdata.cli.commands.arc.common_util import get_config_file
+from azdata.cli.commands.arc.trace_util import traced
 from azdata.cli.core.configuration import Configuration
 from azdata.cli.core.deploy import display
 from azdata.cli.core.prompt import prompt_for_input
@@ -17,29 +21,56 @@ from . import constants as azure_constants
 
 log = get_logger(__name__)
 
+_lock = threading.RLock()
+_prompt_lock = threading.Lock()
+_prompted_spn = None
+_access_tokens = {}
+_msal_apps = {}
+_msal_cache = None
+
 # #############################################################################
 # -- AAD related functions --
 # #############################################################################
 
+@traced("aad")
 def acquire_token(scopes):
     """
-    Obtains AAD bearer token for given scope
+    Obtains AAD bearer token for given scope. Tokens are cached for the
+    lifetime of the process and reused until they are about to expire.
     """
     spn = _check_for_spn()
 
-    token = None
-    while not token:
-        try:
-            token = _get_token_using_msal(spn, scopes)
-        except BaseException:
-            display('Service principal "{}" failed to authenticate with Azure. Please try again\n'.format(spn.client_id))
-            
-        # If we did not get a token, prompt for spn
-        if not token:
-            spn = _prompt_for_spn()
+    while True:
+        with _lock:
+            token = _get_cached_token(spn, scopes)
+            if not token:
+                try:
+                    token = _get_token_using_msal(spn, scopes)
+                except BaseException:
+                    display('Service principal "{}" failed to authenticate with Azure. Please try again\n'.format(spn.client_id))
+
+            if token:
+                _store_spn_in_env(spn)
+                return token
+
+        # If we did not get a token, prompt for spn. The token cache is not locked
+        # meanwhile, so other threads are not blocked while the user types.
+        spn = _prompt_for_spn(failed=spn)
+
+
+def _token_key(spn, scopes):
+    return spn.client_id, spn.tenant_id, tuple(scopes)
+
 
-    _store_spn_in_env(spn)
-    return token
+def _get_cached_token(spn, scopes):
+    """
+    Returns the in-process token for the service principal and scope(s),
+    or None if there is none or it expires within the refresh margin.
+    """
+    entry = _access_tokens.get(_token_key(spn, scopes))
+    if entry and entry[1] - azure_constants.AAD_TOKEN_REFRESH_MARGIN > time.time():
+        return entry[0]
+    return None
 
 
 def _check_for_spn():
@@ -48,25 +79,31 @@ def _check_for_spn():
     or contained in config_file. Returns spn if found, prompts
     user for spn otherwise
     """
-    spn = Spn()
-
-    # Check if spn in environment
-    get_spn_from_env = True
-    for spn_env in azure_constants.SPN_ENV_KEYS.values():
-        if spn_env not in os.environ or not os.environ[spn_env]:
-            get_spn_from_env = False
-            break
-    if get_spn_from_env:
-        spn.authority = os.environ[azure_constants.SPN_ENV_KEYS["authority"]]
-        spn.tenant_id = os.environ[azure_constants.SPN_ENV_KEYS["tenant_id"]]
-        spn.client_id = os.environ[azure_constants.SPN_ENV_KEYS["client_id"]]
-        spn.client_secret = os.environ[azure_constants.SPN_ENV_KEYS["client_secret"]]
+    spn = _get_spn_from_env()
+    if spn is not None:
         return spn
     else:
         # Prompt the user
         return _prompt_for_spn()
 
 
+def _get_spn_from_env():
+    """
+    Returns the service principal stored in the environment, or None if any
+    of its values is missing.
+    """
+    for spn_env in azure_constants.SPN_ENV_KEYS.values():
+        if spn_env not in os.environ or not os.environ[spn_env]:
+            return None
+
+    spn = Spn()
+    spn.authority = os.environ[azure_constants.SPN_ENV_KEYS["authority"]]
+    spn.tenant_id = os.environ[azure_constants.SPN_ENV_KEYS["tenant_id"]]
+    spn.client_id = os.environ[azure_constants.SPN_ENV_KEYS["client_id"]]
+    spn.client_secret = os.environ[azure_constants.SPN_ENV_KEYS["client_secret"]]
+    return spn
+
+
 def _store_spn_in_env(spn: Spn):
     """
     Stores service principal object in environment
@@ -85,20 +122,35 @@ def _store_spn_in_env(spn: Spn):
         raise ValueError("The following service principal values are missing: {}".format(", ".join(missing_keys)))
 
 
-def _prompt_for_spn():
+def _prompt_for_spn(failed=None):
     """
-    Prompts the user to enter the service principal info
+    Prompts the user to enter the service principal info. Only one thread
+    prompts at a time, threads that waited for it use what was entered.
+    :param failed: Service principal that failed to authenticate, which is
+                   not returned again.
     """
-    spn = Spn()
+    global _prompted_spn
 
-    display('Please provide the service principal information for upload:')
-    # public cloud we can use the default login url
-    spn.authority = azure_constants.PUBLIC_CLOUD_LOGIN_URL
-    spn.tenant_id = prompt_for_input('Service principal tenant id: ')
-    spn.client_id = prompt_for_input('Service principal client id: ')
-    spn.client_secret = prompt_for_input('Service principal secret: ')
+    with _prompt_lock:
+        for spn in (_get_spn_from_env(), _prompted_spn):
+            if spn is not None and (failed is None or _spn_key(spn) != _spn_key(failed)):
+                return spn
 
-    return spn
+        spn = Spn()
+
+        display('Please provide the service principal information for upload:')
+        # public cloud we can use the default login url
+        spn.authority = azure_constants.PUBLIC_CLOUD_LOGIN_URL
+        spn.tenant_id = prompt_for_input('Service principal tenant id: ')
+        spn.client_id = prompt_for_input('Service principal client id: ')
+        spn.client_secret = prompt_for_input('Service principal secret: ')
+
+        _prompted_spn = spn
+        return spn
+
+
+def _spn_key(spn):
+    return spn.authority, spn.tenant_id, spn.client_id, spn.client_secret
 
 
 def _get_token_using_msal(spn, scopes):
@@ -112,22 +164,7 @@ def _get_token_using_msal(spn, scopes):
     
     :return: auth token string, None if auth fails
     """
-    cache = msal.SerializableTokenCache()
-    cache_file = _get_cache_file()
-    if os.path.exists(cache_file):
-        cache.deserialize(open(cache_file, "r").read())
-    atexit.register(
-        lambda: open(cache_file, "w").write(cache.serialize())
-        if cache.has_state_changed
-        else None
-    )
-
-    app = msal.ConfidentialClientApplication(
-        spn.client_id,
-        spn.client_secret,
-        azure_constants.AAD_LOGIN_URL + spn.tenant_id,
-        token_cache=cache,
-    )
+    app = _get_msal_app(spn)
 
     # First look up a token from cache, since we are looking for token for the current app, NOT for an end user.
     # Notice we give account parameter as None.
@@ -138,6 +175,8 @@ def _get_token_using_msal(spn, scopes):
         log.info("No suitable token exists in cache. Get a new one from AAD.")
         result = app.acquire_token_for_client(scopes)
     if "access_token" in result:
+        expires_in = int(result.get("expires_in") or 0)
+        _access_tokens[_token_key(spn, scopes)] = (result["access_token"], time.time() + expires_in)
         return result["access_token"]
     else:
         log.error("Failed to get access token from AAD with the following error")
@@ -146,6 +185,61 @@ def _get_token_using_msal(spn, scopes):
         log.error('Correlation Id: "{}"'.format(result.get("correlation_id")))
 
 
+def _get_msal_app(spn):
+    """
+    Returns the MSAL application for the service principal, building it
+    once per process on top of the shared serializable token cache.
+    """
+    key = (spn.client_id, spn.tenant_id, spn.client_secret)
+    app = _msal_apps.get(key)
+    if app is None:
+        app = msal.ConfidentialClientApplication(
+            spn.client_id,
+            spn.client_secret,
+            azure_constants.AAD_LOGIN_URL + spn.tenant_id,
+            token_cache=_get_msal_cache(),
+        )
+        _msal_apps[key] = app
+    return app
+
+
+def _get_msal_cache():
+    """
+    Loads the MSAL token cache file once and registers a single writer that
+    flushes it back at exit.
+    """
+    global _msal_cache
+
+    if _msal_cache is None:
+        cache = msal.SerializableTokenCache()
+        cache_file = _get_cache_file()
+        with open(cache_file, "r") as f:
+            content = f.read()
+        if content:
+            cache.deserialize(content)
+        atexit.register(_flush_msal_cache, cache, cache_file)
+        _msal_cache = cache
+    return _msal_cache
+
+
+def _flush_msal_cache(cache, cache_file):
+    """
+    Atomically replaces the token cache file if the cache has changed.
+    """
+    if not cache.has_state_changed:
+        return
+
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(cache.serialize())
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        log.info("Failed to write AAD token cache file: {}".format(e))
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
 def _get_cache_file():
     """
     Get token cache file
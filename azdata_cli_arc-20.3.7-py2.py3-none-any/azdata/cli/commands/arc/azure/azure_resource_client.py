@@ -3,21 +3,25 @@
 # ------------------------------------------------------------------------------
 
 import atexit
+import base64
 import json
 import os
+import threading
 import uuid
+import zlib
 from azdata.cli.commands.arc.export_util import format_sqlmi_license_type_for_azure, format_sqlmi_tier_for_azure
 import pydash as _
 import msal
 import requests
 from requests.exceptions import HTTPError
 from azdata.cli.commands.arc.azure.ad_auth_util import acquire_token
+from azdata.cli.commands.arc.constants import CONNECTION_RETRY_ATTEMPTS, RETRY_INTERVAL
+from azdata.cli.commands.arc.retry_util import retry
 from azdata.cli.core.deploy import display
 from azdata.cli.core.exceptions import http_status_codes, ServerError, RequestTimeoutError
 from azdata.cli.core.logging import get_logger
 from azdata.cli.core.output import OutputStream
 from azdata.cli.core.prompt import prompt_for_input
-import azdata.cli.core.deploy as util
 from azdata.cli.commands.sqlmi.constants import (
     SQLMI_TIER_GENERAL_PURPOSE,
     SQLMI_TIER_BUSINESS_CRITICAL,
@@ -30,9 +34,7 @@ from urllib3.exceptions import NewConnectionError, MaxRetryError, TimeoutError
 
 from . import constants as azure_constants
 from .models.spn import Spn
-
-CONNECTION_RETRY_ATTEMPTS = 12
-RETRY_INTERVAL = 5
+from .session import create_session
 
 log = get_logger(__name__)
 err_msg = '\tFailed to {} resource: "{}" with error: "{}"'
@@ -45,6 +47,32 @@ class AzureResourceClient(object):
     Azure Resource Client
     """
 
+    def __init__(self, pool_size=azure_constants.HTTP_POOL_SIZE, http2=None):
+        """
+        :param pool_size: Maximum number of pooled connections kept open per host.
+        :param http2: Use HTTP/2 for ARM and DPS calls. Defaults to the
+                      `ARC_HTTP2_ENABLED` environment variable.
+        """
+        if http2 is None:
+            http2 = os.environ.get(azure_constants.HTTP2_ENV_KEY, '').lower() in ('1', 'true', 'yes')
+
+        self._pool_size = pool_size
+        self._http2 = http2
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        Keep-alive session shared by every ARM and DPS request made by this
+        client, created on first use.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = create_session(pool_size=self._pool_size, http2=self._http2)
+        return self._session
+
     @property
     def stderr(self):
         return OutputStream().stderr.write
@@ -86,7 +114,7 @@ class AzureResourceClient(object):
             subscription_id, resource_group_name, instance_type, resource_name
         )
         try:
-            response = requests.put(
+            response = self.session.put(
                 url, headers=self._get_header(resource_uri), data=json.dumps(params)
             )
             response.raise_for_status()
@@ -97,13 +125,14 @@ class AzureResourceClient(object):
             if "error" in response_json_string and "message" in response_json_string["error"]:
                 self.stderr(response_json_string["error"]["message"])
             log.error(err_msg.format("Create", resource_name, e.response.text))
+            raise
 
     def _get_azure_resource(self, resource_name, instance_type, subscription_id, resource_group_name):
         url, resource_uri = self._get_request_url(
             subscription_id, resource_group_name, instance_type, resource_name
         )
         try:
-            response = requests.get(url, headers=self._get_header(resource_uri))
+            response = self.session.get(url, headers=self._get_header(resource_uri))
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             log.error(err_msg.format("Get", resource_name, e.response.text))
@@ -125,7 +154,7 @@ class AzureResourceClient(object):
                 resource_name,
             )
 
-            response = requests.delete(url, headers=self._get_header(resource_uri))
+            response = self.session.delete(url, headers=self._get_header(resource_uri))
             response.raise_for_status()
 
             if response.status_code != requests.codes['no_content']:
@@ -133,7 +162,11 @@ class AzureResourceClient(object):
                 log.info('Delete Azure resource {} response header: {}'.format(resource_uri, response.headers))
 
         except requests.exceptions.HTTPError as e:
+            if e.response.status_code == requests.codes['not_found']:
+                log.info('Azure resource {} was already deleted.'.format(resource_name))
+                return
             log.error(err_msg.format("Delete", resource_name, e.response.text))
+            raise
 
     def create_azure_data_controller(
             self,
@@ -174,7 +207,7 @@ class AzureResourceClient(object):
             resource_name,
         )
 
-        response = requests.put(
+        response = self.session.put(
             url, headers=self._get_header(resource_uri), data=json.dumps(params)
         )
         try:
@@ -230,9 +263,8 @@ class AzureResourceClient(object):
                        + azure_constants.API_VERSION
                ), resource_uri
 
-    @staticmethod
-    def _post(url, body, headers):
-        response = requests.post(url, data=body, headers=headers)
+    def _post(self, url, body, headers):
+        response = self.session.post(url, data=body, headers=headers)
 
         try:
             response.raise_for_status()
@@ -260,8 +292,6 @@ class AzureResourceClient(object):
         usages,
         signature,
     ):
-        import base64
-
         blob = {
             "requestType": "usageUpload",
             "clusterId": cluster_id,
@@ -280,23 +310,17 @@ class AzureResourceClient(object):
             },
         }
 
-        data_base64 = base64.b64encode(json.dumps(blob).encode("utf-8"))
         headers = self._build_dps_header(correlation_vector)
         url = "https://san-af-{}-prod.azurewebsites.net/api/subscriptions/{}/resourcegroups/{}/providers/Microsoft.AzureArcData/dataControllers/{}?api-version=2021-06-01-preview".format(location, subscription_id, resource_group_name, name)
 
-        body = (
-            b'{"$schema": "https://microsoft.azuredata.com/azurearc/pipeline/usagerecordsrequest.06-2021.schema.json","blob": "'
-            + data_base64
-            + b'"}'
-        )
-
         log.info('Usage upload request_url: {}'.format(url))
 
-        response = util.retry(lambda: self._post(url, body, headers),
-                              retry_count=CONNECTION_RETRY_ATTEMPTS,
-                              retry_delay=RETRY_INTERVAL,
-                              retry_method="upload usages dps",
-                              retry_on_exceptions=(NewConnectionError, MaxRetryError, TimeoutError, RequestTimeoutError, ServerError))
+        # A new body stream is needed for every attempt
+        response = retry(lambda: self._post(url, _iter_gzip_dps_body(blob), headers),
+                         retry_count=CONNECTION_RETRY_ATTEMPTS,
+                         retry_delay=RETRY_INTERVAL,
+                         retry_method="upload usages dps",
+                         retry_on_exceptions=(NewConnectionError, MaxRetryError, TimeoutError, RequestTimeoutError, ServerError))
 
         if response.ok:
             success_msg = "Uploaded {} usage records to Azure {}.".format(len(usages), url)
@@ -326,3 +350,36 @@ class AzureResourceClient(object):
         params['sku'] = sku
         params['properties']['licenseType'] = format_sqlmi_license_type_for_azure(license_type)
         
+
+
+def _iter_gzip_dps_body(blob):
+    """
+    Yields the gzip compressed DPS usage request body. The blob is encoded,
+    base64 encoded and compressed incrementally, so the uncompressed body is
+    never held in memory as a whole.
+    :param blob: The usage upload blob.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    chunk_size = azure_constants.DPS_STREAM_CHUNK_SIZE
+    pending = bytearray()
+
+    def compress(data):
+        # Empty chunks would terminate a chunked transfer early
+        out = compressor.compress(data)
+        return [out] if out else []
+
+    for out in compress(b'{"$schema": "' + azure_constants.DPS_USAGE_REQUEST_SCHEMA.encode("utf-8") + b'","blob": "'):
+        yield out
+
+    for piece in json.JSONEncoder().iterencode(blob):
+        pending += piece.encode("utf-8")
+        if len(pending) >= chunk_size:
+            # Only encode whole base64 groups so the chunks concatenate cleanly
+            cut = len(pending) - len(pending) % 3
+            for out in compress(base64.b64encode(pending[:cut])):
+                yield out
+            del pending[:cut]
+
+    for out in compress(base64.b64encode(pending) + b'"}'):
+        yield out
+    yield compressor.flush()
@@ -161,6 +161,11 @@ AAD_PROFILE_FILENAME = 'aad-profile.json'
 AAD token cache file name
 """
 
+AAD_TOKEN_REFRESH_MARGIN = 300
+"""
+Seconds before expiry at which an in-process AAD token is refreshed
+"""
+
 AZURE_AF_SCOPE = ['https://azurearcdata.billing.publiccloudapi.net/.default']
 """
 Azure ARM SCOPE
@@ -195,3 +200,23 @@ API_LOG = '/api/logs'
 """
 Log upload api resource value
 """
+
+HTTP_POOL_SIZE = 16
+"""
+Default number of pooled keep-alive connections per host for ARM and DPS calls
+"""
+
+HTTP2_ENV_KEY = 'ARC_HTTP2_ENABLED'
+"""
+Environment variable that enables the HTTP/2 transport for ARM and DPS calls
+"""
+
+DPS_USAGE_REQUEST_SCHEMA = 'https://microsoft.azuredata.com/azurearc/pipeline/usagerecordsrequest.06-2021.schema.json'
+"""
+Schema of the usage upload request body
+"""
+
+DPS_STREAM_CHUNK_SIZE = 48 * 1024
+"""
+Bytes of the encoded usage blob buffered before each compression step, a multiple of 3 for base64
+"""
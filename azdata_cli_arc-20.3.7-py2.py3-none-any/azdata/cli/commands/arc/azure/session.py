@@ -0,0 +1,108 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import select_proxy
+from azdata.cli.core.logging import get_logger
+
+from . import constants as azure_constants
+
+log = get_logger(__name__)
+
+_HOP_BY_HOP_HEADERS = frozenset(["connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"])
+"""
+Connection specific headers which are not allowed on HTTP/2 requests
+"""
+
+__all__ = ["create_session"]
+
+
+def create_session(pool_size=azure_constants.HTTP_POOL_SIZE, http2=False):
+    """
+    Creates a `requests.Session` whose connections are pooled and kept alive
+    across calls, so repeated ARM and DPS requests reuse TCP/TLS connections.
+    :param pool_size: Maximum number of connections kept open per host.
+    :param http2: Use an HTTP/2 capable transport for https when available.
+    :return: The configured session.
+    """
+    session = requests.Session()
+
+    adapter = None
+    if http2:
+        adapter = _create_http2_adapter(pool_size)
+
+    if adapter is None:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session.mount("https://", adapter)
+    session.mount("http://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+    return session
+
+
+def _create_http2_adapter(pool_size):
+    try:
+        import httpx
+        import h2  # noqa: F401 pylint: disable=unused-import
+    except ImportError:
+        log.info("HTTP/2 transport requires the 'httpx' and 'h2' packages. Falling back to HTTP/1.1.")
+        return None
+
+    return Http2Adapter(httpx, pool_size)
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    Transport adapter that sends `requests` traffic over a pooled HTTP/2
+    capable `httpx` client, so callers keep using the `requests` API.
+    Requests with a custom CA bundle, a client certificate or a proxy are
+    sent over HTTP/1.1 instead, since the `httpx` client only has its
+    defaults for them.
+    """
+
+    def __init__(self, httpx, pool_size):
+        super(Http2Adapter, self).__init__()
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size))
+        self._fallback = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if verify is not True or cert or select_proxy(request.url, proxies):
+            return self._fallback.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                       proxies=proxies)
+
+        try:
+            response = self._client.request(
+                request.method,
+                request.url,
+                headers={k: v for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS},
+                content=request.body,
+                timeout=self._get_timeout(timeout))
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.url = str(response.url)
+        result.encoding = response.encoding
+        result.request = request
+        result.connection = self
+        result._content = response.content
+        return result
+
+    def close(self):
+        self._client.close()
+        self._fallback.close()
+
+    def _get_timeout(self, timeout):
+        # requests takes None for no timeout, a number or a (connect, read) tuple
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
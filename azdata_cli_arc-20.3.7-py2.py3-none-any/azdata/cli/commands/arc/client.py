@@ -7,6 +7,9 @@ from azdata.cli.commands.arc import data_controller_properties
 from azdata.cli.commands.arc.azure import constants as azure_constants
 from azdata.cli.commands.arc.constants import (
     ARC_WEBHOOK_SPEC_TEMPLATE,
+    CRD_HASH_ANNOTATION,
+    CRD_HASH_LABEL,
+    INSTANCE_LIST_PAGE_SIZE,
     POSTGRES_CRD,
     SQLMI_CRD,
     MONITOR_CRD,
@@ -36,12 +39,32 @@ from azdata.cli.core.exceptions import (CliError, ControllerError, KubernetesErr
 from azdata.cli.core.enums import ContextType
 from azdata.cli.core.deploy import (display, get_config_from_template)
 from azdata.cli.commands.arc.common_util import (
-    is_instance_ready
+    execute_concurrently,
+    is_instance_ready,
+    iter_in_background
+)
+from azdata.cli.commands.arc.template_util import (
+    load_template,
+    load_yaml
+)
+from azdata.cli.commands.arc.watch_util import (
+    Deadline,
+    periodic,
+    poll_until,
+    wait_for_deletion,
+    wait_for_watch_condition
 )
 from urllib3.exceptions import NewConnectionError, MaxRetryError
 from requests.exceptions import ConnectionError
 from azdata.cli.core.logging import get_logger
-from azdata.cli.commands.arc.constants import (TEMPLATE_DIR, CONTROLLER_LABEL, CONTROLLER_SVC, DIRECT)
+from azdata.cli.commands.arc.constants import (TEMPLATE_DIR, CONTROLLER_LABEL, CONTROLLER_SVC, DIRECT,
+                                               CONNECTION_RETRY_ATTEMPTS, RETRY_INTERVAL)
+from azdata.cli.commands.arc.resource_cache import (
+    invalidate_custom_objects,
+    iter_custom_objects,
+    list_custom_objects
+)
+from azdata.cli.commands.arc.retry_util import retry
 from azdata.cli.core.models.custom_resource import CustomResource
 
 from kubernetes.client.rest import ApiException as K8sApiException
@@ -49,20 +72,104 @@ from kubernetes import client as k8sClient
 import azdata.cli.core.deploy as util
 import azdata.cli.core.kubernetes as kubernetes_util
 from datetime import (datetime, timedelta)
-import time
 import os
 import yaml
 import base64
+import functools
+import hashlib
+import threading
 import pydash as _
 
-CONNECTION_RETRY_ATTEMPTS = 12
+CREATE_CLUSTER_TIMEOUT_SECONDS = 60 * 60
 DELETE_CLUSTER_TIMEOUT_SECONDS = 300
-RETRY_INTERVAL = 5
+PROGRESS_INTERVAL_SECONDS = 5 * 60
+STATUS_INTERVAL_SECONDS = 60
 UPDATE_INTERVAL = (15 * 60) / RETRY_INTERVAL
 logger = get_logger(__name__)
 SCRIPT_PATH = os.path.dirname(os.path.realpath(__file__))
 
 
+def _progress(message):
+    """
+    Returns an `on_wait` callback that displays `message` with the elapsed
+    minutes once every `PROGRESS_INTERVAL_SECONDS`.
+    """
+    return periodic(PROGRESS_INTERVAL_SECONDS, lambda elapsed: display(message % (elapsed // 60)))
+
+
+def _get_teardown_kinds():
+    """
+    Returns the namespaced object kinds removed when a data controller is
+    deleted, with their delete collection and list functions. Kinds without
+    a delete collection function are removed by
+    `kubernetes_util.delete_cluster_resources` and only waited for.
+    """
+    core = k8sClient.CoreV1Api()
+    apps = k8sClient.AppsV1Api()
+    batch = k8sClient.BatchV1Api()
+    rbac = k8sClient.RbacAuthorizationV1Api()
+
+    return [
+        dict(kind="Deployment", delete=apps.delete_collection_namespaced_deployment,
+             list=apps.list_namespaced_deployment),
+        dict(kind="StatefulSet", delete=apps.delete_collection_namespaced_stateful_set,
+             list=apps.list_namespaced_stateful_set),
+        dict(kind="ReplicaSet", delete=apps.delete_collection_namespaced_replica_set,
+             list=apps.list_namespaced_replica_set),
+        dict(kind="DaemonSet", delete=apps.delete_collection_namespaced_daemon_set,
+             list=apps.list_namespaced_daemon_set),
+        dict(kind="Job", delete=batch.delete_collection_namespaced_job,
+             list=batch.list_namespaced_job),
+        dict(kind="Pod", delete=core.delete_collection_namespaced_pod,
+             list=core.list_namespaced_pod),
+        dict(kind="PersistentVolumeClaim", delete=core.delete_collection_namespaced_persistent_volume_claim,
+             list=core.list_namespaced_persistent_volume_claim),
+        dict(kind="Service", delete=None,
+             list=core.list_namespaced_service),
+        dict(kind="ConfigMap", delete=core.delete_collection_namespaced_config_map,
+             list=core.list_namespaced_config_map),
+        dict(kind="Secret", delete=core.delete_collection_namespaced_secret,
+             list=core.list_namespaced_secret),
+        dict(kind="ServiceAccount", delete=core.delete_collection_namespaced_service_account,
+             list=core.list_namespaced_service_account),
+        dict(kind="Role", delete=rbac.delete_collection_namespaced_role,
+             list=rbac.list_namespaced_role),
+        dict(kind="RoleBinding", delete=rbac.delete_collection_namespaced_role_binding,
+             list=rbac.list_namespaced_role_binding),
+    ]
+
+
+def _is_recreated(kind, item):
+    """
+    Tells the objects of a teardown kind that Kubernetes recreates in every
+    namespace, which are not waited for.
+    """
+    name = item.metadata.name
+    if kind == "ServiceAccount":
+        return name == "default"
+    if kind == "ConfigMap":
+        return name == "kube-root-ca.crt"
+    if kind == "Secret":
+        annotations = item.metadata.annotations or {}
+        return item.type == "kubernetes.io/service-account-token" and \
+            annotations.get("kubernetes.io/service-account.name") == "default"
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _get_instance_crd(crd_file):
+    """
+    Returns the parsed `CustomResourceDefinition` of an instance kind. Each
+    CRD file is parsed once per process.
+    """
+    return CustomResourceDefinition(load_yaml(crd_file))
+
+
+def _format_blocking_kinds(blocking, elapsed):
+    return ", ".join("{} ({} left for {:.0f}s)".format(kind, count, elapsed - since)
+                     for kind, (since, count) in sorted(blocking.items()))
+
+
 def beget(_):
     """Client factory"""
     return ArcClientMixin()
@@ -83,92 +190,89 @@ class ArcClientMixin(CliClient):
         super(ArcClientMixin, self).__init__(check_auth, check_eula)
         self.cluster_name = None
         self._azure_resource_client = AzureResourceClient()
+        self._controller_clients = {}
+        self._controller_clients_lock = threading.Lock()
 
     @property
     def azure_resource_client(self):
         return self._azure_resource_client
 
-    def dc_create(self, crd: dict, cr: DataControllerCustomResource):
+    def dc_create(self, crd: dict, cr: DataControllerCustomResource, timeout=CREATE_CLUSTER_TIMEOUT_SECONDS):
         """
         Create a data controller
         :param crd:
         :param cr:
+        :param timeout: Seconds to wait for the data controller to become ready.
         :return:
         """
         # Set up the private registry if the docker environment variables are set
         #
         if (os.environ.get(DOCKER_USERNAME) and os.environ.get(DOCKER_PASSWORD)) or \
                 (os.environ.get(REGISTRY_USERNAME) and os.environ.get(REGISTRY_PASSWORD)):
-            util.retry(lambda: kubernetes_util.setup_private_registry(
+            retry(lambda: kubernetes_util.setup_private_registry(
                 cr.metadata.namespace, cr.spec.docker.registry, secret_name=cr.spec.credentials.dockerRegistry,
                 ignore_conflict=True),
-                       retry_count=CONNECTION_RETRY_ATTEMPTS,
-                       retry_delay=RETRY_INTERVAL, retry_method="set up docker private registry",
-                       retry_on_exceptions=(NewConnectionError, MaxRetryError))
+                  retry_count=CONNECTION_RETRY_ATTEMPTS,
+                  retry_delay=RETRY_INTERVAL, retry_method="set up docker private registry",
+                  retry_on_exceptions=(NewConnectionError, MaxRetryError))
 
         # Create the bootstrapper, if it needs to be created
         #
-        util.retry(lambda: self.create_bootstrapper(cr),
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL,
-                   retry_method="create bootstrapper",
-                   retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
-
-        util.retry(lambda: self.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=crd.plural,
-                                                                                ignore_conflict=True),
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL,
-                   retry_method="create namespaced custom object",
-                   retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
-
-        i = 0
-
-        # Check if the external controller service exists
+        retry(lambda: self.create_bootstrapper(cr),
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL,
+              retry_method="create bootstrapper",
+              retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+
+        retry(lambda: self.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=crd.plural,
+                                                                           ignore_conflict=True),
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL,
+              retry_method="create namespaced custom object",
+              retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+        invalidate_custom_objects(self, ARC_GROUP, DATA_CONTROLLER_PLURAL, cr.metadata.namespace)
+
+        # All readiness phases share one deadline
         #
-        while not util.retry(lambda: self.apis.kubernetes.service_ready(cr.metadata.namespace, CONTROLLER_SVC),
-                             retry_count=CONNECTION_RETRY_ATTEMPTS,
-                             retry_delay=RETRY_INTERVAL,
-                             retry_method="service ready",
-                             retry_on_exceptions=(NewConnectionError, MaxRetryError)):
-            # Log to console once every 5 minutes if controller service is not ready
-            #
-            if i != 0 and i % 60 == 0:
-                display("Waiting for data controller service to be ready after %d "
-                        "minutes." % ((i * RETRY_INTERVAL) / 60))
-
-            time.sleep(RETRY_INTERVAL)
-            i = i + 1
-
-        # Check if controller is running
-        #
-        while not util.retry(lambda: self.apis.kubernetes.pod_is_running(cr.metadata.namespace, CONTROLLER_LABEL),
-                             retry_count=CONNECTION_RETRY_ATTEMPTS,
-                             retry_delay=RETRY_INTERVAL,
-                             retry_method="pod is running",
-                             retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException)):
-            # Log to console once every 5 minutes if controller is not running
-            #
-            if i != 0 and i % 60 == 0:
-                display("Waiting for data controller to be running after %d "
-                        "minutes." % ((i * RETRY_INTERVAL) / 60))
-
-            time.sleep(RETRY_INTERVAL)
-            i = i + 1
-
-        service = util.retry(lambda: self.apis.kubernetes.get_service(cr.metadata.namespace, CONTROLLER_SVC),
-                             retry_count=CONNECTION_RETRY_ATTEMPTS,
-                             retry_delay=RETRY_INTERVAL,
-                             retry_method="get service",
-                             retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        deadline = Deadline(timeout)
+        core_api = k8sClient.CoreV1Api()
 
-        controller_endpoint = util.retry(
+        # Wait for the external controller service, re-checking on service events
+        #
+        if not wait_for_watch_condition(
+                core_api.list_namespaced_service,
+                cr.metadata.namespace,
+                lambda: self.apis.kubernetes.service_ready(cr.metadata.namespace, CONTROLLER_SVC),
+                deadline,
+                field_selector="metadata.name={}".format(CONTROLLER_SVC),
+                on_wait=_progress("Waiting for data controller service to be ready after %d minutes.")):
+            raise CliError("Data controller service is not ready after {} seconds.".format(timeout))
+
+        # Wait for the controller to be running, re-checking on pod events
+        #
+        if not wait_for_watch_condition(
+                core_api.list_namespaced_pod,
+                cr.metadata.namespace,
+                lambda: self.apis.kubernetes.pod_is_running(cr.metadata.namespace, CONTROLLER_LABEL),
+                deadline,
+                label_selector="app={}".format(CONTROLLER_LABEL),
+                on_wait=_progress("Waiting for data controller to be running after %d minutes.")):
+            raise CliError("Data controller is not running after {} seconds.".format(timeout))
+
+        service = retry(lambda: self.apis.kubernetes.get_service(cr.metadata.namespace, CONTROLLER_SVC),
+                        retry_count=CONNECTION_RETRY_ATTEMPTS,
+                        retry_delay=RETRY_INTERVAL,
+                        retry_method="get service",
+                        retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+
+        controller_endpoint = retry(
             lambda: self.apis.kubernetes.get_service_endpoint(cr.metadata.namespace, service),
             retry_count=CONNECTION_RETRY_ATTEMPTS,
             retry_delay=RETRY_INTERVAL,
             retry_method="get service endpoint",
             retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
-        ip_endpoint = util.retry(
+        ip_endpoint = retry(
             lambda: self.apis.kubernetes.get_service_endpoint(cr.metadata.namespace, service, True),
             retry_count=CONNECTION_RETRY_ATTEMPTS,
             retry_delay=RETRY_INTERVAL,
@@ -198,19 +302,18 @@ class ArcClientMixin(CliClient):
             cfg.get_basic_auth_token(strip_prefix=True)
         )
 
-        i = 0
-        while not tmp_controller_client.is_ready():
-            # Log to console once every 5 minutes if controller is not ready
-            #
-            if i != 0 and i % 60 == 0:
-                display("Waiting for data controller to be ready after %d "
-                        "minutes." % ((i * RETRY_INTERVAL) / 60))
+        # The controller readiness probe is HTTP only, so poll it adaptively
+        #
+        progress = _progress("Waiting for data controller to be ready after %d minutes.")
+        status = periodic(STATUS_INTERVAL_SECONDS,
+                          lambda elapsed: self.notify_data_controller_status(tmp_controller_client))
 
-            if i != 0 and i % 12 == 0:
-                self.notify_data_controller_status(tmp_controller_client)
+        def on_wait(elapsed):
+            progress(elapsed)
+            status(elapsed)
 
-            time.sleep(RETRY_INTERVAL)
-            i = i + 1
+        if not poll_until(tmp_controller_client.is_ready, deadline, on_wait=on_wait):
+            raise CliError("Data controller is not ready after {} seconds.".format(timeout))
 
         # Create the webhook if validation is enabled
         #
@@ -290,44 +393,96 @@ class ArcClientMixin(CliClient):
 
         # Retrieve cluster configmap, pull cert, and encode in b64
         #
-        cluster_config = util.retry(lambda: self.apis.kubernetes.get_config_map(namespace, "cluster-configmap"),
-                                    retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                    retry_delay=RETRY_INTERVAL,
-                                    retry_method="get config map",
-                                    retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        cluster_config = retry(lambda: self.apis.kubernetes.get_config_map(namespace, "cluster-configmap"),
+                               retry_count=CONNECTION_RETRY_ATTEMPTS,
+                               retry_delay=RETRY_INTERVAL,
+                               retry_method="get config map",
+                               retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
         raw_cert = cluster_config.data['cluster-ca-certificate.crt']
         b64_encoding = base64.b64encode(raw_cert.encode('utf-8'))
         b64_string = str(b64_encoding, 'utf-8')
 
         # Grab the token secret and decode
         #
-        token_secret = util.retry(lambda: self.apis.kubernetes.get_secret(namespace, "webhook-token"),
-                                  retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                  retry_delay=RETRY_INTERVAL,
-                                  retry_method="get secret",
-                                  retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        token_secret = retry(lambda: self.apis.kubernetes.get_secret(namespace, "webhook-token"),
+                             retry_count=CONNECTION_RETRY_ATTEMPTS,
+                             retry_delay=RETRY_INTERVAL,
+                             retry_method="get secret",
+                             retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
         token = str(base64.b64decode(token_secret.data['token']), "utf-8")
 
         # Read the base spec, patch it, and deploy
         #
-        with open(ARC_WEBHOOK_SPEC_TEMPLATE) as f:
-            # Read and patch base webhook spec
-            #
-            spec_obj = yaml.safe_load(f)
-            spec_obj['webhooks'][0]['clientConfig']['caBundle'] = b64_string
-            spec_obj['metadata']['name'] = "{}-{}".format(ARC_WEBHOOK_PREFIX, namespace)
-            spec_obj['webhooks'][0]['clientConfig']['service']['namespace'] = namespace
-            spec_obj['webhooks'][0]['clientConfig']['service']['path'] = "/api/v2/arc/admissions/{}".format(token)
-            spec_obj['webhooks'][0]['namespaceSelector']['matchExpressions'][0]['key'] = ARC_NAMESPACE_LABEL
-            spec_obj['webhooks'][0]['namespaceSelector']['matchExpressions'][0]['values'] = [namespace]
-
-            # Deploy Webhook
-            #
-            util.retry(lambda: self.apis.kubernetes.create_mutating_webhook_configuration(spec_obj),
-                       retry_count=CONNECTION_RETRY_ATTEMPTS,
-                       retry_delay=RETRY_INTERVAL,
-                       retry_method="get secret",
-                       retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        # Read and patch base webhook spec
+        #
+        spec_obj = load_yaml(ARC_WEBHOOK_SPEC_TEMPLATE)
+        spec_obj['webhooks'][0]['clientConfig']['caBundle'] = b64_string
+        spec_obj['metadata']['name'] = "{}-{}".format(ARC_WEBHOOK_PREFIX, namespace)
+        spec_obj['webhooks'][0]['clientConfig']['service']['namespace'] = namespace
+        spec_obj['webhooks'][0]['clientConfig']['service']['path'] = "/api/v2/arc/admissions/{}".format(token)
+        spec_obj['webhooks'][0]['namespaceSelector']['matchExpressions'][0]['key'] = ARC_NAMESPACE_LABEL
+        spec_obj['webhooks'][0]['namespaceSelector']['matchExpressions'][0]['values'] = [namespace]
+
+        # Deploy Webhook
+        #
+        retry(lambda: self.apis.kubernetes.create_mutating_webhook_configuration(spec_obj),
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL,
+              retry_method="get secret",
+              retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+
+    def create_custom_resource_definitions(self, crd_files):
+        """
+        Installs the CRDs in `crd_files` concurrently. Each CRD is stamped with
+        the SHA-256 of its file, and files whose hash is already installed are
+        skipped without being parsed.
+        :param crd_files: Paths of the CRD yaml files.
+        :return: Dict of file path to `CustomResourceDefinition` for the CRDs
+                 that were installed.
+        """
+        hashes = dict()
+        for crd_file in crd_files:
+            with open(crd_file, "rb") as stream:
+                hashes[crd_file] = hashlib.sha256(stream.read()).hexdigest()
+
+        installed_hashes = self._get_installed_crd_hashes()
+        pending = [f for f in crd_files if hashes[f] not in installed_hashes]
+
+        def install(crd_file):
+            temp = load_yaml(crd_file)
+
+            metadata = temp.setdefault("metadata", {})
+            metadata.setdefault("annotations", {})[CRD_HASH_ANNOTATION] = hashes[crd_file]
+            metadata.setdefault("labels", {})[CRD_HASH_LABEL] = "true"
+
+            crd = CustomResourceDefinition(temp)
+            retry(lambda: self.apis.kubernetes.create_custom_resource_definition(crd),
+                  retry_count=CONNECTION_RETRY_ATTEMPTS,
+                  retry_delay=RETRY_INTERVAL,
+                  retry_method="create custom resource definition",
+                  retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+            return crd
+
+        results = execute_concurrently(install, pending, len(pending))
+        for r in results:
+            if not r.succeeded:
+                raise r.error
+
+        return {r.item: r.result for r in results}
+
+    @staticmethod
+    def _get_installed_crd_hashes():
+        """
+        Returns the content hashes of the CRDs installed by this tool, or an
+        empty set if they cannot be listed.
+        """
+        try:
+            crds = k8sClient.ApiextensionsV1Api().list_custom_resource_definition(label_selector=CRD_HASH_LABEL)
+        except (K8sApiException, NewConnectionError, MaxRetryError) as e:
+            logger.info("Unable to list installed CRDs, installing all of them: {}".format(e))
+            return set()
+
+        return set((crd.metadata.annotations or {}).get(CRD_HASH_ANNOTATION) for crd in crds.items)
 
     def create_cluster_role_for_monitoring(self, dc_cr: DataControllerCustomResource, namespace):
         """
@@ -346,8 +501,8 @@ class ArcClientMixin(CliClient):
             cluster_role_name = namespace + ":cr-arc-metricsdc-reader"
             cluster_role_binding_name = namespace + ":crb-arc-metricsdc-reader"
             try:
-                body = yaml.safe_load(util.get_config_from_template(
-                    os.path.join(SCRIPT_PATH, "./templates", "clusterrole-metricsdc-reader.yaml"), cluster_role_name))
+                body = load_template(
+                    os.path.join(TEMPLATE_DIR, "clusterrole-metricsdc-reader.yaml"), cluster_role_name)
                 kubernetes_util.update_cluster_role(cluster_role_name, body)
 
                 body = k8sClient.V1ClusterRoleBinding(
@@ -376,11 +531,14 @@ class ArcClientMixin(CliClient):
                     cluster_role_name, cluster_role_binding_name)
                 pass
 
-    def create_bootstrapper(self, cr):
+    def create_bootstrapper(self, cr, bulk=True):
         """
         Check if the bootstrapper exists in the given namespace.
         If the bootstrapper does not exist, deploy it.
         :param cr: custom resource spec
+        :param bulk: List each object kind once to find the missing objects and
+                     create them concurrently. Falls back to probing objects one
+                     by one when listing is not permitted.
         :return:
         """
 
@@ -390,90 +548,141 @@ class ArcClientMixin(CliClient):
             ns = cr.metadata.namespace
             docker = cr.spec.docker
 
-            if not self.apis.kubernetes.replica_set_exists(ns, "bootstrapper"):
-                if os.environ.get("BOOTSTRAPPER_IMAGE"):
-                    model["bootstrapper"] = os.environ["BOOTSTRAPPER_IMAGE"]
-                else:
-                    model["bootstrapper"] = "{0}/{1}/arc-bootstrapper:{2}" \
-                        .format(docker.registry, docker.repository, docker.imageTag)
-                model["imagePullPolicy"] = docker.imagePullPolicy
-                model["imagePullSecret"] = cr.spec.credentials.dockerRegistry
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "rs-bootstrapper.yaml.tmpl"),
-                    model)
-                rs = yaml.safe_load(config)
-                self.apis.kubernetes.create_replica_set(ns, rs)
-
-            if not self.apis.kubernetes.namespaced_role_exists(ns, "role-bootstrapper"):
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "role-bootstrapper.yaml.tmpl"),
-                    model)
-                role = yaml.safe_load(config)
-                self.apis.kubernetes.create_namespaced_role(ns, role)
-
-            if not self.apis.kubernetes.namespaced_role_binding_exists(ns, "rb-bootstrapper"):
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "rb-bootstrapper.yaml.tmpl"),
-                    model)
-                rb = yaml.safe_load(config)
-                self.apis.kubernetes.create_namespaced_role_binding(ns, rb)
-
-            if not self.apis.kubernetes.service_account_exists(ns, "sa-mssql-controller"):
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "sa-bootstrapper.yaml.tmpl"),
-                    model)
-                sa = yaml.safe_load(config)
-                self.apis.kubernetes.create_namespaced_service_account(ns, sa)
-
-            if not self.apis.kubernetes.secret_exists(ns, "controller-login-secret"):
-                model[AZDATA_USERNAME] = base64.b64encode(
-                    bytes(os.environ[AZDATA_USERNAME], "utf-8")).decode("utf-8")
-                model[AZDATA_PASSWORD] = base64.b64encode(
-                    bytes(os.environ[AZDATA_PASSWORD], "utf-8")).decode("utf-8")
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "controller-login-secret.yaml.tmpl"),
-                    model)
-                secret = yaml.safe_load(config)
-                self.apis.kubernetes.create_secret(ns, secret)
-
-            connectivity_mode = cr.spec.settings["azure"][data_controller_properties.CONNECTION_MODE].lower()
-            if connectivity_mode == DIRECT and not self.apis.kubernetes.secret_exists(ns,
-                                                                                      "upload-service-principal-secret"):
-                model['SPN_CLIENT_ID'] = base64.b64encode(
-                    bytes(os.environ['SPN_CLIENT_ID'], "utf-8")).decode("utf-8")
-                model['SPN_CLIENT_SECRET'] = base64.b64encode(
-                    bytes(os.environ['SPN_CLIENT_SECRET'], "utf-8")).decode("utf-8")
-                model['SPN_TENANT_ID'] = base64.b64encode(
-                    bytes(os.environ['SPN_TENANT_ID'], "utf-8")).decode("utf-8")
-                model['SPN_AUTHORITY'] = base64.b64encode(
-                    bytes(os.environ['SPN_AUTHORITY'], "utf-8")).decode("utf-8")
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "secret-upload-service-principal.yaml.tmpl"),
-                    model)
-                secret = yaml.safe_load(config)
-                self.apis.kubernetes.create_secret(ns, secret)
-
-            # If domain service account is provided through environment and active directory mode is
-            # enabled in spec, create a secret for domain service account.
-            #
-            if DOMAIN_SERVICE_ACCOUNT_USERNAME in os.environ and \
-                    DOMAIN_SERVICE_ACCOUNT_PASSWORD in os.environ and \
-                    getattr(cr.spec, "security", None) is not None and \
-                    getattr(cr.spec.security, "activeDirectory", None) is not None and \
-                    not self.apis.kubernetes.secret_exists(ns, "domain-service-account-secret"):
-                model[DOMAIN_SERVICE_ACCOUNT_USERNAME] = base64.b64encode(
-                    bytes(os.environ[DOMAIN_SERVICE_ACCOUNT_USERNAME], "utf-8")).decode("utf-8")
-                model[DOMAIN_SERVICE_ACCOUNT_PASSWORD] = base64.b64encode(
-                    bytes(os.environ[DOMAIN_SERVICE_ACCOUNT_PASSWORD], "utf-8")).decode("utf-8")
-                config = get_config_from_template(
-                    os.path.join(TEMPLATE_DIR, "domain-service-account-secret.yaml.tmpl"),
-                    model)
-                secret = yaml.safe_load(config)
-                self.apis.kubernetes.create_secret(ns, secret)
+            if os.environ.get("BOOTSTRAPPER_IMAGE"):
+                model["bootstrapper"] = os.environ["BOOTSTRAPPER_IMAGE"]
+            else:
+                model["bootstrapper"] = "{0}/{1}/arc-bootstrapper:{2}" \
+                    .format(docker.registry, docker.repository, docker.imageTag)
+            model["imagePullPolicy"] = docker.imagePullPolicy
+            model["imagePullSecret"] = cr.spec.credentials.dockerRegistry
+
+            objects = self._get_bootstrapper_objects(cr)
+
+            existing = self._list_bootstrapper_objects(ns, objects) if bulk else None
+            if existing is not None:
+                missing = [o for o in objects if o["name"] not in existing[o["kind"]]]
+            else:
+                missing = [o for o in objects if not o["exists"](ns, o["name"])]
+
+            # The replica set is created last, once the service account, RBAC objects and
+            # secrets its pods depend on exist
+            dependencies = [o for o in missing if o["kind"] != "ReplicaSet"]
+            results = execute_concurrently(lambda o: self._create_bootstrapper_object(ns, model, o),
+                                           dependencies, len(dependencies))
+            for r in results:
+                if not r.succeeded:
+                    raise r.error
+
+            for o in missing:
+                if o["kind"] == "ReplicaSet":
+                    self._create_bootstrapper_object(ns, model, o)
 
         except K8sApiException as e:
             raise KubernetesError(e)
 
+    def _get_bootstrapper_objects(self, cr):
+        """
+        Returns the objects the bootstrapper consists of. `model` is an optional
+        callable returning the extra template values of the object, so that
+        credentials are only read from the environment when it is created.
+        """
+        k8s = self.apis.kubernetes
+
+        def encode_env(*keys):
+            return lambda: {key: base64.b64encode(bytes(os.environ[key], "utf-8")).decode("utf-8") for key in keys}
+
+        objects = [
+            dict(kind="ReplicaSet", name="bootstrapper", template="rs-bootstrapper.yaml.tmpl",
+                 exists=k8s.replica_set_exists, create=k8s.create_replica_set),
+            dict(kind="Role", name="role-bootstrapper", template="role-bootstrapper.yaml.tmpl",
+                 exists=k8s.namespaced_role_exists, create=k8s.create_namespaced_role),
+            dict(kind="RoleBinding", name="rb-bootstrapper", template="rb-bootstrapper.yaml.tmpl",
+                 exists=k8s.namespaced_role_binding_exists, create=k8s.create_namespaced_role_binding),
+            dict(kind="ServiceAccount", name="sa-mssql-controller", template="sa-bootstrapper.yaml.tmpl",
+                 exists=k8s.service_account_exists, create=k8s.create_namespaced_service_account),
+            dict(kind="Secret", name="controller-login-secret", template="controller-login-secret.yaml.tmpl",
+                 exists=k8s.secret_exists, create=k8s.create_secret,
+                 model=encode_env(AZDATA_USERNAME, AZDATA_PASSWORD)),
+        ]
+
+        connectivity_mode = cr.spec.settings["azure"][data_controller_properties.CONNECTION_MODE].lower()
+        if connectivity_mode == DIRECT:
+            objects.append(
+                dict(kind="Secret", name="upload-service-principal-secret",
+                     template="secret-upload-service-principal.yaml.tmpl",
+                     exists=k8s.secret_exists, create=k8s.create_secret,
+                     model=encode_env('SPN_CLIENT_ID', 'SPN_CLIENT_SECRET', 'SPN_TENANT_ID', 'SPN_AUTHORITY')))
+
+        # If domain service account is provided through environment and active directory mode is
+        # enabled in spec, create a secret for domain service account.
+        #
+        if DOMAIN_SERVICE_ACCOUNT_USERNAME in os.environ and \
+                DOMAIN_SERVICE_ACCOUNT_PASSWORD in os.environ and \
+                getattr(cr.spec, "security", None) is not None and \
+                getattr(cr.spec.security, "activeDirectory", None) is not None:
+            objects.append(
+                dict(kind="Secret", name="domain-service-account-secret",
+                     template="domain-service-account-secret.yaml.tmpl",
+                     exists=k8s.secret_exists, create=k8s.create_secret,
+                     model=encode_env(DOMAIN_SERVICE_ACCOUNT_USERNAME, DOMAIN_SERVICE_ACCOUNT_PASSWORD)))
+
+        return objects
+
+    @staticmethod
+    def _list_bootstrapper_objects(ns, objects):
+        """
+        Lists every object kind used by the bootstrapper once, concurrently.
+        Secrets are listed by name, so the data of unrelated secrets is not
+        downloaded.
+        :return: Dict of kind to the set of existing object names, or None if
+                 listing is not permitted.
+        """
+        list_functions = {
+            "ReplicaSet": k8sClient.AppsV1Api().list_namespaced_replica_set,
+            "Role": k8sClient.RbacAuthorizationV1Api().list_namespaced_role,
+            "RoleBinding": k8sClient.RbacAuthorizationV1Api().list_namespaced_role_binding,
+            "ServiceAccount": k8sClient.CoreV1Api().list_namespaced_service_account,
+            "Secret": k8sClient.CoreV1Api().list_namespaced_secret,
+        }
+        queries = [(kind, None) for kind in sorted(set(o["kind"] for o in objects)) if kind != "Secret"]
+        queries += [(o["kind"], o["name"]) for o in objects if o["kind"] == "Secret"]
+
+        def list_objects(query):
+            kind, name = query
+            if name is None:
+                return list_functions[kind](ns)
+            return list_functions[kind](ns, field_selector="metadata.name={}".format(name))
+
+        results = execute_concurrently(list_objects, queries, len(queries))
+
+        existing = dict((kind, set()) for kind, name in queries)
+        for r in results:
+            if not r.succeeded:
+                if isinstance(r.error, K8sApiException) and r.error.status == HTTPStatus.FORBIDDEN:
+                    logger.info("Listing {} is not permitted, probing bootstrapper objects one by one.".format(
+                        r.item[0]))
+                    return None
+                raise r.error
+            existing[r.item[0]].update(item.metadata.name for item in r.result.items)
+
+        return existing
+
+    def _create_bootstrapper_object(self, ns, model, obj):
+        """
+        Renders the template of a bootstrapper object and creates it.
+        """
+        if "model" in obj:
+            model = dict(model, **obj["model"]())
+
+        body = load_template(os.path.join(TEMPLATE_DIR, obj["template"]), model)
+
+        try:
+            obj["create"](ns, body)
+        except K8sApiException as e:
+            # Created concurrently by someone else since it was listed
+            if e.status != HTTPStatus.CONFLICT:
+                raise
+
     def dc_delete(self, namespace, name):
         """
         Delete a data controller.
@@ -481,61 +690,86 @@ class ArcClientMixin(CliClient):
         :param name: Name of the data controller.
         :return:
         """
-        if not util.retry(kubernetes_util.namespace_exists, namespace,
-                          retry_count=CONNECTION_RETRY_ATTEMPTS, retry_delay=RETRY_INTERVAL,
-                          retry_method="check if namespace exists",
-                          retry_on_exceptions=(NewConnectionError, MaxRetryError)):
+        if not retry(kubernetes_util.namespace_exists, namespace,
+                     retry_count=CONNECTION_RETRY_ATTEMPTS, retry_delay=RETRY_INTERVAL,
+                     retry_method="check if namespace exists",
+                     retry_on_exceptions=(NewConnectionError, MaxRetryError)):
             display("Namespace '%s' doesn't exist" % namespace)
             return
 
-        # Try to delete the cluster
-        #
-        i = 1
-        resources_are_deleted = False
-        http_status = None
-        cluster_is_empty = False
-        while not cluster_is_empty:
-
-            time.sleep(RETRY_INTERVAL)
+        deadline = Deadline(DELETE_CLUSTER_TIMEOUT_SECONDS)
+        kinds = _get_teardown_kinds()
 
-            if not resources_are_deleted:
-                #  Try to delete the remaining resources in the cluster
-                #
-                (resources_are_deleted, http_status) = util.retry(kubernetes_util.delete_cluster_resources, namespace,
-                                                                  retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                                                  retry_delay=RETRY_INTERVAL,
-                                                                  retry_method="delete cluster resources",
-                                                                  retry_on_exceptions=(
-                                                                      NewConnectionError, MaxRetryError))
-                #  Try to delete the bootstrapper
-                #
-                util.retry(kubernetes_util.delete_cluster_resources,
-                           namespace,
-                           "app=bootstrapper",
-                           retry_count=CONNECTION_RETRY_ATTEMPTS,
-                           retry_delay=RETRY_INTERVAL,
-                           retry_method="delete cluster resources",
-                           retry_on_exceptions=(
-                               NewConnectionError, MaxRetryError))
-
-                if (http_status == HTTPStatus.FORBIDDEN):
-                    break
-
-            # Check if the cluster is empty
-            #
-            cluster_is_empty = util.retry(kubernetes_util.namespace_is_empty, namespace,
-                                          retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                          retry_delay=RETRY_INTERVAL, retry_method="namespace is empty",
-                                          retry_on_exceptions=(NewConnectionError, MaxRetryError))
-
-            if i * RETRY_INTERVAL > DELETE_CLUSTER_TIMEOUT_SECONDS:
-                logger.warn("Data controller is not empty after %d minutes." % (DELETE_CLUSTER_TIMEOUT_SECONDS / 60))
+        # Delete the services, cron jobs, disruption budgets and ingresses of the data controller and the
+        # bootstrapper, which have no delete collection in every supported API version
+        #
+        (_, http_status) = retry(kubernetes_util.delete_cluster_resources, namespace,
+                                 retry_count=CONNECTION_RETRY_ATTEMPTS,
+                                 retry_delay=RETRY_INTERVAL,
+                                 retry_method="delete cluster resources",
+                                 retry_on_exceptions=(NewConnectionError, MaxRetryError))
+        if http_status == HTTPStatus.FORBIDDEN:
+            logger.warn("Unable to delete all resources in namespace '{}'.".format(namespace))
+
+        retry(kubernetes_util.delete_cluster_resources,
+              namespace,
+              "app=bootstrapper",
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL,
+              retry_method="delete cluster resources",
+              retry_on_exceptions=(NewConnectionError, MaxRetryError))
+
+        # Delete every other kind in parallel, letting dependents go first
+        #
+        options = k8sClient.V1DeleteOptions(propagation_policy="Foreground")
+        deletable = [kind for kind in kinds if kind["delete"]]
+        results = execute_concurrently(lambda kind: kind["delete"](namespace, body=options),
+                                       deletable, len(deletable))
+        invalidate_custom_objects(self, ARC_GROUP, DATA_CONTROLLER_PLURAL, namespace)
+
+        for r in results:
+            if r.succeeded:
+                continue
+            if isinstance(r.error, K8sApiException) and r.error.status in (HTTPStatus.FORBIDDEN, HTTPStatus.NOT_FOUND):
+                logger.warn("Unable to delete {} objects in namespace '{}': {}".format(
+                    r.item["kind"], namespace, r.error.reason))
+                kinds.remove(r.item)
+            else:
+                logger.info("Deleting {} objects failed, waiting for them anyway: {}".format(r.item["kind"], r.error))
+
+        # Wait until no objects are left. Each kind is listed once and then counted down from its watch events
+        #
+        blocking = dict()
+
+        def remaining(kind, count):
+            if count:
+                blocking.setdefault(kind, [deadline.elapsed(), count])[1] = count
+            elif kind in blocking:
+                since = blocking.pop(kind)[0]
+                logger.info("{} objects were deleted after {:.0f} seconds.".format(kind, deadline.elapsed() - since))
+
+        progress = periodic(STATUS_INTERVAL_SECONDS,
+                            lambda elapsed: display("Waiting for deletion of {}.".format(
+                                _format_blocking_kinds(blocking, elapsed))))
+
+        for kind in kinds:
+            if not wait_for_deletion(kind["list"], namespace, deadline,
+                                     ignore=functools.partial(_is_recreated, kind["kind"]),
+                                     on_count=functools.partial(remaining, kind["kind"]),
+                                     on_wait=progress):
                 break
 
-            i = i + 1
-            time.sleep(RETRY_INTERVAL)
+        # Confirm with the namespace check once the watched kinds are gone
+        #
+        cluster_is_empty = not deadline.expired and poll_until(
+            lambda: kubernetes_util.namespace_is_empty(namespace), deadline, on_wait=progress)
 
         if not cluster_is_empty:
+            if blocking:
+                logger.warn("Data controller is not empty after %d minutes. Still deleting %s." % (
+                    DELETE_CLUSTER_TIMEOUT_SECONDS / 60, _format_blocking_kinds(blocking, deadline.elapsed())))
+            else:
+                logger.warn("Data controller is not empty after %d minutes." % (DELETE_CLUSTER_TIMEOUT_SECONDS / 60))
             raise Exception("Failed to delete data controller.")
 
     def get_data_controller(self, cluster_name):
@@ -546,12 +780,8 @@ class ArcClientMixin(CliClient):
         """
         self.cluster_name = cluster_name
 
-        data_controller_list = util.retry(
-            lambda: self.apis.kubernetes.list_namespaced_custom_object(
-                namespace=cluster_name,
-                group=ARC_GROUP,
-                version=ARC_API_VERSION,
-                plural=DATA_CONTROLLER_PLURAL),
+        data_controller_list = retry(
+            lambda: list_custom_objects(self, cluster_name, ARC_GROUP, ARC_API_VERSION, DATA_CONTROLLER_PLURAL),
             retry_count=CONNECTION_RETRY_ATTEMPTS,
             retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
             retry_on_exceptions=(NewConnectionError, MaxRetryError))
@@ -572,7 +802,7 @@ class ArcClientMixin(CliClient):
         dc_settings = data_controller_cr["spec"]["settings"]
         return {
             'instanceName': dc_settings["controller"][data_controller_properties.DISPLAY_NAME],
-            'instanceNamespace': self.cluster_name,
+            'instanceNamespace': cluster_name,
             'kind': azure_constants.RESOURCE_KIND_DATA_CONTROLLER,
             'subscriptionId': dc_settings["azure"][data_controller_properties.SUBSCRIPTION],
             'resourceGroupName': dc_settings["azure"][data_controller_properties.RESOURCE_GROUP],
@@ -584,36 +814,108 @@ class ArcClientMixin(CliClient):
             'infrastructure': _.get(data_controller_cr, 'spec.infrastructure')
         }
 
+    @staticmethod
+    def list_data_controller_namespaces():
+        """
+        Lists the namespaces that hold a data controller, across the cluster.
+        Controllers rejected as duplicates of another one are skipped.
+        :return: Sorted namespace names.
+        """
+        data_controller_list = retry(
+            k8sClient.CustomObjectsApi().list_cluster_custom_object,
+            ARC_GROUP,
+            ARC_API_VERSION,
+            DATA_CONTROLLER_PLURAL,
+            retry_count=CONNECTION_RETRY_ATTEMPTS,
+            retry_delay=RETRY_INTERVAL, retry_method="list cluster custom object",
+            retry_on_exceptions=(NewConnectionError, MaxRetryError))
+
+        namespaces = set()
+        for data_controller in data_controller_list.get("items") or []:
+            state = _.get(data_controller, "status.state") or ""
+            if state.lower() != "duplicateerror":
+                namespaces.add(data_controller["metadata"]["namespace"])
+        return sorted(namespaces)
+
+    def get_controller_client(self, namespace):
+        """
+        Returns a controller client for the data controller in `namespace`.
+        The logged in controller is reused for the active namespace. Other
+        controllers are reached through their controller service with the
+        basic auth credentials of the AZDATA_USERNAME and AZDATA_PASSWORD
+        environment variables, and each connection is reused for the rest
+        of the command.
+        """
+        if namespace == self.profile.active_context.namespace:
+            return self.apis.controller
+
+        with self._controller_clients_lock:
+            controller_client = self._controller_clients.get(namespace)
+            if controller_client is not None:
+                return controller_client
+
+            if not os.environ.get(AZDATA_USERNAME) or not os.environ.get(AZDATA_PASSWORD):
+                raise CliError('Set the {} and {} environment variables to connect to the data controller in '
+                               'namespace "{}".'.format(AZDATA_USERNAME, AZDATA_PASSWORD, namespace))
+
+            service = retry(lambda: self.apis.kubernetes.get_service(namespace, CONTROLLER_SVC),
+                            retry_count=CONNECTION_RETRY_ATTEMPTS,
+                            retry_delay=RETRY_INTERVAL,
+                            retry_method="get service",
+                            retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+
+            controller_endpoint = retry(
+                lambda: self.apis.kubernetes.get_service_endpoint(namespace, service),
+                retry_count=CONNECTION_RETRY_ATTEMPTS,
+                retry_delay=RETRY_INTERVAL,
+                retry_method="get service endpoint",
+                retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+
+            cfg = Configuration()
+            cfg.username = os.environ[AZDATA_USERNAME]
+            cfg.password = os.environ[AZDATA_PASSWORD]
+            controller_client = ControllerClient(controller_endpoint)
+            controller_client.set_authorization_header(
+                "Basic",
+                cfg.get_basic_auth_token(strip_prefix=True)
+            )
+
+            self._controller_clients[namespace] = controller_client
+            return controller_client
+
     def list_all_custom_resource_instances(self, cluster_name):
         """
-        list all custom resource instances
+        list all custom resource instances. Iterate
+        `iter_custom_resource_instances` instead where the whole list is not needed.
         :param cluster_name:
         :return:
         """
-        result = []
-        crd_files = [POSTGRES_CRD, SQLMI_CRD]
+        return list(self.iter_custom_resource_instances(cluster_name))
 
-        for crd_file in crd_files:
-            # Create the control plane CRD if it doesn't already exist
-            with open(crd_file, "r") as stream:
-                temp = yaml.safe_load(stream)
-                crd = CustomResourceDefinition(temp)
-
-                try:
-                    response = self.apis.kubernetes.list_namespaced_custom_object(cluster_name, crd=crd)
-                except K8sApiException as e:
-                    if e.status == http_status_codes.not_found:
-                        # CRD has not been applied yet, because no custom resource of this kind has been created yet
-                        continue
-                    else:
-                        raise e
-
-                for item in response['items']:
+    @staticmethod
+    def iter_custom_resource_instances(cluster_name, page_size=INSTANCE_LIST_PAGE_SIZE):
+        """
+        Yields the ready postgres and sql mi instances in a namespace. Both
+        kinds are listed page by page at the same time, and instances are
+        yielded in kind order as their pages arrive.
+        :param cluster_name: The namespace to list.
+        :param page_size: Number of instances requested per page.
+        """
+        crds = [_get_instance_crd(crd_file) for crd_file in [POSTGRES_CRD, SQLMI_CRD]]
+        kinds = [iter_in_background(iter_custom_objects(cluster_name, crd.group, crd.stored_version, crd.plural,
+                                                        page_size))
+                 for crd in crds]
+        for items in kinds:
+            items.start()
+
+        try:
+            for items in kinds:
+                for item in items:
                     spec = item['spec']
                     status = item['status'] if 'status' in item else None
 
                     if status and 'state' in status and status['state'].lower() == 'ready':
-                        result.append({
+                        yield {
                             'kind': item['kind'],
                             'instanceName': item['metadata']['name'],
                             'instanceNamespace': item['metadata']['namespace'],
@@ -622,9 +924,10 @@ class ArcClientMixin(CliClient):
                             'vcores': str(spec['limits']['vcores']) if 'limits' in spec and 'vcores' in spec[
                                 'limits'] else '-',
                             'k8sRaw': item
-                        })
-
-        return result
+                        }
+        finally:
+            for items in kinds:
+                items.close()
 
     def list_deleted_resource_instances(self):
         """
@@ -635,10 +938,10 @@ class ArcClientMixin(CliClient):
         # catch all deletion since last export.
         start_date = datetime.now() - timedelta(days=45)
 
-        instances = util.retry(self.apis.controller.list_deleted_resources, start_date,
-                               retry_count=CONNECTION_RETRY_ATTEMPTS,
-                               retry_delay=RETRY_INTERVAL, retry_method="list deleted resources",
-                               retry_on_exceptions=(NewConnectionError, MaxRetryError))
+        instances = retry(self.apis.controller.list_deleted_resources, start_date,
+                          retry_count=CONNECTION_RETRY_ATTEMPTS,
+                          retry_delay=RETRY_INTERVAL, retry_method="list deleted resources",
+                          retry_on_exceptions=(NewConnectionError, MaxRetryError))
 
         return map(
             lambda x: {
@@ -654,7 +957,7 @@ class ArcClientMixin(CliClient):
         Create a shadow resource for the data controller.
         :param data_controller: The data controller.
         """
-        util.retry(lambda: self.azure_resource_client.create_azure_data_controller(
+        retry(lambda: self.azure_resource_client.create_azure_data_controller(
             uid=data_controller['k8sRaw']['metadata']['uid'],
             resource_name=data_controller['instanceName'],
             subscription_id=data_controller['subscriptionId'],
@@ -666,10 +969,10 @@ class ArcClientMixin(CliClient):
                 'k8sRaw': _.get(data_controller, 'k8sRaw'),
                 'infrastructure': _.get(data_controller, 'infrastructure')
             }),
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL,
-                   retry_method="create Azure data controller",
-                   retry_on_exceptions=(ConnectionError, NewConnectionError, MaxRetryError))
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL,
+              retry_method="create Azure data controller",
+              retry_on_exceptions=(ConnectionError, NewConnectionError, MaxRetryError))
 
     def create_azure_resource(self, resource, data_controller):
         """
@@ -677,7 +980,7 @@ class ArcClientMixin(CliClient):
         :param resource: The custom resource.
         :param data_controller: The data controller.
         """
-        util.retry(lambda: self.azure_resource_client.create_azure_resource(
+        retry(lambda: self.azure_resource_client.create_azure_resource(
             instance_type=azure_constants.RESOURCE_TYPE_FOR_KIND[resource['kind']],
             data_controller_name=data_controller['instanceName'],
             resource_name=resource['instanceName'],
@@ -685,10 +988,10 @@ class ArcClientMixin(CliClient):
             resource_group_name=data_controller['resourceGroupName'],
             location=data_controller['location'],
             extended_properties={'k8sRaw': _.get(resource, 'k8sRaw')}),
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL,
-                   retry_method="create Azure resource",
-                   retry_on_exceptions=(ConnectionError, NewConnectionError, MaxRetryError))
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL,
+              retry_method="create Azure resource",
+              retry_on_exceptions=(ConnectionError, NewConnectionError, MaxRetryError))
 
     def delete_azure_resource(self, resource, data_controller):
         """
@@ -701,14 +1004,14 @@ class ArcClientMixin(CliClient):
         subscription_id = data_controller['subscriptionId']
         resource_group_name = data_controller['resourceGroupName']
 
-        util.retry(self.azure_resource_client.delete_azure_resource,
-                   resource_name,
-                   instance_type,
-                   subscription_id,
-                   resource_group_name,
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL, retry_method="delete Azure resource",
-                   retry_on_exceptions=(ConnectionError, NewConnectionError, MaxRetryError))
+        retry(self.azure_resource_client.delete_azure_resource,
+              resource_name,
+              instance_type,
+              subscription_id,
+              resource_group_name,
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL, retry_method="delete Azure resource",
+              retry_on_exceptions=(ConnectionError, NewConnectionError, MaxRetryError))
 
     def get_usages(self, max_sequence_id_last_upload):
         request_body = {"rowCountLimit": 10000, "maxSequenceIdLastUpload": max_sequence_id_last_upload}
@@ -724,7 +1027,7 @@ class ArcClientMixin(CliClient):
         import json
 
         uncompressed_usage = json.loads(
-            str(zlib.decompress(base64.b64decode(usage['usages']), -zlib.MAX_WBITS), 'utf-8'))
+            zlib.decompress(base64.b64decode(usage['usages']), -zlib.MAX_WBITS))
 
         return self.azure_resource_client.upload_usages_dps(
             cluster_id=data_controller['k8sRaw']['metadata']['uid'],
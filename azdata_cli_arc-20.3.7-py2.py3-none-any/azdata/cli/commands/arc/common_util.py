@@ -6,7 +6,11 @@
 # Arc command util
 import json
 import os
+import queue
 import re
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
 
 from azdata.cli.commands.arc import constants as dc_constants
 from azdata.cli.commands.arc import export_instance_properties as instance_properties
@@ -186,6 +190,318 @@ def write_output_file(file_path, content):
     with open(file_path, 'w', encoding='utf-8') as json_file:
         json.dump(content, json_file, indent=4)
 
+
+def iter_text_chunks(text, chunk_size=dc_constants.EXPORT_STREAM_CHUNK_SIZE):
+    """
+    Yields successive slices of `text` so it can be written without building
+    intermediate copies of the whole payload.
+    """
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+_JSON_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]*')
+_JSON_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?\Z')
+_JSON_LITERALS = frozenset(['true', 'false', 'null'])
+_JSON_STRUCTURAL = frozenset('[]{}:,"')
+_JSON_ESCAPES = frozenset('"\\/bfnrt')
+_JSON_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+_JSON_MAX_SCALAR_LENGTH = 1024
+
+
+class JsonStreamValidator(object):
+    """
+    Incrementally validates that a stream of text chunks forms exactly one
+    JSON array, following the full JSON grammar. Only the open containers
+    and the current token are kept, so memory use does not depend on the
+    size of the document.
+    """
+
+    # Next token the grammar allows
+    _VALUE, _VALUE_OR_CLOSE, _KEY, _KEY_OR_CLOSE, _COLON, _COMMA_OR_CLOSE, _END = range(7)
+
+    def __init__(self):
+        self._stack = []
+        self._expect = self._VALUE
+        self._string = None
+        self._escape = 0
+        self._scalar = ''
+        self._offset = 0
+
+    def feed(self, chunk):
+        i = 0
+        n = len(chunk)
+        while i < n:
+            if self._string is not None:
+                i = self._feed_string(chunk, i)
+                continue
+
+            c = chunk[i]
+            if not c.isspace() and c not in _JSON_STRUCTURAL:
+                if not self._scalar and self._expect not in (self._VALUE, self._VALUE_OR_CLOSE):
+                    self._fail(c, i)
+                if not self._stack:
+                    raise ValueError('Exported data file does not contain a JSON array.')
+                self._scalar += c
+                if len(self._scalar) > _JSON_MAX_SCALAR_LENGTH:
+                    self._fail(c, i)
+                i += 1
+                continue
+
+            if self._scalar:
+                self._end_scalar(i)
+            i += 1
+            if c.isspace():
+                continue
+
+            if self._expect == self._END:
+                raise ValueError('Unexpected data after the end of the exported JSON document.')
+            if not self._stack and c != '[':
+                raise ValueError('Exported data file does not contain a JSON array.')
+
+            if c == '"':
+                if self._expect in (self._VALUE, self._VALUE_OR_CLOSE):
+                    self._string = 'value'
+                elif self._expect in (self._KEY, self._KEY_OR_CLOSE):
+                    self._string = 'key'
+                else:
+                    self._fail(c, i - 1)
+            elif c in '[{':
+                if self._expect not in (self._VALUE, self._VALUE_OR_CLOSE):
+                    self._fail(c, i - 1)
+                self._stack.append(c)
+                self._expect = self._VALUE_OR_CLOSE if c == '[' else self._KEY_OR_CLOSE
+            elif c == ']':
+                if not self._stack or self._stack[-1] != '[' or \
+                        self._expect not in (self._VALUE_OR_CLOSE, self._COMMA_OR_CLOSE):
+                    self._fail(c, i - 1)
+                self._stack.pop()
+                self._end_value()
+            elif c == '}':
+                if not self._stack or self._stack[-1] != '{' or \
+                        self._expect not in (self._KEY_OR_CLOSE, self._COMMA_OR_CLOSE):
+                    self._fail(c, i - 1)
+                self._stack.pop()
+                self._end_value()
+            elif c == ',':
+                if self._expect != self._COMMA_OR_CLOSE:
+                    self._fail(c, i - 1)
+                self._expect = self._VALUE if self._stack[-1] == '[' else self._KEY
+            elif c == ':':
+                if self._expect != self._COLON:
+                    self._fail(c, i - 1)
+                self._expect = self._VALUE
+
+        self._offset += n
+
+    def close(self):
+        if self._scalar:
+            self._end_scalar(0)
+        if self._expect != self._END or self._string is not None:
+            raise ValueError('Exported data file is truncated or malformed.')
+
+    def _feed_string(self, chunk, i):
+        n = len(chunk)
+        while i < n:
+            c = chunk[i]
+            if self._escape == 1:
+                if c == 'u':
+                    self._escape = 2
+                elif c in _JSON_ESCAPES:
+                    self._escape = 0
+                else:
+                    self._fail(c, i)
+            elif self._escape:
+                if c not in _JSON_HEX_DIGITS:
+                    self._fail(c, i)
+                self._escape = 0 if self._escape == 5 else self._escape + 1
+            else:
+                i = _JSON_STRING_RUN.match(chunk, i).end()
+                if i == n:
+                    break
+                c = chunk[i]
+                if c == '"':
+                    if self._string == 'key':
+                        self._expect = self._COLON
+                    else:
+                        self._end_value()
+                    self._string = None
+                    return i + 1
+                if c != '\\':
+                    self._fail(c, i)
+                self._escape = 1
+            i += 1
+        return i
+
+    def _end_scalar(self, i):
+        if self._scalar not in _JSON_LITERALS and not _JSON_NUMBER.match(self._scalar):
+            raise ValueError('Exported data file is not valid JSON: unexpected "{}" before offset {}.'.format(
+                self._scalar[:32], self._offset + i))
+        self._scalar = ''
+        self._end_value()
+
+    def _end_value(self):
+        self._expect = self._COMMA_OR_CLOSE if self._stack else self._END
+
+    def _fail(self, c, i):
+        raise ValueError('Exported data file is not valid JSON: unexpected {!r} at offset {}.'.format(
+            c, self._offset + i))
+
+
+def write_file_stream(file_path, chunks, export_type, data_timestamp=None):
+    """
+    Streams `chunks` of JSON text into an export file with the same envelope
+    as `write_file`, validating the payload as it is copied. The payload is
+    never parsed into Python objects.
+    """
+    validator = JsonStreamValidator()
+    header = json.dumps({"exportType": export_type, "dataTimestamp": data_timestamp})
+
+    try:
+        with open(file_path, 'w', encoding='utf-8') as json_file:
+            json_file.write(header[:-1] + ', "data": ')
+            for chunk in chunks:
+                # The controller hands data files over with single quoted strings
+                chunk = chunk.replace("\'", "\"")
+                validator.feed(chunk)
+                json_file.write(chunk)
+            validator.close()
+            json_file.write('}')
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+############################################################################
+# Concurrency
+############################################################################
+
+class TaskResult(object):
+    """
+    Outcome of running one work item through `execute_concurrently`.
+    """
+
+    def __init__(self, item, result=None, error=None):
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+
+def execute_concurrently(func, items, parallelism):
+    """
+    Runs `func` over `items` with at most `parallelism` calls in flight.
+    Exceptions are captured per item instead of aborting the remaining work.
+    :return: A list of `TaskResult` in the same order as `items`.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def run(item):
+        try:
+            return TaskResult(item, result=func(item))
+        except Exception as e:
+            return TaskResult(item, error=e)
+
+    parallelism = max(1, min(int(parallelism), len(items)))
+    if parallelism == 1:
+        return [run(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        return list(executor.map(run, items))
+
+
+def iter_in_background(iterable, buffer_size=2):
+    """
+    Consumes `iterable` on a background thread, keeping at most
+    `buffer_size` items ready ahead of the caller. Use it to overlap the
+    round trips of several paginated listings. The thread starts with the
+    first `next()`, or with `start()` to prefetch before that. Errors raised
+    by `iterable` are re-raised to the caller.
+    """
+    return _BackgroundIterator(iterable, buffer_size)
+
+
+class _BackgroundIterator(object):
+    _done = object()
+
+    def __init__(self, iterable, buffer_size):
+        self._iterable = iterable
+        self._items = queue.Queue(maxsize=buffer_size)
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(target=self._produce,
+                                                args=(self._iterable, self._items, self._stopped),
+                                                daemon=True)
+                self._thread.start()
+
+    def close(self):
+        self._stopped.set()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stopped.is_set():
+            raise StopIteration
+
+        self.start()
+        item, error = self._items.get()
+        if item is self._done:
+            self.close()
+            if error is not None:
+                raise error
+            raise StopIteration
+        return item
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def _produce(iterable, items, stopped):
+        # Holds no reference to the iterator, so dropping it stops the thread
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    items.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_BackgroundIterator._done, e))
+        else:
+            put((_BackgroundIterator._done, None))
+
+
+def validate_parallelism(parallelism):
+    """
+    Validates a user supplied degree of parallelism.
+    """
+    try:
+        parallelism = int(parallelism)
+    except (TypeError, ValueError):
+        parallelism = 0
+
+    if parallelism < 1:
+        raise ValueError('Parallelism must be a positive integer.')
+    return parallelism
+
+
 def get_valid_dc_infrastructures():
     """
     Get the valid sql license types
@@ -89,6 +89,16 @@ DAG_CRD = os.path.join(TEMPLATE_DIR, 'dag_crd.yaml')
 File location for distributed AG CRD.
 """
 
+CRD_HASH_ANNOTATION = 'arcdata.microsoft.com/content-hash'
+"""
+Annotation holding the SHA-256 of the CRD file a CRD was installed from.
+"""
+
+CRD_HASH_LABEL = 'arcdata.microsoft.com/content-hashed'
+"""
+Label marking CRDs that carry the content-hash annotation, used to list them.
+"""
+
 
 EXPORT_TASK_CRD = os.path.join(TEMPLATE_DIR, 'export-crd.yaml')
 """
@@ -140,16 +150,63 @@ TASK_API_GROUP = "tasks.arcdata.microsoft.com"
 Defines the API group.
 """
 
+CONNECTION_RETRY_ATTEMPTS = 12
+"""
+Maximum number of attempts of a retried Kubernetes, controller or Azure call
+"""
+
+RETRY_INTERVAL = 5
+"""
+Upper bound in seconds of the delay between two attempts of a retried call
+"""
+
+RETRY_BASE_DELAY = 0.5
+"""
+Delay in seconds before the first retry, doubled on every further attempt
+"""
+
+RETRY_DEADLINE = 60
+"""
+Time budget in seconds for all attempts of a single retried call
+"""
+
 MAX_POLLING_ATTEMPTS = 12
 """
 Max retry attepts to get custom resource status
 """
 
+EXPORT_TASK_TIMEOUT = 240
+"""
+Default time in seconds to wait for an export task to complete
+"""
+
 EXPORT_COMPLETED_STATE = "Completed"
 """
 Export completed state
 """
 
+EXPORT_STREAM_CHUNK_SIZE = 1024 * 1024
+"""
+Number of characters copied per write when streaming export data files to disk
+"""
+
+EXPORT_DEFAULT_PARALLELISM = 2
+"""
+Default number of export data files downloaded concurrently. Each download
+holds its whole data file in memory until it is written to disk.
+"""
+
+INSTANCE_LIST_PAGE_SIZE = 100
+"""
+Number of custom resource instances requested per page when listing them
+"""
+
+UPLOAD_DEFAULT_PARALLELISM = 8
+"""
+Default number of Azure resources synchronized, and of instance logs uploaded
+to Log Analytics, concurrently during upload
+"""
+
 DEFAULT_METRIC_QUERY_WINDOW_IN_MINUTE = 28
 """
 Default metric query window in minute
@@ -10,7 +10,6 @@ import sys
 import time
 
 import azdata.cli.core.deploy as util
-import yaml
 from azdata.cli.commands.arc.exceptions import ArcError
 from azdata.cli.core.exceptions import (KubernetesError)
 from azdata.cli.core.labels import parse_labels
@@ -33,9 +32,13 @@ from azdata.cli.commands.arc.constants import (
     DAG_CRD,
     DIRECT,
     EXPORT_TASK_RESOURCE_KIND_PLURAL,
+    EXPORT_DEFAULT_PARALLELISM,
     TASK_API_GROUP,
-    MAX_POLLING_ATTEMPTS,
-    EXPORT_COMPLETED_STATE
+    UPLOAD_DEFAULT_PARALLELISM,
+    EXPORT_COMPLETED_STATE,
+    EXPORT_TASK_TIMEOUT,
+    CONNECTION_RETRY_ATTEMPTS,
+    RETRY_INTERVAL
 )
 from azdata.cli.commands.arc.azure import constants as azure_constants
 from azdata.cli.commands.arc.export_util import (
@@ -50,13 +53,26 @@ from azdata.cli.commands.arc.export_util import (
     get_export_timestamp_from_file,
     get_export_timestamp,
     update_upload_status_file,
-    generate_export_file_name
+    generate_export_file_name,
+    run_upload_unit,
+    UploadJournal
 )
 from azdata.cli.commands.arc.common_util import (
+    execute_concurrently,
+    iter_text_chunks,
     validate_dc_create_params,
-    write_file,
+    validate_parallelism,
+    write_file_stream,
     write_output_file
 )
+from azdata.cli.commands.arc.resource_cache import custom_object_exists, list_custom_objects
+from azdata.cli.commands.arc.retry_util import retry
+from azdata.cli.commands.arc.template_util import load_yaml
+from azdata.cli.commands.arc.trace_util import trace_command
+from azdata.cli.commands.arc.watch_util import (
+    get_resource_version,
+    wait_for_custom_object
+)
 from azdata.cli.core.configuration import Configuration
 from azdata.cli.core.constants import (ARC_GROUP, ARC_API_VERSION, ARC_NAMESPACE_LABEL, DATA_CONTROLLER_PLURAL)
 from azdata.cli.core.debug import (copy_debug_logs, take_dump)
@@ -77,14 +93,13 @@ from jsonschema import validate
 from knack.prompting import NoTTYException
 from urllib3.exceptions import NewConnectionError, MaxRetryError
 
-CONNECTION_RETRY_ATTEMPTS = 12
-RETRY_INTERVAL = 5
 
 IS_WINDOWS = os.name == 'nt'
 
 import azdata.cli.core.deploy as util
 
 
+@trace_command("arc dc create")
 def dc_create(
         client,
         namespace,
@@ -98,7 +113,8 @@ def dc_create(
         storage_class=None,
         infrastructure=INFRASTRUCTURE_PARAMETER_DEFAULT_VALUE,
         service_annotations=None,
-        service_labels=None):
+        service_labels=None,
+        trace_file=None):
     """
     If an argument is not provided, the user will be prompted for the needed
     values NoTTY Scenario: provide a config_profile, profile_name
@@ -114,6 +130,7 @@ def dc_create(
     :param path: custom config profile
     :param service_annotations: Annotations applied to all configurable services.
     :param service_labels: Labels applied to all configurable services.
+    :param trace_file: Chrome trace file of the calls made by the command.
     :return:
     """
     args = locals()
@@ -197,16 +214,12 @@ def dc_create(
         crd_files = [POSTGRES_CRD, SQLMI_CRD, SQLMI_RESTORE_TASK_CRD, EXPORT_TASK_CRD, DAG_CRD, MONITOR_CRD,
                      DATA_CONTROLLER_CRD]
 
-        for crd_file in crd_files:
-            # Create the control plane CRD if it doesn't already exist
-            with open(crd_file, "r") as stream:
-                temp = yaml.safe_load(stream)
-                crd = CustomResourceDefinition(temp)
-                util.retry(lambda: client.apis.kubernetes.create_custom_resource_definition(crd),
-                           retry_count=CONNECTION_RETRY_ATTEMPTS,
-                           retry_delay=RETRY_INTERVAL,
-                           retry_method="create custom resource definition",
-                           retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        # Create the control plane CRDs that are not installed at this version yet
+        installed = client.create_custom_resource_definitions(crd_files)
+
+        crd = installed.get(DATA_CONTROLLER_CRD)
+        if crd is None:
+            crd = CustomResourceDefinition(load_yaml(DATA_CONTROLLER_CRD))
 
         # Create cluster role for metricsdc
         client.create_cluster_role_for_monitoring(dc_cr, namespace)
@@ -261,9 +274,7 @@ def dc_status_show(client, namespace=None):
         if not namespace:
             namespace = client.profile.active_context.namespace
 
-        response = client.apis.kubernetes.list_namespaced_custom_object(
-            namespace, group=ARC_GROUP, version=ARC_API_VERSION, plural=DATA_CONTROLLER_PLURAL
-        )
+        response = list_custom_objects(client, namespace, ARC_GROUP, ARC_API_VERSION, DATA_CONTROLLER_PLURAL)
 
         dcs = response.get("items")
 
@@ -298,9 +309,7 @@ def dc_config_show(client, namespace=None):
         if not namespace:
             namespace = client.profile.active_context.namespace
 
-        response = client.apis.kubernetes.list_namespaced_custom_object(
-            namespace, group=ARC_GROUP, version=ARC_API_VERSION, plural=DATA_CONTROLLER_PLURAL
-        )
+        response = list_custom_objects(client, namespace, ARC_GROUP, ARC_API_VERSION, DATA_CONTROLLER_PLURAL)
 
         dcs = response.get("items")
 
@@ -345,12 +354,7 @@ def dc_delete(client, name, namespace, force=None, yes=None):
         util.check_and_set_kubectl_context()
 
         # -- Check existence of data controller --
-        if not client.apis.kubernetes.namespaced_custom_object_exists(
-                name,
-                namespace,
-                group=ARC_GROUP,
-                version=ARC_API_VERSION,
-                plural=DATA_CONTROLLER_PLURAL):
+        if not custom_object_exists(client, name, namespace, ARC_GROUP, ARC_API_VERSION, DATA_CONTROLLER_PLURAL):
             raise CliError("Data controller `{}` does not exist in namespace `{}`.".format(name, namespace))
 
         # -- Check that connectivity mode is indirect --
@@ -380,23 +384,21 @@ def dc_delete(client, name, namespace, force=None, yes=None):
 
         for crd_file in crd_files:
             # Create the control plane CRD if it doesn't already exist
-            with open(crd_file, "r") as stream:
-                temp = yaml.safe_load(stream)
-                crd = CustomResourceDefinition(temp)
-                cr_list = client.apis.kubernetes.list_namespaced_custom_object(namespace, crd=crd)
-                if cr_list["items"]:
-                    if not force:
-                        raise ArcError("Instances of `{}` are deployed. Cannot delete data controller `{}`. "
-                                       "Please delete these instances before deleting the data controller or "
-                                       "use --force."
-                                       .format(crd.kind, name))
-                    else:
-                        stdout("Deleting instances of `{}`.".format(crd.kind))
-                        for item in cr_list["items"]:
-                            cr_name = item["metadata"]["name"]
-                            client.apis.kubernetes.delete_namespaced_custom_object(name=cr_name, namespace=namespace,
-                                                                                   crd=crd)
-                            stdout("`{}` deleted.".format(cr_name))
+            crd = CustomResourceDefinition(load_yaml(crd_file))
+            cr_list = client.apis.kubernetes.list_namespaced_custom_object(namespace, crd=crd)
+            if cr_list["items"]:
+                if not force:
+                    raise ArcError("Instances of `{}` are deployed. Cannot delete data controller `{}`. "
+                                   "Please delete these instances before deleting the data controller or "
+                                   "use --force."
+                                   .format(crd.kind, name))
+                else:
+                    stdout("Deleting instances of `{}`.".format(crd.kind))
+                    for item in cr_list["items"]:
+                        cr_name = item["metadata"]["name"]
+                        client.apis.kubernetes.delete_namespaced_custom_object(name=cr_name, namespace=namespace,
+                                                                               crd=crd)
+                        stdout("`{}` deleted.".format(cr_name))
 
         stdout("Exporting the remaining resource usage information...")
 
@@ -419,10 +421,8 @@ def dc_delete(client, name, namespace, force=None, yes=None):
         crd_files = [MONITOR_CRD, DATA_CONTROLLER_CRD]
 
         for crd_file in crd_files:
-            with open(crd_file, "r") as stream:
-                temp = yaml.safe_load(stream)
-                crd = CustomResourceDefinition(temp)
-                client.apis.kubernetes.delete_custom_resource_definition(crd)
+            crd = CustomResourceDefinition(load_yaml(crd_file))
+            client.apis.kubernetes.delete_custom_resource_definition(crd)
 
         stdout("Data controller `{}` deleted successfully.".format(name))
 
@@ -616,17 +616,12 @@ def dc_debug_dump(
         raise CliError(e)
 
 
-def dc_export(client, export_type, path, force=None):
+@trace_command("arc dc export")
+def dc_export(client, export_type, path, force=None, parallelism=EXPORT_DEFAULT_PARALLELISM,
+              timeout=EXPORT_TASK_TIMEOUT, namespaces=None, all_namespaces=None, trace_file=None):
     """
     Export metrics, logs or usage to a file.
     """
-    from datetime import datetime, timedelta
-    import time
-
-    stdout = client.stdout
-    cluster_name = client.profile.active_context.namespace
-    info_msg = 'This option exports {} of all instances in "{}" to the file: "{}".'
-
     # -- Check Kubectl Context --
     util.check_and_set_kubectl_context()
 
@@ -635,151 +630,47 @@ def dc_export(client, export_type, path, force=None):
             raise ValueError('{} is not a supported type. '
                              'Please specify one of the following: {}'.format(export_type, ExportType.list()))
 
-        path = _check_prompt_export_output_file(path, force)
-        data_controller = client.get_data_controller(cluster_name)
-
-        content = {
-            'exportType': export_type,
-            'dataController': data_controller,
-            'dataTimestamp': datetime.now().isoformat(sep=' ', timespec='milliseconds'),
-            'instances': [],
-            'data': []
-        }
-
-        if data_controller['connectionMode'].lower() == azure_constants.DIRECT_CONNECTIVITY_MODE:
-            raise ValueError('Export is not supported for direct connectivity mode.')
-
-        # Create export custom resource
-        # Get startTime and endTime of export
-        endTime = datetime.utcnow()
-        startTime = get_export_timestamp(export_type)
-
-        # End log collection 2 minutes ago. A 2 minute buffer is used because
-        # logs emitted right now may not have been ingested by Elasticsearch yet.
-        if export_type.lower() == ExportType.logs.value:
-            endTime = endTime - timedelta(minutes=2)
-
-        export_cr_name = "export-{}-{}".format(
-            export_type,
-            endTime.strftime("%Y-%m-%d-%H-%M-%S")
-            + "-"
-            + str(time_ns() // 1000000),
-        )            
-
-        with open(EXPORT_TASK_CRD, "r") as stream:
-            temp = yaml.safe_load(stream)
-            crd = CustomResourceDefinition(temp)
-
-            spec_object = {
-                "apiVersion": crd.group + '/' + crd.stored_version,
-                "kind": crd.kind,
-                "metadata": {
-                    "name" : export_cr_name,
-                    "namespace": client.profile.active_context.namespace
-                },
-                "spec": {
-                    "exportType": export_type,
-                    "startTime": startTime,
-                    "endTime": endTime
-                }
-            }
-
-            cr = CustomResource.decode(ExportTaskCustomResource, spec_object)
-            cr.validate(client.apis.kubernetes)
-
-            response = util.retry(
-                lambda: client.apis.kubernetes.create_namespaced_custom_object_with_body(spec_object, cr=cr,
-                                                                                         plural=crd.plural,
-                                                                                         ignore_conflict=True),
-                retry_count=CONNECTION_RETRY_ATTEMPTS,
-                retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
-                retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
-
-            if response:
-                client.stdout("Export custom resource: {} is created.".format(export_cr_name))
-            else:
-                raise CliError("Failed to create export custom resource: {}".format(export_cr_name))
-
-            index_file_path = _get_export_task_file_path(client, export_cr_name)
+        parallelism = validate_parallelism(parallelism)
+        if timeout is None or timeout <= 0:
+            raise ValueError('Timeout must be a positive number of seconds.')
 
-            if index_file_path == 'No data are exported' or index_file_path is None:
-                raise CliError("No data are exported.")
+        if not namespaces and not all_namespaces:
+            path = _check_prompt_export_output_file(path, force)
+            _export_data_controller(client, client.profile.active_context.namespace, export_type, path,
+                                    parallelism, timeout)
+            return
 
-            # Get download path
-            index_file = util.retry(client.apis.controller.export_file_path_get,
-                                    index_file_path,
-                                    retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                    retry_delay=RETRY_INTERVAL, retry_method="download index file",
-                                    retry_on_exceptions=(NewConnectionError, MaxRetryError))
+        if namespaces and all_namespaces:
+            raise ValueError('Please specify either --namespaces or --all-namespaces, not both.')
 
-            index_file_json = json.loads(index_file.replace("\'", "\""))
+        if all_namespaces:
+            namespaces = client.list_data_controller_namespaces()
+        else:
+            namespaces = list(dict.fromkeys(ns.strip() for ns in namespaces.split(',') if ns.strip()))
 
-            data_controller['publicKey'] = index_file_json['publicSigningCertificate'];
-            content['dataTimestamp'] = index_file_json['endTime']
+        if not namespaces:
+            raise ValueError('No data controllers were found to export from.')
 
-            instances = client.list_all_custom_resource_instances(cluster_name)
-            content['instances'] = instances
+        # Each data controller is exported to its own file named after its
+        # namespace. Prompt for all of them before any export starts.
+        paths = dict((ns, _check_prompt_export_output_file(generate_export_file_name(path, ns), force))
+                     for ns in namespaces)
 
-            active_instances = dict.fromkeys(
-                map(lambda x: '{}/{}.{}'.format(x['kind'], x['instanceName'], x['instanceNamespace']), instances))
+        client.stdout('Exporting {} from {} data controllers: {}'.format(
+            export_type, len(namespaces), ', '.join(namespaces)))
 
-            deleted_instances = index_file_json["customResourceDeletionList"]
+        # The data controllers share the parallelism, so each of them downloads its data files one at a time
+        results = execute_concurrently(
+            lambda ns: _export_data_controller(client, ns, export_type, paths[ns], 1, timeout),
+            namespaces,
+            parallelism)
 
-            # Ignored instances which were deleted but subsequently recreated, as their will be updated
-            content['deletedInstances'] = list(filter(
-                lambda x: '{}/{}.{}'.format(x['kind'], x['instanceName'], x['instanceNamespace'])
-                          not in active_instances.keys(),
-                deleted_instances))
-            stdout(info_msg.format(
-                export_type,
-                client.profile.active_context.namespace,
-                path))
-
-            if export_type.lower() == ExportType.metrics.value or export_type.lower() == ExportType.usage.value:
-                file = util.retry(client.apis.controller.export_file_path_get,
-                                  index_file_json["dataFilePathList"][0],
-                                  retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                  retry_delay=RETRY_INTERVAL, retry_method="download data file",
-                                  retry_on_exceptions=(NewConnectionError, MaxRetryError))
-
-                if file:
-                    content['data'] = json.loads(file.replace("\'", "\""))
-                    write_output_file(path, content)
-                    stdout('{0} are exported to {1}'.format(export_type, path))
-                else:
-                    allowNodeMetricsCollection = content['dataController']['k8sRaw']['spec']['security'][
-                        'allowNodeMetricsCollection']
-                    allowPodMetricsCollection = content['dataController']['k8sRaw']['spec']['security'][
-                        'allowPodMetricsCollection']
-                    if not allowNodeMetricsCollection or not allowPodMetricsCollection:
-                        stdout('There are no metrics available for export. '
-                               'Please follow the documentation to ensure that allowNodeMetricsCollection and/or allowPodMetricsCollection are set to true to collect metrics and then export them.')
-                    else:
-                        stdout('Failed to get metrics. '
-                               'Please ensure you connect to the correct cluster and the instances have metrics.')
-            elif export_type.lower() == ExportType.logs.value:
-                file_index = 0
-                data_files = []
-                for data_file_path in index_file_json["dataFilePathList"]:
-                    file = util.retry(client.apis.controller.export_file_path_get,
-                                      data_file_path,
-                                      retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                      retry_delay=RETRY_INTERVAL, retry_method="download data file",
-                                      retry_on_exceptions=(NewConnectionError, MaxRetryError))
-
-                    if file:
-                        data = json.loads(file.replace("\'", "\""))
-                        file_path = generate_export_file_name(path, file_index)
-                        write_file(file_path, data, export_type, index_file_json['endTime'])
-                        file_index += 1
-                        data_files.append(file_path)
-
-                if len(data_files) > 0:
-                    content['data'] = data_files
-                    write_output_file(path, content)
-                    stdout('{0} are exported to {1}'.format(export_type, path))
-                else:
-                    stdout('No log is exported.')
+        failed = [r for r in results if not r.succeeded]
+        for r in failed:
+            client.stderr('Failed to export {} from namespace "{}": {}'.format(export_type, r.item, r.error))
+        if failed:
+            raise CliError('{} of {} data controllers failed to export. Please try again.'.format(
+                len(failed), len(namespaces)))
 
     except NoTTYException:
         raise CliError('Please specify `--force` in non-interactive mode.')
@@ -787,11 +678,195 @@ def dc_export(client, export_type, path, force=None):
         raise CliError(e)
 
 
-def dc_upload(client, path):
+def _export_data_controller(client, namespace, export_type, path, parallelism, timeout):
     """
-    Upload data file exported from a data controller to Azure.
+    Exports metrics, logs or usage of the data controller in `namespace` to
+    the file at `path`.
     """
+    from datetime import datetime, timedelta
+
+    stdout = client.stdout
+    controller = client.get_controller_client(namespace)
+    info_msg = 'This option exports {} of all instances in "{}" to the file: "{}".'
 
+    data_controller = client.get_data_controller(namespace)
+
+    content = {
+        'exportType': export_type,
+        'dataController': data_controller,
+        'dataTimestamp': datetime.now().isoformat(sep=' ', timespec='milliseconds'),
+        'instances': [],
+        'data': []
+    }
+
+    if data_controller['connectionMode'].lower() == azure_constants.DIRECT_CONNECTIVITY_MODE:
+        raise ValueError('Export is not supported for direct connectivity mode.')
+
+    # Create export custom resource
+    # Get startTime and endTime of export
+    endTime = datetime.utcnow()
+    startTime = get_export_timestamp(export_type, namespace)
+
+    # End log collection 2 minutes ago. A 2 minute buffer is used because
+    # logs emitted right now may not have been ingested by Elasticsearch yet.
+    if export_type.lower() == ExportType.logs.value:
+        endTime = endTime - timedelta(minutes=2)
+
+    export_cr_name = "export-{}-{}".format(
+        export_type,
+        endTime.strftime("%Y-%m-%d-%H-%M-%S")
+        + "-"
+        + str(time_ns() // 1000000),
+    )            
+
+    crd = CustomResourceDefinition(load_yaml(EXPORT_TASK_CRD))
+
+    spec_object = {
+        "apiVersion": crd.group + '/' + crd.stored_version,
+        "kind": crd.kind,
+        "metadata": {
+            "name" : export_cr_name,
+            "namespace": namespace
+        },
+        "spec": {
+            "exportType": export_type,
+            "startTime": startTime,
+            "endTime": endTime
+        }
+    }
+
+    cr = CustomResource.decode(ExportTaskCustomResource, spec_object)
+    cr.validate(client.apis.kubernetes)
+
+    response = retry(
+        lambda: client.apis.kubernetes.create_namespaced_custom_object_with_body(spec_object, cr=cr,
+                                                                            plural=crd.plural,
+                                                                            ignore_conflict=True),
+        retry_count=CONNECTION_RETRY_ATTEMPTS,
+        retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
+        retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+
+    if response:
+        client.stdout("Export custom resource: {} is created.".format(export_cr_name))
+    else:
+        raise CliError("Failed to create export custom resource: {}".format(export_cr_name))
+
+    index_file_path = _get_export_task_file_path(client, export_cr_name, namespace,
+                                                 get_resource_version(response),
+                                                 timeout)
+
+    if index_file_path == 'No data are exported' or index_file_path is None:
+        raise CliError("No data are exported.")
+
+    # Get download path
+    index_file = retry(controller.export_file_path_get,
+                       index_file_path,
+                       retry_count=CONNECTION_RETRY_ATTEMPTS,
+                       retry_delay=RETRY_INTERVAL, retry_method="download index file",
+                       retry_on_exceptions=(NewConnectionError, MaxRetryError))
+
+    index_file_json = json.loads(index_file.replace("\'", "\""))
+
+    data_controller['publicKey'] = index_file_json['publicSigningCertificate'];
+    content['dataTimestamp'] = index_file_json['endTime']
+
+    # The export file holds every instance, so collect them and their keys in a single pass
+    instances = []
+    active_instances = {}
+    for instance in client.iter_custom_resource_instances(namespace):
+        instances.append(instance)
+        active_instances['{}/{}.{}'.format(instance['kind'], instance['instanceName'],
+                                           instance['instanceNamespace'])] = None
+    content['instances'] = instances
+
+    deleted_instances = index_file_json["customResourceDeletionList"]
+
+    # Ignored instances which were deleted but subsequently recreated, as their will be updated
+    content['deletedInstances'] = list(filter(
+        lambda x: '{}/{}.{}'.format(x['kind'], x['instanceName'], x['instanceNamespace'])
+                  not in active_instances.keys(),
+        deleted_instances))
+    stdout(info_msg.format(
+        export_type,
+        namespace,
+        path))
+
+    if export_type.lower() == ExportType.metrics.value or export_type.lower() == ExportType.usage.value:
+        file = retry(controller.export_file_path_get,
+                     index_file_json["dataFilePathList"][0],
+                     retry_count=CONNECTION_RETRY_ATTEMPTS,
+                     retry_delay=RETRY_INTERVAL, retry_method="download data file",
+                     retry_on_exceptions=(NewConnectionError, MaxRetryError))
+
+        if file:
+            content['data'] = json.loads(file.replace("\'", "\""))
+            write_output_file(path, content)
+            stdout('{0} are exported to {1}'.format(export_type, path))
+        else:
+            allowNodeMetricsCollection = content['dataController']['k8sRaw']['spec']['security'][
+                'allowNodeMetricsCollection']
+            allowPodMetricsCollection = content['dataController']['k8sRaw']['spec']['security'][
+                'allowPodMetricsCollection']
+            if not allowNodeMetricsCollection or not allowPodMetricsCollection:
+                stdout('There are no metrics available for export. '
+                       'Please follow the documentation to ensure that allowNodeMetricsCollection and/or allowPodMetricsCollection are set to true to collect metrics and then export them.')
+            else:
+                stdout('Failed to get metrics. '
+                       'Please ensure you connect to the correct cluster and the instances have metrics.')
+    elif export_type.lower() == ExportType.logs.value:
+        data_file_paths = index_file_json["dataFilePathList"]
+
+        def download_data_file(indexed_path):
+            # Files are downloaded under their position in the export index and numbered once all
+            # downloads are done, so empty data files leave no gaps in the file names.
+            file_index, data_file_path = indexed_path
+            file = retry(controller.export_file_path_get,
+                         data_file_path,
+                         retry_count=CONNECTION_RETRY_ATTEMPTS,
+                         retry_delay=RETRY_INTERVAL, retry_method="download data file",
+                         retry_on_exceptions=(NewConnectionError, MaxRetryError))
+
+            if not file:
+                return None
+
+            # The controller client returns the whole data file. Copy it to disk in chunks rather
+            # than parsing and re-serializing it, so no object tree or second copy of it is built.
+            file_path = generate_export_file_name(path, 'part-{}'.format(file_index))
+            write_file_stream(file_path, iter_text_chunks(file), export_type, index_file_json['endTime'])
+            return file_path
+
+        results = execute_concurrently(download_data_file, enumerate(data_file_paths), parallelism)
+        part_files = [r.result for r in results if r.succeeded and r.result]
+
+        failed = [r for r in results if not r.succeeded]
+        for r in failed:
+            client.stderr('Failed to export data file "{}": {}'.format(r.item[1], r.error))
+        if failed:
+            for part_file in part_files:
+                os.remove(part_file)
+            raise CliError('{} of {} data files failed to export. Please try again.'.format(
+                len(failed), len(data_file_paths)))
+
+        data_files = []
+        for file_index, part_file in enumerate(part_files):
+            file_path = generate_export_file_name(path, file_index)
+            os.replace(part_file, file_path)
+            data_files.append(file_path)
+            stdout('\t\t{} are exported to {}.'.format(export_type.capitalize(), file_path))
+
+        if len(data_files) > 0:
+            content['data'] = data_files
+            write_output_file(path, content)
+            stdout('{0} are exported to {1}'.format(export_type, path))
+        else:
+            stdout('No log is exported.')
+
+
+@trace_command("arc dc upload")
+def dc_upload(client, path, parallelism=UPLOAD_DEFAULT_PARALLELISM, trace_file=None):
+    """
+    Upload data file exported from a data controller to Azure.
+    """
     import uuid
     from datetime import datetime
     try:
@@ -799,6 +874,8 @@ def dc_upload(client, path):
             raise FileNotFoundError('Cannot find file: "{}". Please provide the correct file name and try again'.format(
                 path))
 
+        parallelism = validate_parallelism(parallelism)
+
         with open(path, encoding='utf-8') as input_file:
             data = json.load(input_file)
             data = Sanitizer.sanitize_object(data, EXPORT_SANITIZERS)
@@ -819,10 +896,16 @@ def dc_upload(client, path):
         raise ValueError(
             '"{}" is not a supported type. Please check your input file "{}".'.format(export_type, path))
 
+    # Completed units of a previous failed upload of this file are skipped
+    #
+    journal = UploadJournal(export_type, data['dataTimestamp'])
+    if journal.resumed_count:
+        client.stdout('Resuming upload, {} units were already uploaded.'.format(journal.resumed_count))
+
     # Create/Update shadow resource for data controller
     #
     data_controller = data['dataController']
-    client.create_dc_azure_resource(data_controller)
+    journal.run('dataController', data_controller, client.create_dc_azure_resource, data_controller)
 
     # Delete shadow resources for resource instances deleted from the cluster in k8s
     #
@@ -830,45 +913,54 @@ def dc_upload(client, path):
 
     for instance in data['deletedInstances']:
         instance_key = '{}/{}.{}'.format(instance['kind'], instance['instanceName'], instance['instanceNamespace'])
+        deleted.setdefault(instance_key, instance)
 
-        if instance_key not in deleted.keys():
-            try:
-                client.delete_azure_resource(instance, data_controller)
-                deleted[instance_key] = True
-            except Exception as e:
-                client.stdout('Failed to delete Azure resource for "{}" in "{}".'
-                              .format(instance['instanceName'], instance['instanceNamespace']))
-                client.stderr(e)
-                continue
+    for r in execute_concurrently(lambda i: journal.run('delete', i, client.delete_azure_resource, i, data_controller),
+                                  deleted.values(), parallelism):
+        if not r.succeeded:
+            client.stdout('Failed to delete Azure resource for "{}" in "{}".'
+                          .format(r.item['instanceName'], r.item['instanceNamespace']))
+            client.stderr(r.error)
 
     # Create/Update shadow resources for resource instances still active in the cluster in k8s
     #
-    for instance in data['instances']:
-        client.create_azure_resource(instance, data_controller)
+    results = execute_concurrently(lambda i: journal.run('resource', i, client.create_azure_resource, i, data_controller),
+                                   data['instances'], parallelism)
+
+    failed = [r for r in results if not r.succeeded]
+    for r in failed:
+        client.stdout('Failed to create Azure resource for "{}" in "{}".'
+                      .format(r.item['instanceName'], r.item['instanceNamespace']))
+        client.stderr(r.error)
+    if failed:
+        raise CliError('{} of {} Azure resources failed to upload. Please try again.'.format(
+            len(failed), len(results)))
 
     # Upload metrics, logs or usage
     #
     if export_type == ExportType.metrics.value:
-        metrics_upload(data['data'])
+        metrics_upload(data['data'], journal)
     elif export_type == ExportType.logs.value:
         customer_id, shared_key = _get_log_workspace_credentials_from_env(client)
         client.stdout('Log Analytics workspace: "{}"'.format(customer_id))
         for file in data['data']:
             with open(file, encoding='utf-8') as input_file:
                 data = json.load(input_file)
-            logs_upload(data['data'], customer_id, shared_key)
+            logs_upload(data['data'], customer_id, shared_key, parallelism, journal)
     elif export_type == "usage":
         if data_controller:
             client.stdout('\n')
             client.stdout('Start uploading usage...')
             correlation_vector = str(uuid.uuid4())
             for usage in data['data']:
-                client.upload_usages_dps(data_controller, usage, data['dataTimestamp'], correlation_vector)
+                journal.run('usage', usage,
+                            client.upload_usages_dps, data_controller, usage, data['dataTimestamp'], correlation_vector)
 
             if LAST_USAGE_UPLOAD_FLAG in data and data[LAST_USAGE_UPLOAD_FLAG]:
                 # Delete DC shadow resource to close out billing
                 #
-                client.delete_azure_resource(resource=data_controller, data_controller=data_controller)
+                journal.run('deleteDataController', data_controller,
+                            client.delete_azure_resource, resource=data_controller, data_controller=data_controller)
 
             client.stdout('Usage upload is done.')
         else:
@@ -878,13 +970,20 @@ def dc_upload(client, path):
         raise ValueError(
             '"{}" is not a supported type. Please check your input file "{}".'.format(export_type, path))
 
-    # Update watermark after upload succeed for all three types of data
-    timestamp_from_status_file = get_export_timestamp_from_file(export_type)
+    # Update watermark only after every unit of the upload succeeded
+    if not journal.is_complete:
+        raise CliError('Upload did not complete. Run the upload again to continue from where it stopped.')
+
+    namespace = (data_controller or {}).get('instanceNamespace')
+    timestamp_from_status_file = get_export_timestamp_from_file(export_type, namespace)
     timestamp_from_export_file = datetime.strptime(data['dataTimestamp'], "%Y-%m-%dT%H:%M:%S.%fZ")
 
     if timestamp_from_status_file < timestamp_from_export_file:
         update_upload_status_file(export_type,
-                                  data_timestamp=timestamp_from_export_file.isoformat(sep=' ', timespec='milliseconds'))
+                                  data_timestamp=timestamp_from_export_file.isoformat(sep=' ', timespec='milliseconds'),
+                                  namespace=namespace)
+
+    journal.clear()
 
 
 def arc_resource_kind_list(client):
@@ -973,32 +1072,32 @@ def _check_prompt_export_output_file(file_path, force):
     return file_path
 
 
-def _get_export_task_file_path(client, name):
-    import time
-
-    retryCount = 0
-
-    while retryCount < MAX_POLLING_ATTEMPTS:
-        export_task = util.retry(
-            lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                name=name,
-                namespace=client.profile.active_context.namespace,
-                group=TASK_API_GROUP,
-                version=ARC_API_VERSION,
-                plural=EXPORT_TASK_RESOURCE_KIND_PLURAL),
-            retry_count=CONNECTION_RETRY_ATTEMPTS,
-            retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-            retry_on_exceptions=(NewConnectionError, MaxRetryError))
+def _get_export_task_file_path(client, name, namespace, resource_version=None, timeout=EXPORT_TASK_TIMEOUT):
+    """
+    Waits for the export task to complete by watching it, starting from the
+    resource version of the create response when it is known.
+    :return: The index file path reported by the completed task.
+    """
+    states = []
 
+    def report_state(export_task):
         state = export_task.get('status', {}).get('state')
-        if state is None:
-            retryCount += 1
-            time.sleep(20)
-        else:
+        if state is not None and (not states or states[-1] != state):
+            states.append(state)
             client.stdout("Export custom resource: {0} state is {1}".format(name, state))
-            if state == EXPORT_COMPLETED_STATE:
-                return export_task.get('status', {}).get('path')
-            else:
-                time.sleep(20)
 
-    raise CliError("Export custom resource:{0} is not ready.".format(name))
+    export_task = wait_for_custom_object(
+        name=name,
+        namespace=namespace,
+        group=TASK_API_GROUP,
+        version=ARC_API_VERSION,
+        plural=EXPORT_TASK_RESOURCE_KIND_PLURAL,
+        predicate=lambda task: task.get('status', {}).get('state') == EXPORT_COMPLETED_STATE,
+        timeout=timeout,
+        resource_version=resource_version,
+        on_change=report_state)
+
+    if export_task is None:
+        raise CliError("Export custom resource:{0} is not ready.".format(name))
+
+    return export_task.get('status', {}).get('path')
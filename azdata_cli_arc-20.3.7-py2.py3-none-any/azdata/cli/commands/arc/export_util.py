@@ -8,23 +8,31 @@ import hmac
 import math
 import os
 import sys
+import threading
 from azdata.cli.commands.sqlmi.constants import SQLMI_LICENSE_TYPE_BASE_PRICE, SQLMI_LICENSE_TYPE_BASE_PRICE_AZURE, SQLMI_LICENSE_TYPE_LICENSE_INCLUDED, SQLMI_LICENSE_TYPE_LICENSE_INCLUDED_AZURE, SQLMI_TIER_BUSINESS_CRITICAL_ALL, SQLMI_TIER_BUSINESS_CRITICAL_AZURE, SQLMI_TIER_GENERAL_PURPOSE_ALL, SQLMI_TIER_GENERAL_PURPOSE_AZURE
 
 import ndjson
 import json
 from enum import Enum
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from jsonschema import validate
 
-import azdata.cli.core.deploy as util
 from azdata.cli.core.configuration import Configuration
 from azdata.cli.commands.arc.azure.ad_auth_util import acquire_token
 from azdata.cli.commands.arc.common_util import (
+    execute_concurrently,
     get_resource_uri,
     write_file,
 )
 from azdata.cli.commands.arc.azure import constants as azure_constants
 from azdata.cli.commands.arc.azure.models.spn import Spn
 from azdata.cli.commands.arc import constants, export_instance_properties as instance_properties
+from azdata.cli.commands.arc.constants import CONNECTION_RETRY_ATTEMPTS, RETRY_INTERVAL
+from azdata.cli.commands.arc.retry_util import retry
 from azdata.cli.core.exceptions import CliError, RequestTimeoutError, ServerError, http_status_codes
 from azdata.cli.core.deploy import display
 from azdata.cli.core.serialization import SanitizerRule
@@ -44,9 +52,6 @@ from urllib3.exceptions import NewConnectionError, MaxRetryError, TimeoutError
 from http import HTTPStatus
 import json
 
-CONNECTION_RETRY_ATTEMPTS = 12
-RETRY_INTERVAL = 5
-
 log = get_logger(__name__)
 
 ############################################################################
@@ -114,6 +119,16 @@ ERROR_IGNORE = 'should not be older than 30 minutes and not more than 4 minutes
 Metric error msg could be ignored 
 """
 
+METRICS_UPLOAD_WINDOW_MINUTES = 30
+"""
+Azure Monitor only accepts metric data points from the last 30 minutes
+"""
+
+METRICS_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+"""
+Timestamp format of exported metric data points
+"""
+
 def _post_metrics(url, body, headers):
     response = requests.post(url, data=body, headers=headers)
 
@@ -131,15 +146,23 @@ def _post_metrics(url, body, headers):
     return response
 
 
-def metrics_upload(metrics):
+def metrics_upload(metrics, journal=None):
 
     if metrics is None:
         display('No metrics need to upload.')
     else:
         display('\n')
-        for data in metrics:
+        for index, data in enumerate(metrics):
             resource_id_value = data[MetricsDataStructure.resource_id_key.value]
             region_value = data[MetricsDataStructure.region_key.value]
+
+            # The journal is scoped to one export file, so the position and
+            # resource identify a batch without serializing it
+            unit = '{}/{}'.format(index, resource_id_value)
+            if journal is not None and journal.has_completed('metrics', unit):
+                display('Metrics of {} were uploaded before, skipping them.\n'.format(resource_id_value))
+                continue
+
             metrics = data['metrics']
             if not resource_id_value or not metrics or not region_value:
                 CliError(
@@ -148,24 +171,66 @@ def metrics_upload(metrics):
 
             current_time = datetime.datetime.utcnow()
 
-            filtered_metrics = list(filter(lambda metric: (current_time - datetime.datetime.strptime(metric["time"], "%Y-%m-%dT%H:%M:%SZ")).total_seconds()/60 <= 30, metrics))
-            if filtered_metrics is None or not filtered_metrics:
+            body, filtered_count = _select_recent_metrics(metrics, current_time)
+            if not filtered_count:
                 print("The metrics data are older than 30 minutes for {}, please export and upload again.".format(resource_id_value))
                 continue
-            log.info("Metrics data in file has {} records. {} are in last 30 mins".format(len(metrics), len(filtered_metrics)))
+            log.info("Metrics data in file has {} records. {} are in last 30 mins".format(len(metrics), filtered_count))
             display('Azure resource_id: {}'.format(resource_id_value))
 
             # Setup request header and url
             headers = _set_header()
             url = _set_url(region_value, resource_id_value)
-            res = util.retry(
-                lambda: _post_metrics(url, body=ndjson.dumps(filtered_metrics), headers=headers),
+            res = run_upload_unit(
+                journal, 'metrics', unit,
+                retry,
+                lambda: _post_metrics(url, body=body, headers=headers),
                 retry_count=CONNECTION_RETRY_ATTEMPTS,
                 retry_delay=RETRY_INTERVAL,
                 retry_method="post metrics data",
                 retry_on_exceptions=(NewConnectionError, MaxRetryError, TimeoutError, RequestTimeoutError, ServerError))
 
-            display('Metrics upload pushed {} data points successfully.\n'.format(len(filtered_metrics)))
+            display('Metrics upload pushed {} data points successfully.\n'.format(filtered_count))
+
+
+def _select_recent_metrics(metrics, current_time):
+    """
+    Selects the metric data points inside the upload window and encodes them
+    as ndjson. Uses a vectorized NumPy filter when available and falls back
+    to parsing each timestamp in Python otherwise.
+    :return: Tuple of (ndjson body, number of selected data points).
+    """
+    if np is not None:
+        indices = _recent_metric_indices(metrics, current_time)
+        if indices is not None:
+            encode = json.JSONEncoder().encode
+            return '\n'.join(encode(metrics[i]) for i in indices), len(indices)
+
+    filtered_metrics = list(filter(
+        lambda metric: (current_time - datetime.datetime.strptime(metric["time"], METRICS_TIME_FORMAT)).total_seconds() / 60 <= METRICS_UPLOAD_WINDOW_MINUTES,
+        metrics))
+    return ndjson.dumps(filtered_metrics), len(filtered_metrics)
+
+
+def _recent_metric_indices(metrics, current_time):
+    """
+    Vectorized upload window filter over fixed-format ISO timestamps.
+    :return: Indices of the selected data points, or None when a timestamp
+             does not match `METRICS_TIME_FORMAT`.
+    """
+    times = [metric["time"] for metric in metrics]
+    if not all(len(t) == 20 and t[-1] == 'Z' for t in times):
+        return None
+
+    try:
+        # Drop the trailing 'Z' since NumPy parses naive UTC timestamps
+        parsed = np.array([t[:-1] for t in times], dtype='datetime64[s]')
+    except ValueError:
+        return None
+
+    age = np.datetime64(current_time, 'us') - parsed
+    mask = age <= np.timedelta64(METRICS_UPLOAD_WINDOW_MINUTES * 60, 's')
+    return np.flatnonzero(mask).tolist()
 
 
 # Given a resource registered in Azure, returns the k8s namespace and name.
@@ -284,20 +349,78 @@ def _write_logs(data_controller, logs, file_name, resource, timestamp):
     write_file(file_name, content, ExportType.logs.value, timestamp)
 
 
-def logs_upload(logs, customer_id, shared_key):
+def logs_upload(logs, customer_id, shared_key, parallelism=1, journal=None):
+    """
+    Uploads exported logs to the Log Analytics workspace. Each instance's
+    records are split into posts under `LOGS_MAXIMUM_POST_SIZE` and
+    different instances are uploaded concurrently.
+    :param parallelism: Maximum number of instances uploaded at the same time.
+    :param journal: Optional `UploadJournal` used to skip chunks uploaded before.
+    """
+    results = execute_concurrently(
+        lambda log: _upload_instance_logs(customer_id, shared_key, log, journal),
+        logs,
+        parallelism)
+
+    failed = [r for r in results if not r.succeeded]
+    for r in failed:
+        display(str(r.error))
+    if failed:
+        raise CliError('Failed to upload logs for {} of {} instances.'.format(
+            len(failed), len(results)))
+
+
+def _upload_instance_logs(customer_id, shared_key, log, journal=None):
     import zlib
-    import base64
 
-    for log in logs:
-        unzip = str(zlib.decompress(base64.b64decode(log['logs']), -zlib.MAX_WBITS), 'utf-8')
-        log_table_name = log['instance_type'] + '_logs'
-        _post_logs_to_logs_analytics(customer_id, 
-                                    shared_key,
-                                    log['instance_name'],
-                                    unzip,
-                                    log_table_name,
-                                    log['instance_type'],
-                                    log['resource_id'])
+    unzip = str(zlib.decompress(base64.b64decode(log['logs']), -zlib.MAX_WBITS), 'utf-8')
+    log_table_name = log['instance_type'] + '_logs'
+    session = _requests_retry_session()
+
+    for body, count in _split_logs_into_posts(json.loads(unzip)):
+        # Chunks are journaled per target resource and content
+        unit = log['resource_id'].encode('utf-8') + b'\n' + body
+        run_upload_unit(journal, 'logs', unit,
+                        _post_logs_to_logs_analytics,
+                        customer_id,
+                        shared_key,
+                        log['instance_name'],
+                        body,
+                        log_table_name,
+                        log['instance_type'],
+                        log['resource_id'],
+                        record_count=count,
+                        session=session)
+
+
+def _split_logs_into_posts(records, max_size=LOGS_MAXIMUM_POST_SIZE):
+    """
+    Splits log records into JSON array bodies of at most `max_size` bytes.
+    Records are never split across posts.
+    :return: Generator of (utf-8 encoded body, record count) tuples.
+    """
+    batch = []
+    batch_size = 2  # Enclosing brackets
+
+    for record in records:
+        encoded = json.dumps(record).encode('utf-8')
+        record_size = len(encoded) + (1 if batch else 0)
+
+        if len(encoded) + 2 > max_size:
+            raise CliError('A log record of {} bytes exceeds the maximum post size of {} bytes.'.format(
+                len(encoded), max_size))
+
+        if batch and batch_size + record_size > max_size:
+            yield b'[' + b','.join(batch) + b']', len(batch)
+            batch = []
+            batch_size = 2
+            record_size = len(encoded)
+
+        batch.append(encoded)
+        batch_size += record_size
+
+    if batch:
+        yield b'[' + b','.join(batch) + b']', len(batch)
 
 
 def _convert_to_logs_format(logs, instance, instance_type, resource_uri):
@@ -422,20 +545,26 @@ def _test_log_workspace_key(customer_id, shared_key):
 
 
 def _post_logs_to_logs_analytics(customer_id, shared_key, instance_name,
-                                 body, log_type, instance_type, resource_uri):
+                                 body, log_type, instance_type, resource_uri,
+                                 record_count=None, session=None):
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if record_count is None:
+        record_count = len(json.loads(body))
+
     uri = _build_log_request_uri(customer_id)
+    # The signature covers the content length in bytes, so it is computed per post
     headers = _build_log_request_header(customer_id, shared_key, len(body),
                                         log_type, resource_uri)
 
-    response = _requests_retry_session().post(uri, data=body, headers=headers)
+    response = (session or _requests_retry_session()).post(uri, data=body, headers=headers)
     if 200 <= response.status_code <= 299:
         display(
             '\tSuccessfully upload "{}" records for resource type "{}", instance: "{}\'s" log to table: "{}" '.format(
-                len(json.loads(body)),
+                record_count,
                 instance_type,
                 instance_name,
                 log_type))
-        upload_success = True
     else:
         raise Exception(
             '\tFail to upload "{}" to table: "{}" with status code: "{}" and error msg: "{}"'.format(
@@ -576,10 +705,20 @@ UPLOAD_STATUS_FILENAME = 'upload-status.json'
 Upload status file name
 """
 
+UPLOAD_JOURNAL_FILENAME = 'upload-journal.jsonl'
+"""
+Upload journal file name, stored next to the upload status file. The first
+line identifies the upload, every following line is the key of a completed
+unit, so recording a unit only appends a line.
+"""
+
 
-def get_export_timestamp_from_file(export_type):
+def get_export_timestamp_from_file(export_type, namespace=None):
     """
     :param export_type: export type
+    :param namespace: Namespace of the data controller. Every data controller
+                      has its own watermark, a data controller that was never
+                      uploaded starts from the one shared by all of them.
     Returns the specified value from the upload status file and schema_valid,
     which represents whether or not the file schema was valid when checked.
     """
@@ -593,7 +732,10 @@ def get_export_timestamp_from_file(export_type):
             upload_status_json = json.load(upload_status_file)
 
             if upload_status_json:
-                str_timestamp = upload_status_json.get(export_type).get(
+                status = upload_status_json.get(export_type)
+                if namespace:
+                    status = status.get("namespaces", {}).get(namespace, status)
+                str_timestamp = status.get(
                     "data_timestamp"
                 )
                 stamp = datetime.datetime.strptime(
@@ -606,8 +748,8 @@ def get_export_timestamp_from_file(export_type):
         raise ValueError("Could not retrieve data from the upload status file.")
 
 
-def get_export_timestamp(export_type):
-    start_time_from_status_file = get_export_timestamp_from_file(export_type)
+def get_export_timestamp(export_type, namespace=None):
+    start_time_from_status_file = get_export_timestamp_from_file(export_type, namespace)
 
     default_start_time = datetime.datetime.utcnow() - datetime.timedelta(minutes=constants.DEFAULT_QUERY_WINDOW[export_type])
 
@@ -617,10 +759,12 @@ def get_export_timestamp(export_type):
     else:
         return default_start_time
 
-def update_upload_status_file(export_type, data_timestamp):
+def update_upload_status_file(export_type, data_timestamp, namespace=None):
     """
     Update the status file with data timestamp uploaded.
     :param data_timestamp: string
+    :param namespace: Namespace of the data controller whose watermark is
+                      updated, the shared watermark if not given.
     """
     try:
         upload_status_file_path = _get_upload_status_file_path(UPLOAD_STATUS_FILENAME)
@@ -628,8 +772,11 @@ def update_upload_status_file(export_type, data_timestamp):
             upload_status_json = json.load(upload_status_file)
 
             if data_timestamp:
-                upload_status_json[export_type]['data_timestamp'] = data_timestamp
-                upload_status_json[export_type]['upload_timestamp'] = datetime.datetime.utcnow().isoformat(sep=' ', timespec='milliseconds')
+                status = upload_status_json[export_type]
+                if namespace:
+                    status = status.setdefault('namespaces', {}).setdefault(namespace, {})
+                status['data_timestamp'] = data_timestamp
+                status['upload_timestamp'] = datetime.datetime.utcnow().isoformat(sep=' ', timespec='milliseconds')
 
             upload_status_file.seek(0)
             json.dump(upload_status_json, upload_status_file, indent=4)
@@ -763,6 +910,134 @@ def add_last_upload_flag(path):
     except BaseException:
         log.info("Failed to add last usage flag.")
 
+# #############################################################################
+# Upload journal functions
+# #############################################################################
+
+class UploadJournal(object):
+    """
+    Records the units of an upload (resource syncs, log chunks, metric
+    batches, usage records) that completed, keyed by content, so a rerun of
+    the same export file skips finished work.
+    """
+
+    def __init__(self, export_type, data_timestamp):
+        self._path = _get_upload_journal_file_path()
+        self._header = {'exportType': export_type, 'dataTimestamp': data_timestamp}
+        self._lock = threading.Lock()
+        self._failed = set()
+        self._completed = self._load()
+        self._started = bool(self._completed)
+
+    @property
+    def resumed_count(self):
+        """
+        Number of units already completed by a previous run.
+        """
+        return len(self._completed)
+
+    @property
+    def is_complete(self):
+        """
+        True when no unit failed during this run.
+        """
+        return not self._failed
+
+    @staticmethod
+    def unit_key(kind, content):
+        """
+        Returns the journal key of a unit of work. Text content that already
+        identifies the unit is used as is, anything else is hashed.
+        """
+        if isinstance(content, str):
+            return '{}:{}'.format(kind, content)
+        if not isinstance(content, bytes):
+            content = json.dumps(content, sort_keys=True).encode('utf-8')
+        return '{}:{}'.format(kind, hashlib.sha256(content).hexdigest())
+
+    def has_completed(self, kind, content):
+        """
+        True when the unit was completed before.
+        """
+        key = self.unit_key(kind, content)
+        with self._lock:
+            return key in self._completed
+
+    def run(self, kind, content, func, *args, **kwargs):
+        """
+        Runs `func` unless the unit was completed before and records the
+        unit once `func` returned. Errors are recorded as failures and raised.
+        :return: The result of `func`, or None when the unit was skipped.
+        """
+        key = self.unit_key(kind, content)
+        with self._lock:
+            if key in self._completed:
+                log.info("Skip {} unit {}, it was uploaded before.".format(kind, key))
+                return None
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed.add(key)
+            raise
+
+        with self._lock:
+            self._completed.add(key)
+            self._append(key)
+        return result
+
+    def clear(self):
+        """
+        Removes the journal once the whole upload has been recorded in the
+        upload status file.
+        """
+        with self._lock:
+            self._completed = set()
+            self._started = False
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+    def _load(self):
+        completed = set()
+        try:
+            with open(self._path, encoding='utf-8') as journal_file:
+                if json.loads(journal_file.readline()) != self._header:
+                    return completed
+                for line in journal_file:
+                    try:
+                        completed.add(json.loads(line))
+                    except ValueError:
+                        # Last line of a run that was interrupted while writing it
+                        pass
+        except (OSError, ValueError):
+            pass
+        return completed
+
+    def _append(self, key):
+        # A journal of another upload is replaced when the first unit completes
+        mode = 'a' if self._started else 'w'
+        with open(self._path, mode, encoding='utf-8') as journal_file:
+            if not self._started:
+                journal_file.write(json.dumps(self._header) + '\n')
+            journal_file.write(json.dumps(key) + '\n')
+        self._started = True
+
+
+def _get_upload_journal_file_path():
+    config_dir = os.path.expanduser(Configuration().CLI_CONFIG_DIR)
+    return os.path.join(config_dir, '{}-{}'.format(Configuration().CLI_NAME, UPLOAD_JOURNAL_FILENAME))
+
+
+def run_upload_unit(journal, kind, content, func, *args, **kwargs):
+    """
+    Runs a unit of upload work through `journal` when one is given.
+    """
+    if journal is None:
+        return func(*args, **kwargs)
+    return journal.run(kind, content, func, *args, **kwargs)
+
+
 def format_sqlmi_tier_for_azure(tier):
     """
     Given a tier, return it in a format expected by Azure (e.g: translate 'bc' to 'BusinessCritical')
@@ -243,9 +243,21 @@ helps['arc dc export'] = """
     type: command
     short-summary: {short}
     long-summary: {long}
+    examples:
+        - name: {ex1}
+          text: >
+            azdata arc dc export --type usage --path usage.json
+        - name: {ex2}
+          text: >
+            azdata arc dc export --type usage --path usage.json --all-namespaces
 """.format(
     short=_('Export metrics, logs or usage.'),
-    long=_('Export metrics, logs or usage to a file.'))
+    long=_('Export metrics, logs or usage to a file. With --namespaces or --all-namespaces several data '
+           'controllers are exported concurrently, each to its own file. Data controllers other than the one '
+           'logged in to are reached with the credentials of the AZDATA_USERNAME and AZDATA_PASSWORD '
+           'environment variables.'),
+    ex1=_('Export usage of the logged in data controller.'),
+    ex2=_('Export usage of every data controller in the cluster to usage-<namespace>.json files.'))
 
 helps['arc dc upload'] = """
     type: command
@@ -0,0 +1,266 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+# Read-through cache of Kubernetes custom objects scoped to one command
+import copy
+import json
+import os
+import threading
+
+from http import HTTPStatus
+
+from kubernetes import client as k8sClient
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from azdata.cli.commands.arc.constants import CONNECTION_RETRY_ATTEMPTS, INSTANCE_LIST_PAGE_SIZE, RETRY_INTERVAL
+from azdata.cli.commands.arc.retry_util import retry
+from azdata.cli.core.configuration import Configuration
+from azdata.cli.core.logging import get_logger
+from azdata.cli.core.models.custom_resource_definition import CustomResourceDefinition
+
+log = get_logger(__name__)
+
+__all__ = [
+    "ResourceCache",
+    "crd_key",
+    "custom_object_exists",
+    "get_custom_resource_definition",
+    "get_resource_cache",
+    "invalidate_custom_objects",
+    "iter_custom_objects",
+    "list_custom_objects"
+]
+
+CRD_GROUP = "apiextensions.k8s.io"
+"""
+API group of custom resource definitions, used in their cache keys
+"""
+
+CRD_PLURAL = "customresourcedefinitions"
+"""
+Plural of custom resource definitions, used in their cache keys
+"""
+
+CRD_CACHE_FILE = "crd-cache.json"
+"""
+File in the CLI config directory caching custom resource definitions across
+commands, keyed by cluster server URL and CRD name
+"""
+
+PARTIAL_OBJECT_METADATA_ACCEPT = "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,application/json"
+"""
+Accept header asking the API server for an object's metadata only
+"""
+
+
+class ResourceCache(object):
+    """
+    Cached Kubernetes reads keyed by (group, plural, namespace, name), where
+    a name of None stands for the list of all objects in the namespace.
+    Callers receive deep copies, so they may modify the result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, loader):
+        """
+        Returns the cached value of `key`, calling `loader()` on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                return copy.deepcopy(self._entries[key])
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = value
+        return copy.deepcopy(value)
+
+    def invalidate(self, group, plural, namespace=None, name=None):
+        """
+        Drops the cached object `name` and the cached lists of its kind in
+        `namespace`. Without a namespace every entry of the kind is dropped.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                key_group, key_plural, key_namespace, key_name = key
+                if key_group != group or key_plural != plural:
+                    continue
+                if namespace is not None and key_namespace != namespace:
+                    continue
+                if name is None or key_name is None or key_name == name:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_resource_cache(client):
+    """
+    Returns the resource cache of a command client. Clients are created per
+    command invocation, so the cache never outlives the command.
+    """
+    cache = getattr(client, "_resource_cache", None)
+    if cache is None:
+        cache = ResourceCache()
+        client._resource_cache = cache
+    return cache
+
+
+def crd_key(name):
+    """
+    Cache key of the custom resource definition `name`.
+    """
+    return CRD_GROUP, CRD_PLURAL, None, name
+
+
+def list_custom_objects(client, namespace, group, version, plural):
+    """
+    Cached `list_namespaced_custom_object`.
+    """
+    return get_resource_cache(client).get(
+        (group, plural, namespace, None),
+        lambda: client.apis.kubernetes.list_namespaced_custom_object(
+            namespace, group=group, version=version, plural=plural))
+
+
+def custom_object_exists(client, name, namespace, group, version, plural):
+    """
+    Checks for the custom object `name` in the cached list of its kind, so
+    an existence check followed by reading the list costs one round trip.
+    Meant for kinds with few objects per namespace, such as data controllers.
+    """
+    items = list_custom_objects(client, namespace, group, version, plural).get("items") or []
+    return any(item["metadata"]["name"] == name for item in items)
+
+
+def iter_custom_objects(namespace, group, version, plural, page_size=INSTANCE_LIST_PAGE_SIZE, label_selector=None):
+    """
+    Yields the custom objects of a kind in `namespace`, fetched one page at a
+    time with `limit`/`continue` so large namespaces never come back as one
+    response. Yields nothing if the CRD is not installed. Not cached, since
+    the point is to never hold the whole list.
+    :param label_selector: Only yield the objects matching this label selector.
+    """
+    api = k8sClient.CustomObjectsApi()
+    kwargs = {"label_selector": label_selector} if label_selector else {}
+    seen = set()
+    token = None
+
+    while True:
+        try:
+            page = retry(api.list_namespaced_custom_object,
+                         group, version, namespace, plural,
+                         limit=page_size, _continue=token,
+                         retry_count=CONNECTION_RETRY_ATTEMPTS,
+                         retry_delay=RETRY_INTERVAL, retry_method="list namespaced custom object",
+                         retry_on_exceptions=(NewConnectionError, MaxRetryError, ApiException),
+                         fatal_status_codes=(HTTPStatus.NOT_FOUND, HTTPStatus.GONE),
+                         **kwargs)
+        except ApiException as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                # CRD has not been applied yet, because no custom resource of this kind has been created yet
+                return
+            if e.status == HTTPStatus.GONE and token:
+                # The continue token expired, list again and skip what was already returned
+                log.info("Listing {} expired, restarting it.".format(plural))
+                token = None
+                continue
+            raise
+
+        for item in page.get('items', []):
+            name = item['metadata']['name']
+            if name not in seen:
+                seen.add(name)
+                yield item
+
+        token = (page.get('metadata') or {}).get('continue')
+        if not token:
+            return
+
+
+def invalidate_custom_objects(client, group, plural, namespace=None, name=None):
+    """
+    Drops cached objects of a kind after it was written to.
+    """
+    get_resource_cache(client).invalidate(group, plural, namespace, name)
+
+
+def get_custom_resource_definition(client, name):
+    """
+    Returns the custom resource definition `name`, e.g.
+    "postgresqls.arcdata.microsoft.com". It is read once per command. Across
+    commands it is cached on disk and only downloaded again when its
+    `resourceVersion` on the cluster changed, which is checked by reading
+    the CRD's metadata alone.
+    :raises ApiException: With status 404 if the CRD is not installed.
+    """
+    return CustomResourceDefinition(get_resource_cache(client).get(crd_key(name), lambda: _load_crd(name)))
+
+
+def _load_crd(name):
+    api = k8sClient.ApiextensionsV1Api()
+    server = api.api_client.configuration.host
+
+    resource_version = _read_crd_resource_version(api, name)
+    cache = _read_crd_cache()
+    entry = cache.get(server, {}).get(name)
+    if entry and entry.get("resourceVersion") == resource_version:
+        return entry["crd"]
+
+    crd = api.api_client.sanitize_for_serialization(api.read_custom_resource_definition(name))
+
+    cache.setdefault(server, {})[name] = {
+        "resourceVersion": crd["metadata"].get("resourceVersion"),
+        "crd": crd
+    }
+    _write_crd_cache(cache)
+    return crd
+
+
+def _read_crd_resource_version(api, name):
+    metadata = api.api_client.call_api(
+        "/apis/apiextensions.k8s.io/v1/customresourcedefinitions/{name}", "GET",
+        path_params={"name": name},
+        header_params={"Accept": PARTIAL_OBJECT_METADATA_ACCEPT},
+        response_type="object",
+        auth_settings=["BearerToken"],
+        _return_http_data_only=True)
+    return (metadata.get("metadata") or {}).get("resourceVersion")
+
+
+def _crd_cache_path():
+    config_dir = os.path.expanduser(Configuration().CLI_CONFIG_DIR)
+    return os.path.join(config_dir, "{}-{}".format(Configuration().CLI_NAME, CRD_CACHE_FILE))
+
+
+def _read_crd_cache():
+    path = _crd_cache_path()
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError) as e:
+        log.info("Ignoring unreadable CRD cache {}: {}".format(path, e))
+        return {}
+
+
+def _write_crd_cache(cache):
+    # Failures are ignored since the cache is only an optimization
+    path = _crd_cache_path()
+    tmp_file = "{}.{}.tmp".format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, path)
+    except OSError as e:
+        log.info("Unable to save CRD cache {}: {}".format(path, e))
@@ -0,0 +1,204 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+# Adaptive retry policy shared by the arc, sql mi and postgres commands
+import atexit
+import datetime
+import random
+import threading
+import time
+
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+
+from azdata.cli.commands.arc.constants import (
+    CONNECTION_RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_DEADLINE,
+    RETRY_INTERVAL
+)
+from azdata.cli.commands.arc.trace_util import span
+from azdata.cli.core.logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ["FATAL_STATUS_CODES", "RetryPolicy", "get_retry_stats", "is_retryable", "retry"]
+
+FATAL_STATUS_CODES = frozenset([
+    HTTPStatus.BAD_REQUEST,
+    HTTPStatus.UNAUTHORIZED,
+    HTTPStatus.FORBIDDEN,
+    HTTPStatus.NOT_FOUND,
+    HTTPStatus.METHOD_NOT_ALLOWED,
+    HTTPStatus.CONFLICT,
+    HTTPStatus.GONE,
+    HTTPStatus.UNPROCESSABLE_ENTITY,
+])
+"""
+HTTP status codes that will not change by retrying the same request. Callers
+opt into them with `fatal_status_codes`, since a 404 or 409 is expected to
+clear up while e.g. a freshly installed CRD becomes established.
+"""
+
+_lock = threading.Lock()
+_stats = {}
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with jitter, bounded by a number of attempts and an
+    overall time budget.
+    """
+
+    def __init__(self,
+                 max_attempts=CONNECTION_RETRY_ATTEMPTS,
+                 base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_INTERVAL,
+                 deadline=RETRY_DEADLINE):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, attempt):
+        """
+        Returns the delay before the attempt following `attempt`. Half of the
+        delay is random so concurrent callers do not retry in lockstep.
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry(func, *args,
+          retry_count=CONNECTION_RETRY_ATTEMPTS,
+          retry_delay=RETRY_INTERVAL,
+          retry_method=None,
+          retry_on_exceptions=(),
+          retry_deadline=RETRY_DEADLINE,
+          fatal_status_codes=(),
+          **kwargs):
+    """
+    Calls `func(*args, **kwargs)` and retries it on retryable errors. A
+    drop-in replacement for `azdata.cli.core.deploy.retry` where
+    `retry_delay` caps the exponential backoff instead of being a fixed delay.
+    :param retry_count: Maximum number of attempts.
+    :param retry_delay: Maximum delay in seconds between attempts.
+    :param retry_method: Name of the operation, used in logs and counters.
+    :param retry_on_exceptions: Exception types that may be retried.
+    :param retry_deadline: Time budget in seconds for all attempts, or None
+        for calls that wait on purpose and are only bounded by `retry_count`.
+    :param fatal_status_codes: Status codes that are raised at once even if
+        the error is one of `retry_on_exceptions`, e.g. `FATAL_STATUS_CODES`.
+    :return: The result of `func`, or True if `func` returned None.
+    """
+    policy = RetryPolicy(max_attempts=retry_count, max_delay=retry_delay, deadline=retry_deadline)
+    start = time.monotonic()
+    attempt = 0
+    succeeded = False
+
+    with span(retry_method or getattr(func, "__name__", "retry"), "retry") as span_args:
+        span_args["sleeps"] = []
+        try:
+            while True:
+                attempt += 1
+                try:
+                    result = func(*args, **kwargs)
+                    succeeded = True
+                    return True if result is None else result
+                except Exception as e:
+                    if attempt >= policy.max_attempts or not is_retryable(e, retry_on_exceptions, fatal_status_codes):
+                        raise
+
+                    delay = _get_retry_after(e)
+                    if delay is None:
+                        delay = policy.backoff(attempt)
+
+                    if policy.deadline is not None and time.monotonic() - start + delay > policy.deadline:
+                        log.info("Giving up on {} after {} attempts, the retry budget of {}s is spent.".format(
+                            retry_method, attempt, policy.deadline))
+                        raise
+
+                    log.info("Attempt {} to {} failed, retrying in {:.1f}s: {}".format(
+                        attempt, retry_method, delay, e))
+                    span_args["sleeps"].append(round(delay, 3))
+                    with span("sleep", "retry", seconds=round(delay, 3)):
+                        time.sleep(delay)
+        finally:
+            span_args["attempts"] = attempt
+            _record(retry_method, attempt, time.monotonic() - start, succeeded)
+
+
+def is_retryable(error, retry_on_exceptions, fatal_status_codes=()):
+    """
+    Classifies an error as retryable. It has to be one of
+    `retry_on_exceptions` and must not carry one of `fatal_status_codes`.
+    """
+    if not retry_on_exceptions or not isinstance(error, retry_on_exceptions):
+        return False
+    return _get_status(error) not in fatal_status_codes
+
+
+def get_retry_stats():
+    """
+    Returns the attempts and time spent per retried operation so far, as a
+    dict of operation name to counters.
+    """
+    with _lock:
+        return {method: dict(counters) for method, counters in _stats.items()}
+
+
+def _record(method, attempts, seconds, succeeded):
+    with _lock:
+        if not _stats:
+            atexit.register(_log_stats)
+        counters = _stats.setdefault(method, {"calls": 0, "attempts": 0, "failures": 0, "seconds": 0.0})
+        counters["calls"] += 1
+        counters["attempts"] += attempts
+        counters["failures"] += 0 if succeeded else 1
+        counters["seconds"] += seconds
+
+
+def _log_stats():
+    for method, counters in sorted(get_retry_stats().items(), key=lambda item: str(item[0])):
+        if counters["attempts"] > counters["calls"]:
+            log.info("Retry stats for {}: {calls} calls, {attempts} attempts, {failures} failures, "
+                     "{seconds:.1f}s".format(method, **counters))
+
+
+def _get_status(error):
+    for attr in ("status", "status_code"):
+        status = getattr(error, attr, None)
+        if isinstance(status, int):
+            return status
+
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _get_retry_after(error):
+    """
+    Returns the delay in seconds requested by a `Retry-After` header carried
+    by the error, if any.
+    """
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.datetime.now(retry_at.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,92 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+# Process wide registry of compiled templates and parsed yaml files
+import copy
+import os
+import threading
+
+import yaml
+
+import azdata.cli.core.deploy as util
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+__all__ = ["load_template", "load_yaml", "render_template", "safe_load"]
+
+_lock = threading.Lock()
+_environments = {}
+_templates = {}
+_yaml_cache = {}
+
+
+def safe_load(stream):
+    """
+    Same as `yaml.safe_load` but uses libyaml's `CSafeLoader` when available.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def render_template(path, model):
+    """
+    Renders the template at `path` with `model`. The template is loaded and
+    compiled once per process, through the same kind of Jinja environment as
+    the CLI's `get_config_from_template`: a file system loader over the
+    template's directory with default settings. Only the compiled template
+    is kept, never a model or its output. Without jinja2 it falls back to
+    `get_config_from_template`.
+    """
+    if jinja2 is None:
+        return util.get_config_from_template(path, model)
+    return _get_template(path).render(model=model)
+
+
+def load_template(path, model):
+    """
+    Renders the template at `path` with `model` and parses the result.
+    """
+    return safe_load(render_template(path, model))
+
+
+def load_yaml(path):
+    """
+    Returns the parsed content of the static yaml file at `path`. Files are
+    parsed once per process and callers receive a deep copy, so they may
+    modify the result.
+    """
+    key = os.path.realpath(path)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        entry = _yaml_cache.get(key)
+        if entry is None or entry[0] != version:
+            with open(path, "r") as stream:
+                entry = (version, safe_load(stream))
+            _yaml_cache[key] = entry
+
+    return copy.deepcopy(entry[1])
+
+
+def _get_template(path):
+    path = os.path.realpath(path)
+    with _lock:
+        template = _templates.get(path)
+        if template is None:
+            directory = os.path.dirname(path)
+            environment = _environments.get(directory)
+            if environment is None:
+                environment = jinja2.Environment(loader=jinja2.FileSystemLoader(directory))
+                _environments[directory] = environment
+            template = environment.get_template(os.path.basename(path))
+            _templates[path] = template
+        return template
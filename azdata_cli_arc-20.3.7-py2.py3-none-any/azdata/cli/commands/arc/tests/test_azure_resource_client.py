@@ -0,0 +1,38 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+import base64
+import gzip
+import json
+
+import pytest
+
+from azdata.cli.commands.arc.azure import constants as azure_constants
+from azdata.cli.commands.arc.azure.azure_resource_client import _iter_gzip_dps_body
+
+
+def decode(chunks):
+    return json.loads(gzip.decompress(b"".join(chunks)))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 48 * 1024])
+def test_iter_gzip_dps_body(monkeypatch, chunk_size):
+    monkeypatch.setattr(azure_constants, "DPS_STREAM_CHUNK_SIZE", chunk_size)
+    blob = {"usages": [{"id": i, "name": "instance-é-{}".format(i)} for i in range(100)]}
+
+    chunks = list(_iter_gzip_dps_body(blob))
+    body = decode(chunks)
+
+    assert body["$schema"] == azure_constants.DPS_USAGE_REQUEST_SCHEMA
+    assert body["blob"] == base64.b64encode(json.dumps(blob).encode("utf-8")).decode("ascii")
+    assert all(chunks)
+
+
+def test_iter_gzip_dps_body_streams_large_blobs():
+    blob = [{"id": i, "value": "x" * 64} for i in range(10000)]
+
+    chunks = list(_iter_gzip_dps_body(blob))
+
+    assert len(chunks) > 2
+    assert json.loads(base64.b64decode(decode(chunks)["blob"])) == blob
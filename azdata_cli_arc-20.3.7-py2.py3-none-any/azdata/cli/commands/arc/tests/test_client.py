@@ -0,0 +1,115 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+from types import SimpleNamespace
+
+import pytest
+
+from azdata.cli.commands.arc import client as arc_client
+from azdata.cli.commands.arc import watch_util
+from azdata.cli.commands.arc.client import ArcClientMixin, _is_recreated
+
+
+def item(name, resource_version, type=None, annotations=None):
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, resource_version=resource_version,
+                                                    annotations=annotations),
+                           type=type)
+
+
+class Kind(object):
+    """
+    A teardown kind whose list function returns `items` at resource version
+    "10", and whose watch reports the deletion of all of them.
+    """
+
+    def __init__(self, kind, items, deletable=True, delete_error=None):
+        self.kind = kind
+        self.items = items
+        self.lists = 0
+        self.deletes = []
+        self.delete_error = delete_error
+        self.deletable = deletable
+
+    def list(self, namespace):
+        self.lists += 1
+        return SimpleNamespace(items=list(self.items), metadata=SimpleNamespace(resource_version="10"))
+
+    def delete(self, namespace, body=None):
+        self.deletes.append((namespace, body))
+        if self.delete_error:
+            raise self.delete_error
+
+    def events(self):
+        return [{"type": "DELETED", "object": i} for i in self.items]
+
+    def teardown(self):
+        return dict(kind=self.kind, delete=self.delete if self.deletable else None, list=self.list)
+
+
+class Watch(object):
+    """
+    Streams the deletion events of the watched kind, once per kind.
+    """
+    streams = []
+
+    def stream(self, func, namespace, resource_version=None, timeout_seconds=None):
+        Watch.streams.append((func.__self__.kind, resource_version))
+        for event in func.__self__.events():
+            yield event
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    def setup(kinds):
+        Watch.streams = []
+        monkeypatch.setattr(arc_client, "_get_teardown_kinds", lambda: [kind.teardown() for kind in kinds])
+        monkeypatch.setattr(arc_client, "kubernetes_util", SimpleNamespace(
+            namespace_exists=lambda namespace: True,
+            delete_cluster_resources=lambda namespace, selector=None: (None, 200),
+            namespace_is_empty=lambda namespace: True))
+        monkeypatch.setattr(arc_client, "k8sClient", SimpleNamespace(V1DeleteOptions=lambda **kwargs: kwargs))
+        monkeypatch.setattr(watch_util, "watch", SimpleNamespace(Watch=Watch))
+        return ArcClientMixin.__new__(ArcClientMixin)
+
+    return setup
+
+
+def test_dc_delete_lists_each_kind_once_and_counts_down_from_watch_events(cluster):
+    pods = Kind("Pod", [item("controller-0", "1"), item("bootstrapper-x", "2")])
+    secrets = Kind("Secret", [item("controller-login", "3"),
+                              item("default-token", "4", type="kubernetes.io/service-account-token",
+                                   annotations={"kubernetes.io/service-account.name": "default"})])
+    services = Kind("Service", [item("controller-svc", "5")], deletable=False)
+    client = cluster([pods, secrets, services])
+
+    client.dc_delete("arc", "dc")
+
+    assert [kind.lists for kind in (pods, secrets, services)] == [1, 1, 1]
+    assert Watch.streams == [("Pod", "10"), ("Secret", "10"), ("Service", "10")]
+    assert pods.deletes == [("arc", {"propagation_policy": "Foreground"})]
+    assert len(secrets.deletes) == 1 and services.deletes == []
+
+
+def test_dc_delete_skips_kinds_it_may_not_delete(cluster):
+    pods = Kind("Pod", [item("controller-0", "1")])
+    roles = Kind("Role", [item("bootstrapper", "2")], delete_error=arc_client.K8sApiException(status=403))
+    client = cluster([pods, roles])
+
+    client.dc_delete("arc", "dc")
+
+    assert roles.lists == 0
+    assert Watch.streams == [("Pod", "10")]
+
+
+def test_is_recreated():
+    assert _is_recreated("ServiceAccount", item("default", "1"))
+    assert not _is_recreated("ServiceAccount", item("bootstrapper", "1"))
+    assert _is_recreated("ConfigMap", item("kube-root-ca.crt", "1"))
+    assert _is_recreated("Secret", item("default-token-abc", "1", type="kubernetes.io/service-account-token",
+                                        annotations={"kubernetes.io/service-account.name": "default"}))
+    assert not _is_recreated("Secret", item("controller-login", "1", type="Opaque"))
+    assert not _is_recreated("Pod", item("default", "1"))
@@ -0,0 +1,143 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+import json
+import threading
+
+import pytest
+
+from azdata.cli.commands.arc.common_util import (
+    JsonStreamValidator,
+    iter_in_background,
+    iter_text_chunks,
+    write_file_stream
+)
+
+VALID = [
+    '[]',
+    ' [ ] ',
+    '[1, 2.5e-3, -0, true, false, null]',
+    '[{"a": [{}], "b": "x\\u00e9\\n"}]',
+    '["\\"]"]',
+    '[[[]]]',
+]
+
+INVALID = [
+    '[}',
+    '[1,,]',
+    '[1,]',
+    '[,1]',
+    '[1 2]',
+    '[01]',
+    '[tru]',
+    '[1.]',
+    '["a]',
+    '["\\x"]',
+    '["\\u12g4"]',
+    '["a\nb"]',
+    '[{"a"}]',
+    '[{"a":}]',
+    '[{1: 2}]',
+    '[{"a": 1,}]',
+    '[{"a": 1]',
+    '[1]]',
+    '[1] x',
+    '[',
+    '{}',
+    '1',
+]
+
+
+def validate(text, chunk_size):
+    validator = JsonStreamValidator()
+    for chunk in iter_text_chunks(text, chunk_size):
+        validator.feed(chunk)
+    validator.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1024])
+@pytest.mark.parametrize("text", VALID)
+def test_json_stream_validator_accepts_valid_arrays(text, chunk_size):
+    validate(text, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1024])
+@pytest.mark.parametrize("text", INVALID)
+def test_json_stream_validator_rejects_invalid_json(text, chunk_size):
+    with pytest.raises(ValueError):
+        validate(text, chunk_size)
+
+
+def test_iter_text_chunks():
+    assert list(iter_text_chunks("abcdefg", 3)) == ["abc", "def", "g"]
+    assert list(iter_text_chunks("", 3)) == []
+
+
+def test_write_file_stream(tmp_path):
+    path = str(tmp_path / "logs.json")
+    write_file_stream(path, iter_text_chunks("[{'a': 1}, {'b': [2]}]", 4), "logs", "2021-01-01")
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"exportType": "logs", "dataTimestamp": "2021-01-01", "data": [{"a": 1}, {"b": [2]}]}
+
+
+def test_write_file_stream_removes_invalid_files(tmp_path):
+    path = tmp_path / "logs.json"
+    with pytest.raises(ValueError):
+        write_file_stream(str(path), iter_text_chunks("[1,,]", 2), "logs")
+    assert not path.exists()
+
+
+def test_iter_in_background_starts_on_first_next():
+    started = threading.Event()
+
+    def produce():
+        started.set()
+        yield from range(5)
+
+    items = iter_in_background(produce())
+    assert not started.wait(0.1)
+    assert list(items) == [0, 1, 2, 3, 4]
+    assert list(items) == []
+
+
+def test_iter_in_background_start_prefetches():
+    started = threading.Event()
+
+    def produce():
+        started.set()
+        yield 1
+
+    items = iter_in_background(produce())
+    items.start()
+    assert started.wait(5)
+    assert list(items) == [1]
+
+
+def test_iter_in_background_reraises_errors():
+    def produce():
+        yield 1
+        raise ValueError("failed")
+
+    items = iter_in_background(produce())
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_iter_in_background_close_stops_the_producer():
+    produced = []
+
+    def produce():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    items = iter_in_background(produce(), buffer_size=1)
+    assert next(items) == 0
+    items.close()
+    assert list(items) == []
+    items._thread.join(5)
+    assert not items._thread.is_alive()
+    assert len(produced) < 100
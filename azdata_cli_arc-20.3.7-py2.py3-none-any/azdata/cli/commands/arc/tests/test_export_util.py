@@ -0,0 +1,121 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+import json
+
+import pytest
+
+from azdata.cli.commands.arc import export_util
+from azdata.cli.commands.arc.export_util import UploadJournal, _split_logs_into_posts
+
+
+@pytest.fixture
+def journal_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "upload-journal.jsonl")
+    monkeypatch.setattr(export_util, "_get_upload_journal_file_path", lambda: path)
+    return path
+
+
+def test_upload_journal_skips_completed_units(journal_path):
+    calls = []
+    journal = UploadJournal("metrics", "2021-01-01T00:00:00.000Z")
+    assert journal.run("metrics", "0/resource", calls.append, 1) is None
+    assert calls == [1]
+
+    resumed = UploadJournal("metrics", "2021-01-01T00:00:00.000Z")
+    assert resumed.resumed_count == 1
+    assert resumed.has_completed("metrics", "0/resource")
+    resumed.run("metrics", "0/resource", calls.append, 2)
+    resumed.run("metrics", "1/resource", calls.append, 3)
+    assert calls == [1, 3]
+    assert resumed.is_complete
+
+
+def test_upload_journal_does_not_record_failed_units(journal_path):
+    def fail():
+        raise ValueError("upload failed")
+
+    journal = UploadJournal("logs", "2021-01-01T00:00:00.000Z")
+    with pytest.raises(ValueError):
+        journal.run("logs", b"chunk", fail)
+    assert not journal.is_complete
+
+    resumed = UploadJournal("logs", "2021-01-01T00:00:00.000Z")
+    assert resumed.resumed_count == 0
+    assert not resumed.has_completed("logs", b"chunk")
+
+
+def test_upload_journal_ignores_other_uploads(journal_path):
+    UploadJournal("metrics", "2021-01-01T00:00:00.000Z").run("metrics", "0/resource", lambda: None)
+
+    other = UploadJournal("metrics", "2021-01-02T00:00:00.000Z")
+    assert other.resumed_count == 0
+    other.run("metrics", "0/resource", lambda: None)
+
+    # The first completed unit of another upload replaces the journal
+    assert UploadJournal("metrics", "2021-01-01T00:00:00.000Z").resumed_count == 0
+    assert UploadJournal("metrics", "2021-01-02T00:00:00.000Z").resumed_count == 1
+
+
+def test_upload_journal_appends_one_line_per_unit(journal_path):
+    journal = UploadJournal("usage", "2021-01-01T00:00:00.000Z")
+    for i in range(3):
+        journal.run("usage", {"sequence": i}, lambda: None)
+
+    with open(journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+
+def test_upload_journal_ignores_a_partly_written_line(journal_path):
+    journal = UploadJournal("usage", "2021-01-01T00:00:00.000Z")
+    journal.run("usage", {"sequence": 1}, lambda: None)
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('"usage:')
+
+    assert UploadJournal("usage", "2021-01-01T00:00:00.000Z").resumed_count == 1
+
+
+def test_upload_journal_clear(journal_path):
+    journal = UploadJournal("usage", "2021-01-01T00:00:00.000Z")
+    journal.run("usage", {"sequence": 1}, lambda: None)
+    journal.clear()
+
+    assert UploadJournal("usage", "2021-01-01T00:00:00.000Z").resumed_count == 0
+
+
+def test_upload_journal_unit_key():
+    assert UploadJournal.unit_key("metrics", "0/resource") == "metrics:0/resource"
+    assert UploadJournal.unit_key("usage", {"a": 1, "b": 2}) == UploadJournal.unit_key("usage", {"b": 2, "a": 1})
+    assert UploadJournal.unit_key("logs", b"a") != UploadJournal.unit_key("logs", b"b")
+
+
+def test_split_logs_into_posts_keeps_posts_under_the_maximum_size():
+    records = [{"id": i, "message": "x" * (i % 7)} for i in range(50)]
+
+    posts = list(_split_logs_into_posts(records, max_size=100))
+
+    assert len(posts) > 1
+    assert all(len(body) <= 100 for body, _ in posts)
+    assert all(len(json.loads(body)) == count for body, count in posts)
+    assert [record for body, _ in posts for record in json.loads(body)] == records
+
+
+def test_split_logs_into_posts_fills_posts_up_to_the_maximum_size():
+    record = {"m": "x"}
+    size = len(json.dumps(record))
+
+    # Three records and the enclosing brackets and separators fit exactly
+    posts = list(_split_logs_into_posts([record] * 4, max_size=3 * size + 4))
+
+    assert [count for _, count in posts] == [3, 1]
+    assert len(posts[0][0]) == 3 * size + 4
+
+
+def test_split_logs_into_posts_without_records():
+    assert list(_split_logs_into_posts([])) == []
+
+
+def test_split_logs_into_posts_rejects_oversized_records():
+    with pytest.raises(export_util.CliError):
+        list(_split_logs_into_posts([{"m": "x" * 100}], max_size=50))
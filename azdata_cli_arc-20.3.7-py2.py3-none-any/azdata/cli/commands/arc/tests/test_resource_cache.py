@@ -0,0 +1,159 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from azdata.cli.commands.arc import resource_cache
+from azdata.cli.commands.arc.resource_cache import (
+    ResourceCache,
+    crd_key,
+    custom_object_exists,
+    get_resource_cache,
+    invalidate_custom_objects,
+    iter_custom_objects,
+    list_custom_objects
+)
+
+GROUP = "arcdata.microsoft.com"
+PLURAL = "datacontrollers"
+
+
+class CustomObjectsApi(object):
+    """
+    Serves `names` in pages of `limit`, failing the requests of the given
+    continue tokens with the given errors once.
+    """
+
+    def __init__(self, names, errors=None):
+        self.names = names
+        self.errors = dict(errors or {})
+        self.calls = []
+
+    def list_namespaced_custom_object(self, group, version, namespace, plural, limit=None, _continue=None,
+                                      label_selector=None):
+        self.calls.append((_continue, label_selector))
+        if _continue in self.errors:
+            raise self.errors.pop(_continue)
+
+        start = int(_continue or 0)
+        end = start + limit
+        page = {"items": [{"metadata": {"name": name}} for name in self.names[start:end]], "metadata": {}}
+        if end < len(self.names):
+            page["metadata"]["continue"] = str(end)
+        return page
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = CustomObjectsApi(["a", "b", "c", "d", "e"])
+    monkeypatch.setattr(resource_cache, "k8sClient", SimpleNamespace(CustomObjectsApi=lambda: api))
+    return api
+
+
+def names(items):
+    return [item["metadata"]["name"] for item in items]
+
+
+class Loader(object):
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_resource_cache_loads_once_and_returns_copies():
+    cache = ResourceCache()
+    loader = Loader({"items": [{"metadata": {"name": "a"}}]})
+    key = (GROUP, PLURAL, "ns", None)
+
+    first = cache.get(key, loader)
+    first["items"].clear()
+
+    assert cache.get(key, loader) == {"items": [{"metadata": {"name": "a"}}]}
+    assert loader.calls == 1
+
+
+def test_resource_cache_invalidate():
+    cache = ResourceCache()
+    keys = [(GROUP, PLURAL, "ns", None), (GROUP, PLURAL, "ns", "a"), (GROUP, PLURAL, "ns", "b"),
+            (GROUP, PLURAL, "other", "a"), (GROUP, "sqlmanagedinstances", "ns", None), crd_key("a")]
+    loaders = dict((key, Loader(key)) for key in keys)
+    for key in keys:
+        cache.get(key, loaders[key])
+
+    # Drops the object and the lists of its kind in the namespace
+    cache.invalidate(GROUP, PLURAL, "ns", "a")
+    for key in keys:
+        cache.get(key, loaders[key])
+    assert [loaders[key].calls for key in keys] == [2, 2, 1, 1, 1, 1]
+
+    # Drops every entry of the kind
+    cache.invalidate(GROUP, PLURAL)
+    for key in keys:
+        cache.get(key, loaders[key])
+    assert [loaders[key].calls for key in keys] == [3, 3, 2, 2, 1, 1]
+
+    cache.clear()
+    for key in keys:
+        cache.get(key, loaders[key])
+    assert [loaders[key].calls for key in keys] == [4, 4, 3, 3, 2, 2]
+
+
+def test_resource_cache_is_scoped_to_the_client():
+    first, second = SimpleNamespace(), SimpleNamespace()
+    assert get_resource_cache(first) is get_resource_cache(first)
+    assert get_resource_cache(first) is not get_resource_cache(second)
+
+
+def test_list_custom_objects_is_cached_until_invalidated():
+    calls = []
+
+    def list_namespaced_custom_object(namespace, group, version, plural):
+        calls.append((namespace, group, version, plural))
+        return {"items": [{"metadata": {"name": "dc"}}]}
+
+    client = SimpleNamespace(apis=SimpleNamespace(kubernetes=SimpleNamespace(
+        list_namespaced_custom_object=list_namespaced_custom_object)))
+
+    assert custom_object_exists(client, "dc", "ns", GROUP, "v1", PLURAL)
+    assert not custom_object_exists(client, "other", "ns", GROUP, "v1", PLURAL)
+    assert list_custom_objects(client, "ns", GROUP, "v1", PLURAL)["items"][0]["metadata"]["name"] == "dc"
+    assert calls == [("ns", GROUP, "v1", PLURAL)]
+
+    invalidate_custom_objects(client, GROUP, PLURAL, "ns", "dc")
+    list_custom_objects(client, "ns", GROUP, "v1", PLURAL)
+    assert len(calls) == 2
+
+
+def test_iter_custom_objects_pages(api):
+    assert names(iter_custom_objects("ns", GROUP, "v1", PLURAL, page_size=2, label_selector="a=b")) == [
+        "a", "b", "c", "d", "e"]
+    assert api.calls == [(None, "a=b"), ("2", "a=b"), ("4", "a=b")]
+
+
+def test_iter_custom_objects_restarts_an_expired_listing(api):
+    api.errors = {"4": resource_cache.ApiException(status=HTTPStatus.GONE)}
+
+    assert names(iter_custom_objects("ns", GROUP, "v1", PLURAL, page_size=2)) == ["a", "b", "c", "d", "e"]
+    assert [token for token, _ in api.calls] == [None, "2", "4", None, "2", "4"]
+
+
+def test_iter_custom_objects_without_crd(api):
+    api.errors = {None: resource_cache.ApiException(status=HTTPStatus.NOT_FOUND)}
+
+    assert list(iter_custom_objects("ns", GROUP, "v1", PLURAL)) == []
+    assert len(api.calls) == 1
+
+
+def test_iter_custom_objects_raises_a_gone_first_page(api):
+    api.errors = {None: resource_cache.ApiException(status=HTTPStatus.GONE)}
+
+    with pytest.raises(resource_cache.ApiException):
+        list(iter_custom_objects("ns", GROUP, "v1", PLURAL))
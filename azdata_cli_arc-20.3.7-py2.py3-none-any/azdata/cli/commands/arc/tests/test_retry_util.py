@@ -0,0 +1,112 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+from http import HTTPStatus
+
+import pytest
+
+from azdata.cli.commands.arc import retry_util
+from azdata.cli.commands.arc.retry_util import FATAL_STATUS_CODES, is_retryable, retry
+
+
+class StatusError(Exception):
+    def __init__(self, status, headers=None):
+        super(StatusError, self).__init__(status)
+        self.status = status
+        self.headers = headers
+
+
+class Flaky(object):
+    """
+    Raises the given errors in order, then returns `result`.
+    """
+
+    def __init__(self, errors, result=None):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry_util.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_retry_returns_result():
+    assert retry(Flaky([], result="value")) == "value"
+
+
+def test_retry_returns_true_for_none():
+    # Callers waiting for something must not pass a function that returns
+    # None on timeout, since it would come back as True.
+    assert retry(Flaky([], result=None)) is True
+
+
+def test_retry_retries_listed_exceptions():
+    func = Flaky([StatusError(HTTPStatus.SERVICE_UNAVAILABLE)] * 2, result="value")
+    assert retry(func, retry_on_exceptions=(StatusError,)) == "value"
+    assert func.calls == 3
+
+
+def test_retry_raises_unlisted_exceptions():
+    func = Flaky([ValueError("boom")])
+    with pytest.raises(ValueError):
+        retry(func, retry_on_exceptions=(StatusError,))
+    assert func.calls == 1
+
+
+@pytest.mark.parametrize("status", [HTTPStatus.NOT_FOUND, HTTPStatus.CONFLICT])
+def test_retry_retries_not_found_and_conflict_by_default(status):
+    func = Flaky([StatusError(status)], result="value")
+    assert retry(func, retry_on_exceptions=(StatusError,)) == "value"
+    assert func.calls == 2
+
+
+def test_retry_raises_fatal_status_codes_at_once():
+    func = Flaky([StatusError(HTTPStatus.NOT_FOUND)], result="value")
+    with pytest.raises(StatusError):
+        retry(func, retry_on_exceptions=(StatusError,), fatal_status_codes=FATAL_STATUS_CODES)
+    assert func.calls == 1
+
+
+def test_retry_stops_after_retry_count():
+    func = Flaky([StatusError(HTTPStatus.SERVICE_UNAVAILABLE)] * 5)
+    with pytest.raises(StatusError):
+        retry(func, retry_count=3, retry_on_exceptions=(StatusError,))
+    assert func.calls == 3
+
+
+def test_retry_stops_when_deadline_is_spent():
+    func = Flaky([StatusError(HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "120"})], result="value")
+    with pytest.raises(StatusError):
+        retry(func, retry_on_exceptions=(StatusError,), retry_deadline=60)
+    assert func.calls == 1
+
+
+def test_retry_without_deadline(no_sleep):
+    func = Flaky([StatusError(HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "120"})], result="value")
+    assert retry(func, retry_on_exceptions=(StatusError,), retry_deadline=None) == "value"
+    assert no_sleep == [120.0]
+
+
+def test_retry_backoff_is_capped_by_retry_delay(no_sleep):
+    func = Flaky([StatusError(HTTPStatus.SERVICE_UNAVAILABLE)] * 6, result="value")
+    retry(func, retry_delay=2, retry_on_exceptions=(StatusError,), retry_deadline=None)
+    assert len(no_sleep) == 6
+    assert all(delay <= 2 for delay in no_sleep)
+
+
+def test_is_retryable():
+    assert is_retryable(StatusError(HTTPStatus.NOT_FOUND), (StatusError,))
+    assert not is_retryable(StatusError(HTTPStatus.NOT_FOUND), (StatusError,), FATAL_STATUS_CODES)
+    assert not is_retryable(StatusError(HTTPStatus.NOT_FOUND), ())
+    assert not is_retryable(ValueError(), (StatusError,))
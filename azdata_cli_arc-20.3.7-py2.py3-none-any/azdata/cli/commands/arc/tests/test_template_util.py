@@ -0,0 +1,55 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+import os
+
+import pytest
+
+from azdata.cli.commands.arc import template_util
+from azdata.cli.commands.arc.constants import TEMPLATE_DIR
+from azdata.cli.commands.arc.template_util import load_template, load_yaml, render_template
+
+pytest.importorskip("jinja2")
+
+
+def test_render_template_compiles_once_and_renders_every_model():
+    path = os.path.join(TEMPLATE_DIR, "controller-login-secret.yaml.tmpl")
+
+    first = load_template(path, {"AZDATA_USERNAME": "dXNlcg==", "AZDATA_PASSWORD": "cGFzcw=="})
+    template = template_util._templates[os.path.realpath(path)]
+    second = load_template(path, {"AZDATA_USERNAME": "YWRtaW4=", "AZDATA_PASSWORD": "c2VjcmV0"})
+
+    assert first["data"] == {"username": "dXNlcg==", "password": "cGFzcw=="}
+    assert second["data"] == {"username": "YWRtaW4=", "password": "c2VjcmV0"}
+    assert template_util._templates[os.path.realpath(path)] is template
+
+
+def test_render_template_keeps_no_models(tmp_path):
+    path = tmp_path / "secret.yaml.tmpl"
+    path.write_text("password: {{ model.password }}\n")
+
+    assert render_template(str(path), {"password": "c2VjcmV0"}) == "password: c2VjcmV0"
+    assert "c2VjcmV0" not in repr(vars(template_util))
+
+
+def test_load_yaml_returns_copies(tmp_path):
+    path = tmp_path / "crd.yaml"
+    path.write_text("spec:\n  names:\n    kind: Test\n")
+
+    first = load_yaml(str(path))
+    first["spec"]["names"]["kind"] = "Changed"
+
+    assert load_yaml(str(path)) == {"spec": {"names": {"kind": "Test"}}}
+
+
+def test_load_yaml_reloads_changed_files(tmp_path):
+    path = tmp_path / "crd.yaml"
+    path.write_text("kind: Test\n")
+    assert load_yaml(str(path)) == {"kind": "Test"}
+
+    path.write_text("kind: Changed\n")
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert load_yaml(str(path)) == {"kind": "Changed"}
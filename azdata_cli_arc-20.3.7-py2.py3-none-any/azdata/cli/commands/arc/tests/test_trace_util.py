@@ -0,0 +1,105 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+import json
+import sys
+import types
+
+import pytest
+
+from azdata.cli.commands.arc import trace_util
+from azdata.cli.commands.arc.trace_util import (
+    disable_tracing,
+    enable_tracing,
+    is_tracing_enabled,
+    span,
+    trace_command
+)
+
+
+class Response(object):
+    status_code = 200
+    status = 200
+
+
+class Session(object):
+    def send(self, request, **kwargs):
+        return Response()
+
+
+class ApiClient(object):
+    def request(self, method, url, *args, **kwargs):
+        return Response()
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setitem(sys.modules, "requests", types.SimpleNamespace(Session=Session))
+    monkeypatch.setitem(sys.modules, "kubernetes.client", types.SimpleNamespace(ApiClient=ApiClient))
+    yield
+    disable_tracing()
+
+
+def test_disable_tracing_restores_instrumented_functions(clients, tmp_path):
+    send, request = Session.send, ApiClient.request
+    path = tmp_path / "trace.json"
+
+    enable_tracing(str(path), "command")
+    assert is_tracing_enabled()
+    assert Session.send is not send
+    assert ApiClient.request is not request
+
+    Session().send(types.SimpleNamespace(method="GET", url="https://management.azure.com/subscriptions"))
+    ApiClient().request("GET", "https://cluster/api/v1/pods")
+
+    disable_tracing()
+    assert not is_tracing_enabled()
+    assert Session.send is send
+    assert ApiClient.request is request
+
+    events = json.loads(path.read_text())["traceEvents"]
+    names = [event["name"] for event in events if event["ph"] == "X"]
+    assert names == ["GET management.azure.com/subscriptions", "GET /api/v1/pods", "command"]
+    assert events[-3]["cat"] == "arm"
+    assert events[-2]["cat"] == "kubernetes"
+
+
+def test_disable_tracing_without_enable_does_nothing():
+    disable_tracing()
+    assert not is_tracing_enabled()
+
+
+def test_trace_command_only_traces_with_trace_file(clients, tmp_path):
+    send = Session.send
+    seen = []
+
+    @trace_command("arc test")
+    def command(client, trace_file=None):
+        seen.append((is_tracing_enabled(), Session.send is send))
+        with span("step", "test"):
+            pass
+
+    command(None)
+    path = tmp_path / "trace.json"
+    command(None, trace_file=str(path))
+
+    assert seen == [(False, True), (True, False)]
+    assert not is_tracing_enabled()
+    assert Session.send is send
+    assert [event["name"] for event in json.loads(path.read_text())["traceEvents"] if event["ph"] == "X"] == [
+        "step", "arc test"]
+
+
+def test_trace_command_writes_trace_when_command_fails(clients, tmp_path):
+    @trace_command("arc test")
+    def command(trace_file=None):
+        raise ValueError("failed")
+
+    path = tmp_path / "trace.json"
+    with pytest.raises(ValueError):
+        command(trace_file=str(path))
+
+    assert not is_tracing_enabled()
+    assert trace_util._originals == []
+    assert path.exists()
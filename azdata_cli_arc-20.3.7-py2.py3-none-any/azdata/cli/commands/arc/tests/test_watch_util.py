@@ -0,0 +1,234 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+from types import SimpleNamespace
+
+import pytest
+
+from azdata.cli.commands.arc import watch_util
+from azdata.cli.commands.arc.watch_util import ObjectDeletedError, wait_for_custom_object
+
+
+def task(state, resource_version):
+    return {"metadata": {"name": "task", "resourceVersion": resource_version}, "status": {"state": state}}
+
+
+def is_completed(obj):
+    return obj["status"]["state"] == "Completed"
+
+
+class CustomObjectsApi(object):
+    """
+    Returns or raises the scripted results of `get_namespaced_custom_object`
+    in order.
+    """
+
+    def __init__(self, gets):
+        self.gets = list(gets)
+        self.get_calls = 0
+
+    def get_namespaced_custom_object(self, group, version, namespace, plural, name):
+        self.get_calls += 1
+        result = self.gets.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def list_namespaced_custom_object(self, *args, **kwargs):
+        raise AssertionError("Only called through the watch")
+
+
+class Watch(object):
+    """
+    Serves one scripted stream per `stream` call. A stream is a list of
+    events, and an exception in it is raised when reached.
+    """
+    streams = []
+    calls = []
+
+    def stream(self, func, *args, **kwargs):
+        Watch.calls.append(kwargs["resource_version"])
+        for event in Watch.streams.pop(0):
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def watched(monkeypatch):
+    sleeps = []
+
+    def setup(gets, streams):
+        api = CustomObjectsApi(gets)
+        Watch.streams = list(streams)
+        Watch.calls = []
+        monkeypatch.setattr(watch_util, "k8sClient", SimpleNamespace(CustomObjectsApi=lambda: api))
+        monkeypatch.setattr(watch_util, "watch", SimpleNamespace(Watch=Watch))
+        monkeypatch.setattr(watch_util.time, "sleep", sleeps.append)
+        return api, sleeps
+
+    return setup
+
+
+def wait(**kwargs):
+    return wait_for_custom_object("task", "ns", "tasks.arcdata.microsoft.com", "v1", "exporttasks", is_completed,
+                                  timeout=60, **kwargs)
+
+
+def test_wait_for_custom_object_resyncs_after_a_dropped_stream(watched):
+    api, sleeps = watched(
+        [task("Running", "1"), task("Running", "3")],
+        [[{"type": "MODIFIED", "object": task("Running", "2")}, watch_util.ProtocolError("connection reset")],
+         [{"type": "MODIFIED", "object": task("Completed", "4")}]])
+
+    assert wait()["metadata"]["resourceVersion"] == "4"
+    assert api.get_calls == 2
+    assert Watch.calls == ["1", "3"]
+    assert sleeps == [watch_util.POLL_INITIAL_INTERVAL]
+
+
+def test_wait_for_custom_object_retries_the_initial_read(watched):
+    api, sleeps = watched(
+        [watch_util.MaxRetryError("unreachable"), watch_util.ApiException(status=503), task("Completed", "1")],
+        [])
+
+    assert wait()["metadata"]["resourceVersion"] == "1"
+    assert api.get_calls == 3
+    assert len(sleeps) == 2
+
+
+def test_wait_for_custom_object_resyncs_an_expired_watch(watched):
+    api, sleeps = watched(
+        [task("Running", "1"), task("Completed", "2")],
+        [[watch_util.ApiException(status=watch_util.HTTP_GONE)],
+         [{"type": "ERROR", "object": {"code": watch_util.HTTP_GONE}}]])
+
+    assert wait(resource_version="0")["metadata"]["resourceVersion"] == "2"
+    assert api.get_calls == 2
+    assert Watch.calls == ["0", "1"]
+    assert sleeps == []
+
+
+def test_wait_for_custom_object_raises_client_errors(watched):
+    watched([watch_util.ApiException(status=404)], [])
+
+    with pytest.raises(watch_util.ApiException):
+        wait()
+
+
+def test_wait_for_custom_object_raises_on_delete(watched):
+    watched([task("Running", "1")], [[{"type": "DELETED", "object": task("Running", "2")}]])
+
+    with pytest.raises(ObjectDeletedError):
+        wait()
+
+
+def test_wait_for_custom_object_times_out_while_disconnected(watched, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(watch_util.time, "monotonic", lambda: now[0])
+    api, sleeps = watched([watch_util.ProtocolError("connection reset")] * 10, [])
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(watch_util.time, "sleep", sleep)
+
+    assert wait() is None
+    assert sum(sleeps) == 60
+    assert max(sleeps) <= watch_util.POLL_MAX_INTERVAL
+
+
+def pod(name, resource_version, kind="Pod"):
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, resource_version=resource_version), type=kind)
+
+
+class Listing(object):
+    """
+    A namespaced list function returning the scripted listings in order.
+    """
+
+    def __init__(self, *listings):
+        self.listings = list(listings)
+        self.calls = 0
+
+    def __call__(self, namespace):
+        self.calls += 1
+        result = self.listings.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        items, resource_version = result
+        return SimpleNamespace(items=items, metadata=SimpleNamespace(resource_version=resource_version))
+
+
+@pytest.fixture
+def deletion(watched):
+    watched([], [])
+    return watched
+
+
+def wait_for_deletion(list_func, streams, **kwargs):
+    Watch.streams = list(streams)
+    return watch_util.wait_for_deletion(list_func, "ns", watch_util.Deadline(60), **kwargs)
+
+
+def test_wait_for_deletion_counts_down_from_watch_events(deletion):
+    list_func = Listing(([pod("a", "1"), pod("b", "2"), pod("default", "3", kind="Token")], "10"))
+    counts = []
+
+    assert wait_for_deletion(list_func,
+                             [[{"type": "MODIFIED", "object": pod("a", "11")},
+                               {"type": "ADDED", "object": pod("c", "12")},
+                               {"type": "DELETED", "object": pod("a", "13")},
+                               {"type": "DELETED", "object": pod("b", "14")},
+                               {"type": "DELETED", "object": pod("default", "15", kind="Token")},
+                               {"type": "DELETED", "object": pod("c", "16")}]],
+                             ignore=lambda obj: obj.type == "Token", on_count=counts.append)
+    assert list_func.calls == 1
+    assert Watch.calls == ["10"]
+    assert counts == [2, 2, 3, 2, 1, 1, 0]
+
+
+def test_wait_for_deletion_without_objects(deletion):
+    list_func = Listing(([], "10"))
+
+    assert wait_for_deletion(list_func, [])
+    assert Watch.calls == []
+
+
+def test_wait_for_deletion_resumes_watches_without_listing_again(deletion):
+    list_func = Listing(([pod("a", "1"), pod("b", "2")], "10"))
+
+    assert wait_for_deletion(list_func,
+                             [[{"type": "DELETED", "object": pod("a", "11")}, watch_util.ProtocolError("reset")],
+                              [],
+                              [{"type": "DELETED", "object": pod("b", "12")}]])
+    assert list_func.calls == 1
+    assert Watch.calls == ["10", "11", "11"]
+
+
+def test_wait_for_deletion_lists_again_after_the_watch_expired(deletion):
+    list_func = Listing(([pod("a", "1"), pod("b", "2")], "10"), ([pod("b", "2")], "20"), ([pod("b", "2")], "30"))
+
+    assert wait_for_deletion(list_func,
+                             [[{"type": "ERROR", "object": {"code": watch_util.HTTP_GONE}}],
+                              [watch_util.ApiException(status=watch_util.HTTP_GONE)],
+                              [{"type": "DELETED", "object": pod("b", "31")}]])
+    assert list_func.calls == 3
+    assert Watch.calls == ["10", "20", "30"]
+
+
+def test_wait_for_deletion_times_out(deletion, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(watch_util.time, "monotonic", lambda: now[0])
+    list_func = Listing(([pod("a", "1")], "10"))
+
+    def stream():
+        now[0] += 61
+        yield {"type": "MODIFIED", "object": pod("a", "11")}
+
+    assert not wait_for_deletion(list_func, [stream()])
@@ -0,0 +1,242 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+# Opt-in latency tracing written in the Chrome trace event format
+import functools
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from azdata.cli.core.logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ["TRACE_FILE_HELP", "disable_tracing", "enable_tracing", "is_tracing_enabled", "span", "trace_command",
+           "traced"]
+
+TRACE_FILE_HELP = ("The path of a Chrome trace file recording the Kubernetes, controller and Azure calls made by the "
+                   "command. Open it in chrome://tracing or https://ui.perfetto.dev.")
+"""
+Help of the `--trace-file` argument of the commands that support it
+"""
+
+HTTP_CATEGORIES = (
+    ("management.azure.com", "arm"),
+    ("azurewebsites.net", "dps"),
+    ("ods.opinsights.azure.com", "log-analytics"),
+    ("monitoring.azure.com", "metrics"),
+    ("login.microsoftonline.com", "aad"),
+)
+"""
+Span category of HTTP requests by host name fragment
+"""
+
+_lock = threading.Lock()
+_tracer = None
+_originals = []
+
+
+class _Tracer(object):
+    """
+    Collects complete ("X") trace events and writes them to `path`.
+    Timestamps are microseconds since the epoch, taken from a monotonic clock.
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        self.pid = os.getpid()
+        self.events = []
+        self._epoch = time.time() * 1e6 - time.perf_counter() * 1e6
+        self._start = self.now()
+        self._lock = threading.Lock()
+
+    def now(self):
+        return self._epoch + time.perf_counter() * 1e6
+
+    def add(self, name, category, start, args):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start, 3),
+            "dur": round(self.now() - start, 3),
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def write(self):
+        self.add(self.name, "command", self._start, {})
+
+        with self._lock:
+            events = list(self.events)
+        threads = sorted(set(event["tid"] for event in events))
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": self.name}}]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                      "args": {"name": "thread-{}".format(index)}} for index, tid in enumerate(threads)]
+
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            log.warning("Unable to write trace file {}: {}".format(self.path, e))
+
+
+def enable_tracing(path, name="azdata"):
+    """
+    Starts recording a span for every Kubernetes, HTTP and retried call made
+    by this process, until `disable_tracing` writes the trace to `path`. It
+    can be opened in chrome://tracing or https://ui.perfetto.dev.
+    :param path: The trace file to write.
+    :param name: Name of the root span, usually the command being run.
+    """
+    global _tracer
+
+    with _lock:
+        if _tracer is not None:
+            return
+        _tracer = _Tracer(os.path.abspath(os.path.expanduser(path)), name)
+
+        _instrument_requests()
+        _instrument_api_client("kubernetes.client", "kubernetes")
+        _instrument_api_client("azdata.cli.core.clients.api_client", "controller")
+
+
+def disable_tracing():
+    """
+    Writes the trace started by `enable_tracing` and restores the functions
+    it instrumented. Does nothing when tracing is disabled.
+    """
+    global _tracer
+
+    with _lock:
+        tracer = _tracer
+        if tracer is None:
+            return
+        _tracer = None
+
+        while _originals:
+            owner, attr, original = _originals.pop()
+            setattr(owner, attr, original)
+
+    tracer.write()
+
+
+def is_tracing_enabled():
+    return _tracer is not None
+
+
+@contextmanager
+def span(name, category, **args):
+    """
+    Records the enclosed block as a span. Yields the dict of span arguments
+    so the block can attach results, e.g. the number of attempts. Does
+    nothing but yield when tracing is disabled.
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield args
+        return
+
+    start = tracer.now()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        tracer.add(name, category, start, args)
+
+
+def trace_command(name):
+    """
+    Decorator for commands taking a `trace_file` argument. When it is given,
+    the calls made by the command are traced and written to it once the
+    command returns.
+    :param name: Name of the root span, e.g. "arc dc create".
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace_file = kwargs.get("trace_file")
+            if not trace_file or is_tracing_enabled():
+                return func(*args, **kwargs)
+
+            enable_tracing(trace_file, name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                disable_tracing()
+        return wrapper
+    return decorator
+
+
+def traced(category, name=None):
+    """
+    Decorator recording every call of the decorated function as a span.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name or func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _instrument_requests():
+    import requests
+
+    send = requests.Session.send
+
+    @functools.wraps(send)
+    def traced_send(session, request, **kwargs):
+        url = urlsplit(request.url)
+        with span("{} {}{}".format(request.method, url.netloc, url.path), _http_category(url.netloc)) as args:
+            response = send(session, request, **kwargs)
+            args["status"] = response.status_code
+            return response
+
+    _originals.append((requests.Session, "send", send))
+    requests.Session.send = traced_send
+
+
+def _instrument_api_client(module_name, category):
+    # Both the Kubernetes and the controller clients are swagger generated and
+    # send every call through `ApiClient.request`
+    try:
+        module = __import__(module_name, fromlist=["ApiClient"])
+        api_client_cls = module.ApiClient
+    except (ImportError, AttributeError):
+        return
+
+    # Subclasses that do not override `request` are covered by their base
+    if "request" not in vars(api_client_cls):
+        return
+
+    request = api_client_cls.request
+
+    @functools.wraps(request)
+    def traced_request(api_client, method, url, *args, **kwargs):
+        with span("{} {}".format(method, urlsplit(url).path), category) as span_args:
+            response = request(api_client, method, url, *args, **kwargs)
+            span_args["status"] = getattr(response, "status", None)
+            return response
+
+    _originals.append((api_client_cls, "request", request))
+    api_client_cls.request = traced_request
+
+
+def _http_category(host):
+    for fragment, category in HTTP_CATEGORIES:
+        if fragment in host:
+            return category
+    return "http"
@@ -0,0 +1,360 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+# Watch based waiters for Kubernetes custom resources
+import time
+
+from kubernetes import client as k8sClient, watch
+from kubernetes.client.rest import ApiException
+from requests.exceptions import ConnectionError
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from azdata.cli.commands.arc.trace_util import span
+from azdata.cli.core.logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = [
+    "Deadline",
+    "ObjectDeletedError",
+    "get_resource_version",
+    "periodic",
+    "poll_until",
+    "wait_for_custom_object",
+    "wait_for_deletion",
+    "wait_for_watch_condition"
+]
+
+HTTP_GONE = 410
+"""
+Status returned by the API server when a watch resource version is too old
+"""
+
+HTTP_TOO_MANY_REQUESTS = 429
+"""
+Status returned by the API server when it throttles a request
+"""
+
+WATCH_RESYNC_SECONDS = 60
+"""
+Maximum time a single watch stays open before the condition is re-checked
+"""
+
+POLL_INITIAL_INTERVAL = 1
+"""
+First delay in seconds of adaptive polling
+"""
+
+POLL_MAX_INTERVAL = 10
+"""
+Upper bound in seconds of the adaptive polling delay
+"""
+
+TRANSIENT_ERRORS = (ApiException, ConnectionError, MaxRetryError, NewConnectionError, ProtocolError)
+"""
+Errors that are logged and retried by the waiters until their deadline
+"""
+
+
+class ObjectDeletedError(ValueError):
+    """
+    Raised by `wait_for_custom_object` when the watched object is deleted.
+    """
+    pass
+
+
+class Deadline(object):
+    """
+    Overall time budget shared by several waiting phases.
+    """
+
+    def __init__(self, timeout):
+        self._start = time.monotonic()
+        self._end = self._start + timeout
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self._end
+
+    def remaining(self):
+        return max(0.0, self._end - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self._start
+
+
+def periodic(interval, func):
+    """
+    Wraps `func(elapsed)` so that it runs at most once every `interval`
+    seconds of elapsed time. Useful as an `on_wait` progress callback.
+    """
+    state = {"next": interval}
+
+    def wrapper(elapsed):
+        if elapsed >= state["next"]:
+            state["next"] = (int(elapsed // interval) + 1) * interval
+            func(elapsed)
+
+    return wrapper
+
+
+def _check(condition):
+    try:
+        return condition()
+    except TRANSIENT_ERRORS as e:
+        log.info("Readiness check failed, will check again: {}".format(e))
+        return False
+
+
+def wait_for_watch_condition(list_func, namespace, condition, deadline,
+                             field_selector=None, label_selector=None, on_wait=None):
+    """
+    Waits until `condition()` holds, re-evaluating it whenever an object
+    returned by the namespaced `list_func` changes instead of sleeping
+    between checks. The watch is re-opened periodically as a resync.
+    :param list_func: Namespaced list function of a Kubernetes API, e.g.
+                      `CoreV1Api().list_namespaced_pod`.
+    :param condition: Callable returning True once the wait is over.
+    :param deadline: `Deadline` shared with other phases.
+    :param on_wait: Optional callback invoked with the elapsed seconds.
+    :return: True if the condition holds, False if the deadline passed first.
+    """
+    selectors = {}
+    if field_selector:
+        selectors["field_selector"] = field_selector
+    if label_selector:
+        selectors["label_selector"] = label_selector
+
+    while not _check(condition):
+        if deadline.expired:
+            return False
+        if on_wait:
+            on_wait(deadline.elapsed())
+
+        timeout = max(1, int(min(deadline.remaining(), WATCH_RESYNC_SECONDS)))
+        w = watch.Watch()
+        try:
+            for _ in w.stream(list_func, namespace, timeout_seconds=timeout, **selectors):
+                if _check(condition):
+                    return True
+                if deadline.expired:
+                    return False
+        except TRANSIENT_ERRORS as e:
+            log.info("Watch interrupted, will resync: {}".format(e))
+            time.sleep(min(POLL_INITIAL_INTERVAL, deadline.remaining()))
+        finally:
+            w.stop()
+
+    return True
+
+
+def wait_for_deletion(list_func, namespace, deadline, ignore=None, on_count=None, on_wait=None):
+    """
+    Waits until none of the objects returned by the namespaced `list_func`
+    are left. They are listed once, and the remaining ones are then tracked
+    from the events of a watch resuming from the list's resource version.
+    They are only listed again when the watch expired.
+    :param list_func: Namespaced list function of a Kubernetes API, e.g.
+                      `CoreV1Api().list_namespaced_pod`.
+    :param deadline: `Deadline` shared with other phases.
+    :param ignore: Optional predicate of objects that are not waited for.
+    :param on_count: Optional callback invoked with the number of remaining
+                     objects after the list and every event.
+    :param on_wait: Optional callback invoked with the elapsed seconds.
+    :return: True once no objects are left, False if the deadline passed first.
+    """
+    def counted(obj):
+        return ignore is None or not ignore(obj)
+
+    remaining = None
+    resource_version = None
+
+    while True:
+        if remaining is None:
+            try:
+                result = list_func(namespace)
+            except TRANSIENT_ERRORS as e:
+                log.info("Listing failed, will list again: {}".format(e))
+                time.sleep(min(POLL_INITIAL_INTERVAL, deadline.remaining()))
+                if deadline.expired:
+                    return False
+                continue
+
+            remaining = set(item.metadata.name for item in result.items if counted(item))
+            resource_version = result.metadata.resource_version
+            if on_count:
+                on_count(len(remaining))
+
+        if not remaining:
+            return True
+        if deadline.expired:
+            return False
+        if on_wait:
+            on_wait(deadline.elapsed())
+
+        timeout = max(1, int(min(deadline.remaining(), WATCH_RESYNC_SECONDS)))
+        w = watch.Watch()
+        try:
+            for event in w.stream(list_func, namespace, resource_version=resource_version, timeout_seconds=timeout):
+                obj = event["object"]
+
+                if event["type"] == "ERROR":
+                    if obj.get("code") == HTTP_GONE:
+                        # History was compacted, count the objects again
+                        log.info("Watch expired, listing again.")
+                        remaining = None
+                        break
+                    log.info("Watch failed, will resume it: {}".format(obj.get("message")))
+                    time.sleep(min(POLL_INITIAL_INTERVAL, deadline.remaining()))
+                    break
+
+                resource_version = obj.metadata.resource_version or resource_version
+                if event["type"] == "DELETED" or not counted(obj):
+                    remaining.discard(obj.metadata.name)
+                else:
+                    remaining.add(obj.metadata.name)
+
+                if on_count:
+                    on_count(len(remaining))
+                if not remaining:
+                    return True
+                if deadline.expired:
+                    return False
+        except TRANSIENT_ERRORS as e:
+            if isinstance(e, ApiException) and e.status == HTTP_GONE:
+                log.info("Watch expired, listing again.")
+                remaining = None
+            else:
+                log.info("Watch interrupted, will resume it: {}".format(e))
+                time.sleep(min(POLL_INITIAL_INTERVAL, deadline.remaining()))
+        finally:
+            w.stop()
+
+
+def poll_until(condition, deadline, on_wait=None,
+               initial_interval=POLL_INITIAL_INTERVAL, max_interval=POLL_MAX_INTERVAL):
+    """
+    Polls `condition()` with a delay that starts small and doubles up to
+    `max_interval`, for probes that cannot be watched.
+    :return: True if the condition holds, False if the deadline passed first.
+    """
+    interval = initial_interval
+    while not _check(condition):
+        if deadline.expired:
+            return False
+        if on_wait:
+            on_wait(deadline.elapsed())
+
+        with span("sleep", "poll", seconds=interval):
+            time.sleep(min(interval, deadline.remaining()))
+        interval = min(interval * 2, max_interval)
+
+    return True
+
+
+def get_resource_version(obj):
+    """
+    Returns `metadata.resourceVersion` of a custom object response, if any.
+    """
+    if isinstance(obj, dict):
+        return (obj.get('metadata') or {}).get('resourceVersion')
+    return None
+
+
+def wait_for_custom_object(name, namespace, group, version, plural, predicate,
+                           timeout, resource_version=None, on_change=None):
+    """
+    Waits until a namespaced custom object satisfies `predicate` by watching
+    it instead of polling. The watch resumes from `resource_version` when
+    given, otherwise it starts from a fresh read of the object. Dropped
+    connections and expired watches are resynced with a fresh read until the
+    deadline.
+    :param predicate: Called with the custom object dict, returns True when done.
+    :param timeout: Overall deadline in seconds.
+    :param resource_version: Resource version to start watching from, e.g.
+                             taken from the create response.
+    :param on_change: Optional callback invoked with every observed object.
+    :return: The custom object that satisfied `predicate`, or None if the
+             deadline passed first.
+    :raises ObjectDeletedError: If the object is deleted while waiting.
+    :raises ApiException: If the object cannot be read, e.g. with status 404
+                          if it does not exist.
+    :raises ValueError: If the watch fails.
+    """
+    api = k8sClient.CustomObjectsApi()
+    deadline = time.monotonic() + timeout
+    interval = POLL_INITIAL_INTERVAL
+
+    while True:
+        w = None
+        try:
+            if resource_version is None:
+                obj = api.get_namespaced_custom_object(group, version, namespace, plural, name)
+                resource_version = get_resource_version(obj)
+                interval = POLL_INITIAL_INTERVAL
+                if on_change:
+                    on_change(obj)
+                if predicate(obj):
+                    return obj
+
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                return None
+
+            w = watch.Watch()
+            for event in w.stream(api.list_namespaced_custom_object,
+                                  group,
+                                  version,
+                                  namespace,
+                                  plural,
+                                  field_selector='metadata.name={}'.format(name),
+                                  resource_version=resource_version,
+                                  timeout_seconds=remaining):
+                obj = event['object']
+
+                if event['type'] == 'ERROR':
+                    if obj.get('code') == HTTP_GONE:
+                        # History was compacted, start again from a fresh read
+                        log.info('Watch on {} "{}" expired, re-reading it.'.format(plural, name))
+                        resource_version = None
+                        break
+                    raise ValueError('Watch on {} "{}" failed: {}'.format(plural, name, obj.get('message')))
+
+                if event['type'] == 'DELETED':
+                    raise ObjectDeletedError('{} "{}" was deleted while waiting for it.'.format(plural, name))
+
+                resource_version = get_resource_version(obj) or resource_version
+                if on_change:
+                    on_change(obj)
+                if predicate(obj):
+                    return obj
+        except TRANSIENT_ERRORS as e:
+            if isinstance(e, ApiException) and e.status == HTTP_GONE:
+                log.info('Watch on {} "{}" expired, re-reading it.'.format(plural, name))
+                resource_version = None
+                continue
+            if not _is_transient(e):
+                raise
+
+            # The connection dropped, resync from a fresh read once it is back
+            delay = min(interval, max(0.0, deadline - time.monotonic()))
+            log.info('Watch on {} "{}" interrupted, re-reading it in {:.0f}s: {}'.format(plural, name, delay, e))
+            resource_version = None
+            if delay <= 0:
+                return None
+            with span("sleep", "watch", seconds=delay):
+                time.sleep(delay)
+            interval = min(interval * 2, POLL_MAX_INTERVAL)
+        finally:
+            if w is not None:
+                w.stop()
+
+
+def _is_transient(error):
+    # Client errors of the API server, such as a missing object or a denied
+    # request, do not go away by reading again
+    if isinstance(error, ApiException):
+        status = error.status or 0
+        return status == HTTP_TOO_MANY_REQUESTS or status >= 500 or status == 0
+    return True
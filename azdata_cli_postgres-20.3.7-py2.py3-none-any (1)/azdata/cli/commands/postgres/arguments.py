@@ -1,11 +1,13 @@
 # ------------------------------------------------------------------------------
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ------------------------------------------------------------------------------
+from azdata.cli.commands.arc.trace_util import TRACE_FILE_HELP
 
 
 def load_arguments(self, _):
     from knack.arguments import ArgumentsContext
     from azdata.cli.commands.postgres import _
+    from azdata.cli.commands.postgres.constants import BACKUP_DEFAULT_PARALLELISM
 
     # ------------------------------------------------------------------------------
     # Server Commands
@@ -161,6 +163,11 @@ def load_arguments(self, _):
             help=_("A comma separated list of Postgres engine settings in the format 'key1=val1, key2=val2' to be applied to 'worker' node role."
                   " When node role specific settings are specified, default settings will be ignored and overridden with the settings provided here.")
         )
+        arg_context.argument(
+            'trace_file',
+            options_list=['--trace-file'],
+            help=_(TRACE_FILE_HELP)
+        )
     with ArgumentsContext(self, 'arc postgres server edit') as arg_context:
         arg_context.argument(
             'path',
@@ -669,7 +676,29 @@ def load_arguments(self, _):
         arg_context.argument(
             'server_name',
             options_list=['--server-name', '-sn'],
-            help=_('Name of the Azure Arc enabled PostgreSQL Hyperscale server group.')
+            help=_('Name of the Azure Arc enabled PostgreSQL Hyperscale server group. '
+                   'A comma separated list of names backs up several server groups.')
+        )
+
+        arg_context.argument(
+            'selector',
+            options_list=['--selector', '-l'],
+            help=_('Label selector of the Azure Arc enabled PostgreSQL Hyperscale server groups to back up.')
+        )
+
+        arg_context.argument(
+            'all_servers',
+            options_list=['--all'],
+            action='store_true',
+            help=_('Back up all Azure Arc enabled PostgreSQL Hyperscale server groups in the namespace.')
+        )
+
+        arg_context.argument(
+            'parallelism',
+            options_list=['--parallelism'],
+            type=int,
+            help=_('The maximum number of backups to create or check concurrently when backing up several '
+                   'server groups. Defaults to {}.').format(BACKUP_DEFAULT_PARALLELISM)
         )
 
         arg_context.argument(
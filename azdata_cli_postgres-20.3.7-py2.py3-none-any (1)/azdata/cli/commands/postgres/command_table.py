@@ -45,7 +45,7 @@ def load_command_table(self, _):
     # ------------------------------------------------------------------------------
     with CliCommandGroup(self, 'arc postgres backup', 'azdata.cli.commands.postgres.custom#{}',
                       client_factory=client.beget) as g:
-        g.command('create', 'arc_postgres_backup_create')
+        g.command('create', 'arc_postgres_backup_create', validator=validate_backup_create)
         g.command('delete', 'arc_postgres_backup_delete', validator=validate_backup_delete)
         g.command('restore', 'arc_postgres_backup_restore')
         g.command('list', 'arc_postgres_backup_list', output=format_table)
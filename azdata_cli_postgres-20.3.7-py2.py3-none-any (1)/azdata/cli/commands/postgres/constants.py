@@ -19,6 +19,37 @@ API_VERSION = "v1beta1"
 Defines the API version.
 """
 
+CRD_NAME = "postgresqls.arcdata.microsoft.com"
+"""
+Name of the postgres custom resource definition.
+"""
+
+PROGRESS_INTERVAL_SECONDS = 60
+"""
+Seconds between progress reports while waiting for a server group to be ready.
+"""
+
+RESTORE_UNREADY_GRACE_SECONDS = 15
+"""
+Seconds after a restore began within which the server group is expected to leave the Ready state: the 10 second
+health check interval plus 5 seconds for the controller to update the state.
+"""
+
+BACKUP_DEFAULT_PARALLELISM = 8
+"""
+Default number of backups created or checked concurrently when backing up several server groups.
+"""
+
+BACKUP_POLL_INITIAL_INTERVAL = 2
+"""
+Seconds before the first check of the backups being created.
+"""
+
+BACKUP_POLL_MAX_INTERVAL = 10
+"""
+Upper bound in seconds of the delay between checks of the backups being created.
+"""
+
 COMMAND_UNIMPLEMENTED = "This command is currently unimplemented."
 """
 Unimplemented response.
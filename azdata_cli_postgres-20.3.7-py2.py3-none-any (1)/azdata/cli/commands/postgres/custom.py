@@ -10,7 +10,6 @@ from azdata.cli.core.exceptions import http_status_codes
 from azdata.cli.core.clients.kubernetes_client import (
     K8sApiException)
 from azdata.cli.core.models.data_controller_custom_resource import DataControllerCustomResource
-from azdata.cli.core.models.custom_resource_definition import CustomResourceDefinition
 from azdata.cli.core.models.custom_resource import CustomResource
 from azdata.cli.core.constants import (
     AZDATA_PASSWORD,
@@ -24,8 +23,25 @@ from azdata.cli.commands.postgres.constants import (
     COMMAND_UNIMPLEMENTED,
     API_VERSION,
     API_GROUP,
-    DEFAULT_ENGINE_VERSION)
+    CRD_NAME,
+    DEFAULT_ENGINE_VERSION,
+    PROGRESS_INTERVAL_SECONDS,
+    RESTORE_UNREADY_GRACE_SECONDS,
+    BACKUP_DEFAULT_PARALLELISM,
+    BACKUP_POLL_INITIAL_INTERVAL,
+    BACKUP_POLL_MAX_INTERVAL)
 from azdata.cli.commands.postgres.util import is_valid_connectivity_mode
+from azdata.cli.commands.arc.common_util import execute_concurrently, validate_parallelism
+from azdata.cli.commands.arc.constants import CONNECTION_RETRY_ATTEMPTS, RETRY_INTERVAL
+from azdata.cli.commands.arc.resource_cache import (
+    get_custom_resource_definition,
+    iter_custom_objects,
+    list_custom_objects
+)
+from azdata.cli.commands.arc.retry_util import retry
+from azdata.cli.commands.arc.template_util import load_template
+from azdata.cli.commands.arc.trace_util import trace_command
+from azdata.cli.commands.arc.watch_util import ObjectDeletedError, get_resource_version, wait_for_custom_object
 from .models.postgres_cr_model import PostgresqlCustomResource
 from azdata.cli.core.exceptions import KubernetesError
 from azdata.cli.core.deploy import DeploymentConfigUtil
@@ -34,7 +50,6 @@ from dateutil import parser, tz
 from enum import Enum
 from humanfriendly.terminal.spinners import AutomaticSpinner
 from knack.prompting import NoTTYException
-from kubernetes import client as k8sClient
 
 import azdata.cli.core.deploy as util
 import copy
@@ -50,9 +65,6 @@ import sys
 from azdata.cli.core.logging import get_logger
 from urllib3.exceptions import NewConnectionError, MaxRetryError
 
-CONNECTION_RETRY_ATTEMPTS = 12
-RETRY_INTERVAL = 5
-
 logger = get_logger(__name__)
 
 
@@ -66,6 +78,7 @@ class progress_state(str, Enum):
 # Server Commands
 # ------------------------------------------------------------------------------
 
+@trace_command("arc postgres server create")
 def arc_postgres_server_create(client,
                                name,
                                path=None,
@@ -91,7 +104,8 @@ def arc_postgres_server_create(client,
                                no_wait=False,
                                engine_settings=None,
                                coordinator_engine_settings=None,
-                               worker_engine_settings=None):
+                               worker_engine_settings=None,
+                               trace_file=None):
     """
     Create an Azure Arc enabled PostgreSQL Hyperscale server group.
     :param client:
@@ -119,6 +133,7 @@ def arc_postgres_server_create(client,
     :param engine_settings: If given, sets the engine properties
     :param coordinator_engine_settings: If given, sets the engine settings on coordinator node
     :param worker_engine_settings: If given, sets the engine settings on worker node
+    :param trace_file: If given, writes a Chrome trace of the calls made by the command to this file.
     :return:
     """
     args = locals()
@@ -128,7 +143,7 @@ def arc_postgres_server_create(client,
         # TODO: Support user supplied namespace when the backend supports it
         namespace = client.profile.active_context.namespace
 
-        crd = _get_postgres_crd()
+        crd = _get_postgres_crd(client)
 
         # Initialize the custom resource's spec
         #
@@ -185,7 +200,7 @@ def arc_postgres_server_create(client,
         cr.apply_args(**args)
         cr.metadata.namespace = namespace
 
-        resource_kind_plural = crd.spec.names.plural
+        resource_kind_plural = crd.plural
 
         # Temporarily uses env to set dev mode as --dev parameter is disabled
         is_dev = os.environ.get("PG_IS_DEVELOPMENT")
@@ -204,11 +219,11 @@ def arc_postgres_server_create(client,
 
         cr.validate(client.apis.kubernetes)
 
-        custom_object_exists = util.retry(lambda: client.apis.kubernetes.namespaced_custom_object_exists(
-                                                    cr.metadata.name, cr.metadata.namespace,
-                                                    group=API_GROUP,
-                                                    version=API_VERSION,
-                                                    plural=resource_kind_plural),
+        custom_object_exists = retry(lambda: client.apis.kubernetes.namespaced_custom_object_exists(
+                                               cr.metadata.name, cr.metadata.namespace,
+                                               group=API_GROUP,
+                                               version=API_VERSION,
+                                               plural=resource_kind_plural),
                                         retry_count=CONNECTION_RETRY_ATTEMPTS,
                                         retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
                                         retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
@@ -217,15 +232,12 @@ def arc_postgres_server_create(client,
             raise ValueError("Postgres Server `{}` already exists in namespace `{}`.".format(name, namespace))
 
         if not no_external_endpoint:
-            response = util.retry(lambda: client.apis.kubernetes.list_namespaced_custom_object(
-                                    namespace,
-                                    group=ARC_GROUP,
-                                    version=ARC_API_VERSION,
-                                    plural=DATA_CONTROLLER_PLURAL),
-                                  retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                  retry_delay=RETRY_INTERVAL,
-                                  retry_method="list namespaced custom object",
-                                  retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+            response = retry(lambda: list_custom_objects(client, namespace, ARC_GROUP, ARC_API_VERSION,
+                                                         DATA_CONTROLLER_PLURAL),
+                             retry_count=CONNECTION_RETRY_ATTEMPTS,
+                             retry_delay=RETRY_INTERVAL,
+                             retry_method="list namespaced custom object",
+                             retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
             dcs = response.get("items")
             if not dcs:
@@ -238,10 +250,10 @@ def arc_postgres_server_create(client,
 
         secret_name = name + "-login-secret"
 
-        secret_exists = util.retry(lambda: client.apis.kubernetes.secret_exists(cr.metadata.namespace, secret_name),
-                                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                   retry_delay=RETRY_INTERVAL, retry_method="secret exists",
-                                   retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        secret_exists = retry(lambda: client.apis.kubernetes.secret_exists(cr.metadata.namespace, secret_name),
+                              retry_count=CONNECTION_RETRY_ATTEMPTS,
+                              retry_delay=RETRY_INTERVAL, retry_method="secret exists",
+                              retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
         if not secret_exists:
             pw = os.environ.get(AZDATA_PASSWORD)
@@ -260,21 +272,20 @@ def arc_postgres_server_create(client,
                 bytes("postgres", encoding)).decode(encoding)
             model["base64Password"] = base64.b64encode(
                 bytes(pw, encoding)).decode(encoding)
-            temp = util.get_config_from_template(
+            postgres_secret = load_template(
                 os.path.join(os.path.dirname(os.path.realpath(__file__)), "templates", "postgres-login.yaml.tmpl"),
                 model)
-            postgres_secret = yaml.safe_load(temp)
 
-            util.retry(
+            retry(
                 lambda: client.apis.kubernetes.create_secret(cr.metadata.namespace, postgres_secret, ignore_conflict=True),
                 retry_count=CONNECTION_RETRY_ATTEMPTS,
                 retry_delay=RETRY_INTERVAL, retry_method="create secret",
                 retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
-        util.retry(lambda: client.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=resource_kind_plural, ignore_conflict=True),
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
-                   retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+        response = retry(lambda: client.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=resource_kind_plural, ignore_conflict=True),
+                         retry_count=CONNECTION_RETRY_ATTEMPTS,
+                         retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
+                         retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
 
         if no_wait:
             client.stdout(
@@ -282,45 +293,10 @@ def arc_postgres_server_create(client,
                 "Please use `azdata arc postgres server show -n {0}` to check its status."
                     .format(cr.metadata.name, cr.metadata.namespace))
         else:
-            state = None
-            if not is_windows():
-                with AutomaticSpinner('Deploying {0} in namespace `{1}`'.format(cr.metadata.name, cr.metadata.namespace),
-                                      show_time=True):
-                    while state != 'ready' or state is None:
-                        time.sleep(5)
-                        response = util.retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                                                cr.metadata.name,
-                                                cr.metadata.namespace,
-                                                group=API_GROUP,
-                                                version=API_VERSION,
-                                                plural=resource_kind_plural),
-                                              retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                              retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                              retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
-
-                        deployed_cr = CustomResource.decode(PostgresqlCustomResource, response)
-                        state = deployed_cr.status.state
-                        if state is not None:
-                            state = state.lower()
-            else:
-                client.stdout('Deploying {0} in namespace `{1}`'.format(name, namespace))
-                while state != 'ready' or state is None:
-                    time.sleep(5)
-                    response = util.retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                                            cr.metadata.name,
-                                            cr.metadata.namespace,
-                                            group=API_GROUP,
-                                            version=API_VERSION,
-                                            plural=resource_kind_plural),
-                                          retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                          retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                          retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
-
-                    deployed_cr = CustomResource.decode(PostgresqlCustomResource, response)
-                    state = deployed_cr.status.state
-                    if state is not None:
-                        state = state.lower()
-
+            _wait_for_postgres_ready(client, cr.metadata.name, cr.metadata.namespace, resource_kind_plural,
+                                     'Deploying {0} in namespace `{1}`'.format(cr.metadata.name, cr.metadata.namespace),
+                                     resource_version=get_resource_version(response),
+                                     check_generation=False)
             client.stdout('{0} is Ready'.format(cr.metadata.name))
 
     except KubernetesError as e:
@@ -443,7 +419,7 @@ def arc_postgres_server_edit(
             client.apis.kubernetes.patch_secret(namespace, name+'-login-secret', {'stringData': {'password': pw}})
 
         # Replace CR
-        client.apis.kubernetes.replace_namespaced_custom_object(cr=cr, plural=crd.plural)
+        response = client.apis.kubernetes.replace_namespaced_custom_object(cr=cr, plural=crd.plural)
 
         if no_wait:
             client.stdout(
@@ -451,30 +427,9 @@ def arc_postgres_server_edit(
                 "Please use `azdata arc postgres server show -n {0} to check its status."
                     .format(cr.metadata.name, cr.metadata.namespace))
         else:
-            response = client.apis.kubernetes.get_namespaced_custom_object(
-                cr.metadata.name, cr.metadata.namespace, group=API_GROUP, version=API_VERSION, plural=crd.plural
-            )
-            deployed_cr = CustomResource.decode(PostgresqlCustomResource, response)
-
-            if not is_windows():
-                with AutomaticSpinner('Updating {0} in namespace `{1}`'.format(cr.metadata.name, cr.metadata.namespace),
-                                      show_time=True):
-                    while not _is_instance_ready(deployed_cr):
-                        time.sleep(5)
-                        response = client.apis.kubernetes.get_namespaced_custom_object(
-                            cr.metadata.name, cr.metadata.namespace, group=API_GROUP, version=API_VERSION, plural=crd.plural
-                        )
-                        deployed_cr = CustomResource.decode(PostgresqlCustomResource, response)
-
-            else:
-                client.stdout('Updating {0} in namespace `{1}`'.format(name, namespace))
-                while not _is_instance_ready(deployed_cr):
-                    time.sleep(5)
-                    response = client.apis.kubernetes.get_namespaced_custom_object(
-                        cr.metadata.name, cr.metadata.namespace, group=API_GROUP, version=API_VERSION, plural=crd.plural
-                    )
-                    deployed_cr = CustomResource.decode(PostgresqlCustomResource, response)
-
+            _wait_for_postgres_ready(client, cr.metadata.name, cr.metadata.namespace, crd.plural,
+                                     'Updating {0} in namespace `{1}`'.format(cr.metadata.name, cr.metadata.namespace),
+                                     resource_version=get_resource_version(response))
             client.stdout('{0} is Ready'.format(cr.metadata.name))
 
     except KubernetesError as e:
@@ -570,26 +525,24 @@ def arc_postgres_server_list(client):
     try:
         util.check_and_set_kubectl_context()
 
-        crd = _get_postgres_crd()
+        crd = _get_postgres_crd(client)
 
         # TODO: Support user supplied namespace when the backend supports it
         namespace = client.profile.active_context.namespace
 
-        response = client.apis.kubernetes.list_namespaced_custom_object(
-            namespace, group=API_GROUP, version=API_VERSION, plural=crd.spec.names.plural)
         # Temporary, need to discuss with PMs what standardized output we"d like for all partners
-        items = response.get("items")
-
+        # Only the listed fields are read from each item, without decoding it into a
+        # PostgresqlCustomResource, and items are fetched page by page.
         result = []
-        items.sort(key=lambda i:i["kind"] + "\n" + i["metadata"]["name"])
-        for item in items:
-            cr = CustomResource.decode(PostgresqlCustomResource, item)
+        for item in iter_custom_objects(namespace, API_GROUP, API_VERSION, crd.plural):
+            scale = (item.get("spec") or {}).get("scale") or {}
             result.append(
-                {"name": cr.metadata.name,
-                 "workers": cr.spec.scale.shards,  # defaults to 0
-                 "replicas": cr.spec.scale.replicas,  # defaults to 1
-                 "state": cr.status.state})
+                {"name": item["metadata"]["name"],
+                 "workers": _to_int(scale.get("workers")),  # defaults to 0
+                 "replicas": _to_int(scale.get("replicas", 1)),  # defaults to 1
+                 "state": (item.get("status") or {}).get("state")})
 
+        result.sort(key=lambda r: r["name"])
         return result
 
     except KubernetesError as e:
@@ -620,10 +573,10 @@ def arc_postgres_endpoint_list(client, name=None, engine_version=None):
                 raise CliError("Azure Arc enabled PostgreSQL Hyperscale server group {} not found.".format(name))
             custom_resources.append(cr)
         else:
-            crd = _get_postgres_crd()
+            crd = _get_postgres_crd(client)
 
             response = client.apis.kubernetes.list_namespaced_custom_object(
-                namespace, group=API_GROUP, version=API_VERSION, plural=crd.spec.names.plural)
+                namespace, group=API_GROUP, version=API_VERSION, plural=crd.plural)
             items = response.get("items")
 
             for item in items:
@@ -765,13 +718,19 @@ def arc_postgres_server_config_patch(client, path, patch_file):
     except Exception as e:
         raise CliError(e)
 
-def arc_postgres_backup_create(client, server_name, backup_name=None, incremental=False, no_wait=False):
+def arc_postgres_backup_create(client, server_name=None, backup_name=None, incremental=False, no_wait=False,
+                               selector=None, all_servers=False, parallelism=BACKUP_DEFAULT_PARALLELISM):
     """
     Create a backup of an Azure Arc enabled PostgreSQL Hyperscale server group.
     :param client:
-    :param server_name: Name of the Azure Arc enabled PostgreSQL Hyperscale server group.
+    :param server_name: Name of the Azure Arc enabled PostgreSQL Hyperscale server group, or a comma separated list
+                        of names to back up several server groups.
     :param backup_name: Name of the backup. This parameter is optional.
     :param incremental: Whether the backup should be incremental. This parameter is optional.
+    :param selector: Label selector of the server groups to back up.
+    :param all_servers: Back up all server groups in the namespace.
+    :param parallelism: The maximum number of backups to create or check concurrently when backing up several
+                        server groups.
     :return:
     """
     try:
@@ -779,74 +738,192 @@ def arc_postgres_backup_create(client, server_name, backup_name=None, incrementa
 
         # TODO: Support user supplied namespace when the backend supports it
         namespace = client.profile.active_context.namespace
+
+        if selector or all_servers or (server_name and ',' in server_name):
+            _create_backups(client, namespace, server_name, selector, backup_name, incremental, no_wait,
+                            validate_parallelism(parallelism))
+            return
+
         (cr, _) = _get_postgres_custom_object(client, server_name, namespace)
         if cr == None:
             raise CliError("Azure Arc enabled PostgreSQL Hyperscale server group {0} not found.".format(server_name))
 
-        server_group_id = cr.metadata.uid
-        resource_kind = cr.kind
+        job = _BackupJob(server_name, cr.kind, cr.metadata.uid)
         if no_wait:
-            backup = util.retry(lambda: client.apis.controller.postgres_server_backup_create(
-                    resource_kind=resource_kind,
-                    namespace=namespace,
-                    server_group_id=server_group_id,
-                    backup_name=backup_name,
-                    incremental=incremental),
-                retry_count=CONNECTION_RETRY_ATTEMPTS,
-                retry_delay=RETRY_INTERVAL,
-                retry_method="backup create",
-                retry_on_exceptions=(NewConnectionError, MaxRetryError))
+            _create_backup(client, namespace, job, backup_name, incremental)
             client.stdout("Created backup{0}. Please use `azdata arc postgres server list` to check its status."
                     .format('' if backup_name is None else " " + backup_name))
+        elif not is_windows():
+            with AutomaticSpinner("Creating backup{0}"
+                    .format('' if backup_name is None else " " + backup_name), show_time=True):
+                _create_backup(client, namespace, job, backup_name, incremental)
+                _wait_for_backups(client, namespace, [job])
         else:
-            if not is_windows():
-                with AutomaticSpinner("Creating backup{0}"
-                        .format('' if backup_name is None else " " + backup_name), show_time=True):
-                    backup = util.retry(lambda: client.apis.controller.postgres_server_backup_create(
-                            resource_kind=resource_kind,
-                            namespace=namespace,
-                            server_group_id=server_group_id,
-                            backup_name=backup_name,
-                            incremental=incremental),
-                        retry_count=CONNECTION_RETRY_ATTEMPTS,
-                        retry_delay=RETRY_INTERVAL,
-                        retry_method="backup create",
-                        retry_on_exceptions=(NewConnectionError, MaxRetryError))
-                    backup = util.retry(lambda: _wait_for_backup_state_change(
-                            lambda: client.apis.controller.postgres_server_backup_show(
-                                resource_kind=resource_kind,
-                                namespace=namespace,
-                                server_group_id=server_group_id,
-                                backup_id=backup.ID)),
-                        retry_count=CONNECTION_RETRY_ATTEMPTS,
-                        retry_delay=RETRY_INTERVAL,
-                        retry_method="backup show",
-                        retry_on_exceptions=(NewConnectionError, MaxRetryError))
-            else:
-                backup = util.retry(lambda: client.apis.controller.postgres_server_backup_create(
-                        resource_kind=resource_kind,
-                        namespace=namespace,
-                        server_group_id=server_group_id,
-                        backup_name=backup_name,
-                        incremental=incremental),
-                    retry_count=CONNECTION_RETRY_ATTEMPTS,
-                    retry_delay=RETRY_INTERVAL,
-                    retry_method="backup create",
-                    retry_on_exceptions=(NewConnectionError, MaxRetryError))
-                backup = util.retry(lambda: _wait_for_backup_state_change(
-                        lambda: client.apis.controller.postgres_server_backup_show(
-                            resource_kind=resource_kind,
-                            namespace=namespace,
-                            server_group_id=server_group_id,
-                            backup_id=backup.ID)),
-                    retry_count=CONNECTION_RETRY_ATTEMPTS,
-                    retry_delay=RETRY_INTERVAL,
-                    retry_method="backup show",
-                    retry_on_exceptions=(NewConnectionError, MaxRetryError))
-        return _format_backup(backup)
+            _create_backup(client, namespace, job, backup_name, incremental)
+            _wait_for_backups(client, namespace, [job])
+
+        if job.error:
+            raise job.error
+        return _format_backup(job.backup)
     except Exception as e:
         raise CliError(e)
 
+
+def _create_backups(client, namespace, server_names, selector, backup_name, incremental, no_wait, parallelism):
+    """
+    Backs up several server groups at once. The backups are created concurrently and then tracked together
+    until all of them finished, after which a summary is printed.
+    """
+    names = [n.strip() for n in server_names.split(',') if n.strip()] if server_names else None
+    jobs = _list_backup_jobs(client, namespace, names, selector)
+    if not jobs:
+        raise CliError("No Azure Arc enabled PostgreSQL Hyperscale server groups were found to back up.")
+
+    client.stdout("Creating backups of {0} server groups: {1}".format(
+        len(jobs), ', '.join(job.server_name for job in jobs)))
+
+    for r in execute_concurrently(lambda job: _create_backup(client, namespace, job, backup_name, incremental),
+                                  jobs, parallelism):
+        if not r.succeeded:
+            r.item.fail(r.error)
+
+    if not no_wait:
+        _wait_for_backups(client, namespace, jobs, parallelism)
+
+    _print_backup_summary(client, jobs)
+
+    failed = [job for job in jobs if job.failed]
+    if failed:
+        raise CliError("{0} of {1} backups failed: {2}".format(
+            len(failed), len(jobs), ', '.join(job.server_name for job in failed)))
+
+
+def _list_backup_jobs(client, namespace, server_names=None, selector=None):
+    """
+    Returns a backup job for every server group in `server_names`, or matching `selector`, or in the namespace.
+    The server groups are listed page by page, and only the jobs are kept.
+    """
+    crd = _get_postgres_crd(client)
+    wanted = dict.fromkeys(server_names) if server_names else None
+    jobs = OrderedDict()
+    for item in iter_custom_objects(namespace, API_GROUP, API_VERSION, crd.plural, label_selector=selector):
+        name = item["metadata"]["name"]
+        if wanted is None or name in wanted:
+            jobs[name] = _BackupJob(name, item["kind"], item["metadata"]["uid"])
+
+    if wanted is None:
+        return list(jobs.values())
+
+    missing = [name for name in wanted if name not in jobs]
+    if missing:
+        raise CliError("Azure Arc enabled PostgreSQL Hyperscale server groups not found: {0}."
+                       .format(', '.join(missing)))
+    return [jobs[name] for name in wanted]
+
+
+class _BackupJob(object):
+    """
+    A backup created by `arc postgres backup create` and its progress.
+    """
+
+    def __init__(self, server_name, resource_kind, server_group_id):
+        self.server_name = server_name
+        self.resource_kind = resource_kind
+        self.server_group_id = server_group_id
+        self.backup = None
+        self.error = None
+        self.duration = None
+        self._start = None
+
+    @property
+    def pending(self):
+        return self.backup is not None and self.error is None and self.duration is None
+
+    @property
+    def failed(self):
+        return self.error is not None or \
+            (self.backup is not None and self.backup.progress.lower() == progress_state.failed)
+
+    def started(self, backup):
+        self.backup = backup
+        self._start = time.monotonic()
+
+    def update(self, backup):
+        self.backup = backup
+        if backup.progress.lower() not in (progress_state.active, progress_state.pending):
+            self.duration = time.monotonic() - self._start
+
+    def fail(self, error):
+        self.error = error
+        if self._start is not None:
+            self.duration = time.monotonic() - self._start
+
+
+def _create_backup(client, namespace, job, backup_name, incremental):
+    job.started(retry(lambda: client.apis.controller.postgres_server_backup_create(
+            resource_kind=job.resource_kind,
+            namespace=namespace,
+            server_group_id=job.server_group_id,
+            backup_name=backup_name,
+            incremental=incremental),
+        retry_count=CONNECTION_RETRY_ATTEMPTS,
+        retry_delay=RETRY_INTERVAL,
+        retry_method="backup create",
+        retry_on_exceptions=(NewConnectionError, MaxRetryError)))
+
+
+def _wait_for_backups(client, namespace, jobs, parallelism=1):
+    """
+    Waits for backups to finish. A single scheduler checks all unfinished backups in rounds, at most
+    `parallelism` at a time, with a delay between rounds that starts at BACKUP_POLL_INITIAL_INTERVAL and doubles
+    up to BACKUP_POLL_MAX_INTERVAL. Backups whose status cannot be read are marked as failed.
+    """
+    def show(job):
+        return retry(lambda: client.apis.controller.postgres_server_backup_show(
+                resource_kind=job.resource_kind,
+                namespace=namespace,
+                server_group_id=job.server_group_id,
+                backup_id=job.backup.ID),
+            retry_count=CONNECTION_RETRY_ATTEMPTS,
+            retry_delay=RETRY_INTERVAL,
+            retry_method="backup show",
+            retry_on_exceptions=(NewConnectionError, MaxRetryError))
+
+    interval = BACKUP_POLL_INITIAL_INTERVAL
+    pending = [job for job in jobs if job.pending]
+    while pending:
+        time.sleep(interval)
+        for r in execute_concurrently(show, pending, parallelism):
+            if r.succeeded:
+                r.item.update(r.result)
+            else:
+                r.item.fail(r.error)
+        pending = [job for job in pending if job.pending]
+        interval = min(interval * 2, BACKUP_POLL_MAX_INTERVAL)
+
+
+def _print_backup_summary(client, jobs):
+    rows = [["Server", "Backup", "ID", "State", "Duration", "Size"]]
+    for job in jobs:
+        backup = job.backup
+        if job.error is not None:
+            state = "error: {0}".format(job.error)
+        else:
+            state = backup.progress
+            if backup.status is not None and not backup.status.result:
+                state = "{0}: {1}".format(state, backup.status.message)
+        rows.append([
+            job.server_name,
+            backup.backup.name if backup else "",
+            backup.ID if backup else "",
+            state,
+            "{0:.0f}s".format(job.duration) if job.duration is not None else "",
+            str(backup.backup.size) if backup and backup.backup.size is not None else ""])
+
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        client.stdout("  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+
 def arc_postgres_backup_restore(client, server_name, backup_id=None, source_server_name=None, restore_time=None):
     """
     Restore a backup of an Azure Arc enabled PostgreSQL Hyperscale server group.
@@ -863,7 +940,7 @@ def arc_postgres_backup_restore(client, server_name, backup_id=None, source_serv
         # TODO: Support user supplied namespace when the backend supports it
         namespace = client.profile.active_context.namespace
 
-        (cr, _) = _get_postgres_custom_object(client, server_name, namespace)
+        (cr, crd) = _get_postgres_custom_object(client, server_name, namespace)
         if cr == None:
             raise CliError("Azure Arc enabled PostgreSQL Hyperscale server group {0} not found.".format(server_name))
 
@@ -903,7 +980,7 @@ def arc_postgres_backup_restore(client, server_name, backup_id=None, source_serv
         if restore_time is not None:
             restore_time = _parse_restore_time(restore_time)
         
-        status = util.retry(lambda: client.apis.controller.postgres_server_backup_restore(
+        status = retry(lambda: client.apis.controller.postgres_server_backup_restore(
                 resource_kind=resource_kind,
                 namespace=namespace,
                 server_group_id=server_group_id,
@@ -916,8 +993,8 @@ def arc_postgres_backup_restore(client, server_name, backup_id=None, source_serv
             retry_on_exceptions=(NewConnectionError, MaxRetryError))
 
         def _wait_for_restore():
-            startTime = time.time()
-            result = util.retry(lambda: _wait_for_backup_state_change(
+            startTime = time.monotonic()
+            result = retry(lambda: _wait_for_backup_state_change(
                     lambda: client.apis.controller.postgres_server_backup_restore_status(
                         resource_kind=resource_kind,
                         namespace=namespace,
@@ -925,25 +1002,15 @@ def arc_postgres_backup_restore(client, server_name, backup_id=None, source_serv
                 retry_count=CONNECTION_RETRY_ATTEMPTS,
                 retry_delay=RETRY_INTERVAL,
                 retry_method="backup restore status",
-                retry_on_exceptions=(NewConnectionError, MaxRetryError))
+                retry_on_exceptions=(NewConnectionError, MaxRetryError),
+                retry_deadline=None)
 
             if result.progress.lower() == progress_state.done:
                 # if the restore completes very quickly, it's possible that Kubernetes hasn't run the health check to notice that the pods
-                # are no longer ready or that the Dusky controller hasn't updated the state based on the pods yet, so ensure we wait at least
-                # 15 seconds since the restore began, unless we see the service leave the Running state sooner. (the health check interval is
-                # 10 seconds, and we'll give the controller 5 seconds...)
-                delay = 2.5
-                while True: # wait for the service to become unready or for 15 seconds to have elapsed
-                    (cr, _) = _get_postgres_custom_object(client, server_name, namespace, None)
-                    if cr is None or cr.status.state != 'Ready': break
-                    initialDelay = 15 - (time.time()-startTime) - delay
-                    if initialDelay <= 0: break
-                    time.sleep(5 if initialDelay > 5 else initialDelay)
-                while cr: # and wait for the service to become ready again if desired
-                    time.sleep(delay)
-                    (cr, _) = _get_postgres_custom_object(client, server_name, namespace, None)
-                    if cr is None or cr.status.state == 'Ready': break
-                    if delay < 10: delay *= 2
+                # are no longer ready or that the Dusky controller hasn't updated the state based on the pods yet, so the server group is
+                # followed with a watch until it leaves the Ready state or RESTORE_UNREADY_GRACE_SECONDS have elapsed since the restore
+                # began, and then until it is ready again.
+                _wait_for_restored_server(server_name, namespace, crd.plural, startTime)
 
             return _format_restore(result)
 
@@ -983,7 +1050,7 @@ def arc_postgres_backup_list(client, server_name):
             raise CliError("Azure Arc enabled PostgreSQL Hyperscale server group {0} not found."
                             " No backup was retrieved.".format(server_name))
 
-        backups = util.retry(lambda: client.apis.controller.postgres_server_backup_list(
+        backups = retry(lambda: client.apis.controller.postgres_server_backup_list(
                 resource_kind=cr.kind,
                 namespace=namespace,
                 server_group_id=cr.metadata.uid),
@@ -1025,7 +1092,7 @@ def arc_postgres_backup_delete(client, server_name, backup_name=None, backup_id=
                 logger.warn(not_found)
                 return
 
-        backup = util.retry(lambda: client.apis.controller.postgres_server_backup_delete(
+        backup = retry(lambda: client.apis.controller.postgres_server_backup_delete(
                 resource_kind=cr.kind,
                 namespace=namespace,
                 server_group_id=cr.metadata.uid,
@@ -1035,7 +1102,7 @@ def arc_postgres_backup_delete(client, server_name, backup_name=None, backup_id=
             retry_method="backup delete",
             retry_on_exceptions=(NewConnectionError, MaxRetryError))
 
-        # util.retry returns True if the function it retries returns None
+        # retry returns True if the function it retries returns None
         if backup == True:
             logger.warn(not_found)
         else:
@@ -1047,7 +1114,7 @@ def arc_postgres_backup_delete(client, server_name, backup_name=None, backup_id=
 # Raises an exception if there are multiple backups with the given name.
 # Returns None if no backup was found with the given name.
 def _get_backup_id_by_name(client, resource_kind, namespace, server_id, backup_name) -> str:
-    backups = util.retry(lambda: client.apis.controller.postgres_server_backup_list(
+    backups = retry(lambda: client.apis.controller.postgres_server_backup_list(
                 resource_kind=resource_kind,
                 namespace=namespace,
                 server_group_id=server_id),
@@ -1372,17 +1439,17 @@ def _format_restore(resp):
 #         raise CliError(e)
 
 
-def _get_postgres_crd():
+def _get_postgres_crd(client):
     """
-    Returns the postgresql CRD.
+    Returns the postgresql CRD. It is looked up by name, once per command.
     :return:
     """
-    api = k8sClient.ApiextensionsV1Api()
-    crds = api.list_custom_resource_definition()
-    for crd in crds.items:
-        if crd.spec.names.kind == RESOURCE_KIND:
-            return crd
-    raise CliError("Unable to locate PostgreSQL custom resource definition.")
+    try:
+        return get_custom_resource_definition(client, CRD_NAME)
+    except K8sApiException as e:
+        if e.status == http_status_codes.not_found:
+            raise CliError("Unable to locate PostgreSQL custom resource definition.")
+        raise
 
 
 def _get_postgres_custom_object(client, name, namespace, raw=False):
@@ -1398,7 +1465,7 @@ def _get_postgres_custom_object(client, name, namespace, raw=False):
              CliError will be raised if there are multiple Azure Arc enabled PostgreSQL Hyperscale server groups found.
     """
 
-    crd = CustomResourceDefinition(_get_postgres_crd().to_dict())
+    crd = _get_postgres_crd(client)
 
     try:
         result = client.apis.kubernetes.get_namespaced_custom_object(name=name, namespace=namespace, crd=crd)
@@ -1422,6 +1489,36 @@ def _wait_for_backup_state_change(func, *funcargs, **kwargs):
             delay = 60
     return result
 
+
+def _wait_for_restored_server(name, namespace, plural, start):
+    """
+    Follows a server group after a restore completed, first until it leaves the Ready state or
+    RESTORE_UNREADY_GRACE_SECONDS have passed since `start`, then until it is Ready again. Both phases watch
+    the custom resource, so each transition is seen when it happens. Returns early if the server group is
+    deleted.
+    """
+    def is_ready(obj):
+        return (obj.get('status') or {}).get('state') == 'Ready'
+
+    def watch(predicate, timeout):
+        # The pods restart after a restore, so the watch resyncs after dropped connections to the API server
+        # on its own. It is not wrapped in retry, which would turn the None of a timed out watch into True.
+        return wait_for_custom_object(name, namespace, API_GROUP, API_VERSION, plural, predicate, timeout=timeout)
+
+    try:
+        grace = RESTORE_UNREADY_GRACE_SECONDS - (time.monotonic() - start)
+        if grace > 0:
+            watch(lambda obj: not is_ready(obj), grace)
+
+        while watch(is_ready, PROGRESS_INTERVAL_SECONDS) is None:
+            pass
+    except K8sApiException as e:
+        if e.status != http_status_codes.not_found:
+            raise
+    except ObjectDeletedError as e:
+        logger.info(e)
+
+
 def _parse_restore_time(time):
     if re.match(r"^(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)[mMhHdDwW]$", time) is not None:
         return time
@@ -1432,6 +1529,83 @@ def _parse_restore_time(time):
         return t.astimezone(tz.tzutc())
 
 
-def _is_instance_ready(cr):
-    return cr.metadata.generation == cr.status.observed_generation \
-        and (cr.status.state is not None and cr.status.state.lower() == 'ready')
\ No newline at end of file
+def _to_int(value):
+    return int(value) if value is not None else None
+
+
+def _wait_for_postgres_ready(client, name, namespace, plural, message, resource_version=None, check_generation=True):
+    """
+    Waits for an Azure Arc enabled PostgreSQL Hyperscale server group to be ready by watching its custom
+    resource. State transitions and changes of the ready pods are reported as they happen, along with the
+    time spent in the previous state, and the current state is reported every PROGRESS_INTERVAL_SECONDS.
+    A spinner shows `message` in between, except on Windows where it is printed once.
+    :param message: Description of the wait, e.g. "Deploying <name> in namespace `<namespace>`".
+    :param resource_version: Resource version to start watching from, e.g. of the create or replace response.
+    :param check_generation: Also wait for the operator to observe the latest generation of the spec, so an
+                             edit is not reported as done based on the state before the edit.
+    :return: The ready custom object.
+    """
+    progress = _ProvisioningProgress(client, name, resource_version)
+
+    def is_ready(obj):
+        status = obj.get('status') or {}
+        if (status.get('state') or '').lower() != 'ready':
+            return False
+        return not check_generation or obj['metadata'].get('generation') == status.get('observedGeneration')
+
+    def wait():
+        while True:
+            # Dropped connections to the API server are resynced by the watch until its timeout, after which
+            # the progress is reported and the watch resumes
+            obj = wait_for_custom_object(name, namespace, API_GROUP, API_VERSION, plural, is_ready,
+                                         timeout=PROGRESS_INTERVAL_SECONDS,
+                                         resource_version=progress.resource_version,
+                                         on_change=progress.update)
+            if obj is not None:
+                return obj
+            progress.report()
+
+    if is_windows():
+        client.stdout(message)
+        return wait()
+
+    with AutomaticSpinner(message, show_time=True):
+        return wait()
+
+
+class _ProvisioningProgress(object):
+    """
+    Tracks the state and the ready pods of a server group while waiting for it.
+    """
+
+    def __init__(self, client, name, resource_version=None):
+        self.client = client
+        self.name = name
+        self.resource_version = resource_version
+        self.state = None
+        self.ready_pods = None
+        self._state_start = time.monotonic()
+
+    def update(self, obj):
+        self.resource_version = get_resource_version(obj) or self.resource_version
+        status = obj.get('status') or {}
+        state = status.get('state') or 'Pending'
+        ready_pods = status.get('readyPods')
+
+        if state != self.state:
+            now = time.monotonic()
+            if self.state is None:
+                self.client.stdout('{0} is {1}'.format(self.name, state))
+            else:
+                self.client.stdout('{0} is {1} ({2} for {3:.0f}s)'.format(
+                    self.name, state, self.state, now - self._state_start))
+            self.state = state
+            self._state_start = now
+
+        if ready_pods != self.ready_pods and ready_pods is not None:
+            self.client.stdout('{0} ready pods: {1}'.format(self.name, ready_pods))
+        self.ready_pods = ready_pods
+
+    def report(self):
+        self.client.stdout('{0} is {1} for {2:.0f}s, ready pods: {3}'.format(
+            self.name, self.state, time.monotonic() - self._state_start, self.ready_pods))
@@ -327,6 +327,12 @@ helps['arc postgres backup create'] = """
         - name: Creates a named backup for service 'pg'.
           text: >
             azdata arc postgres backup create -sn pg -n backup1
+        - name: Creates backups of all server groups labeled 'tier=prod' and prints a summary.
+          text: >
+            azdata arc postgres backup create -l tier=prod
+        - name: Creates backups of all server groups in the namespace.
+          text: >
+            azdata arc postgres backup create --all
 """.format(
     short=_('Create a backup of an Azure Arc enabled PostgreSQL Hyperscale server group.'),
     ex1=_('Create a backup of an Azure Arc enabled PostgreSQL Hyperscale server group.'))
@@ -0,0 +1,128 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+from types import SimpleNamespace
+
+import pytest
+
+from azdata.cli.commands.postgres import custom
+from azdata.cli.commands.postgres.custom import (
+    _BackupJob,
+    _list_backup_jobs,
+    _print_backup_summary,
+    _wait_for_backups
+)
+
+
+def backup(progress, result=True, message=None, status=True):
+    return SimpleNamespace(
+        ID="id-" + progress,
+        progress=progress,
+        status=SimpleNamespace(result=result, message=message) if status else None,
+        backup=SimpleNamespace(name="backup", size=42))
+
+
+def server(name):
+    return {"kind": "postgresql-12", "metadata": {"name": name, "uid": "uid-" + name}}
+
+
+class Client(object):
+    def __init__(self, shows=()):
+        self.lines = []
+        self.shows = list(shows)
+        self.apis = SimpleNamespace(controller=SimpleNamespace(postgres_server_backup_show=self.show))
+
+    def stdout(self, line):
+        self.lines.append(line)
+
+    def show(self, **kwargs):
+        result = self.shows.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    listed = []
+
+    def iter_custom_objects(namespace, group, version, plural, label_selector=None):
+        listed.append(label_selector)
+        return iter([server("a"), server("b"), server("c")])
+
+    monkeypatch.setattr(custom, "_get_postgres_crd", lambda client: SimpleNamespace(plural="postgresql-12s"))
+    monkeypatch.setattr(custom, "iter_custom_objects", iter_custom_objects)
+    return listed
+
+
+def test_backup_job_states():
+    job = _BackupJob("a", "postgresql-12", "uid-a")
+    assert not job.pending and not job.failed
+
+    job.started(backup("pending"))
+    assert job.pending and not job.failed and job.duration is None
+
+    job.update(backup("active"))
+    assert job.pending
+
+    job.update(backup("done"))
+    assert not job.pending and not job.failed and job.duration is not None
+
+
+def test_backup_job_failures():
+    job = _BackupJob("a", "postgresql-12", "uid-a")
+    job.started(backup("active"))
+    job.update(backup("Failed", result=False))
+    assert job.failed and not job.pending
+
+    job = _BackupJob("b", "postgresql-12", "uid-b")
+    job.fail(ValueError("unreachable"))
+    assert job.failed and job.duration is None
+
+
+def test_list_backup_jobs(servers):
+    jobs = _list_backup_jobs(None, "ns", selector="tier=gold")
+    assert [(job.server_name, job.server_group_id) for job in jobs] == [("a", "uid-a"), ("b", "uid-b"), ("c", "uid-c")]
+    assert servers == ["tier=gold"]
+
+    jobs = _list_backup_jobs(None, "ns", ["c", "a", "c"])
+    assert [job.server_name for job in jobs] == ["c", "a"]
+
+
+def test_list_backup_jobs_missing_servers(servers):
+    with pytest.raises(custom.CliError):
+        _list_backup_jobs(None, "ns", ["a", "x"])
+
+
+def test_wait_for_backups(monkeypatch):
+    monkeypatch.setattr(custom.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(custom, "retry", lambda func, **kwargs: func())
+
+    done, failed = _BackupJob("a", "postgresql-12", "uid-a"), _BackupJob("b", "postgresql-12", "uid-b")
+    done.started(backup("pending"))
+    failed.started(backup("pending"))
+
+    client = Client([backup("active"), ValueError("gone"), backup("done")])
+    _wait_for_backups(client, "ns", [done, failed])
+
+    assert not done.pending and not done.failed
+    assert failed.failed and isinstance(failed.error, ValueError)
+
+
+def test_print_backup_summary():
+    done, failed, errored, unknown = (_BackupJob(name, "postgresql-12", "uid-" + name) for name in "abcd")
+    done.started(backup("pending"))
+    done.update(backup("done"))
+    failed.started(backup("pending"))
+    failed.update(backup("failed", result=False, message="disk full"))
+    errored.fail(ValueError("unreachable"))
+    unknown.started(backup("pending", status=False))
+
+    client = Client()
+    _print_backup_summary(client, [done, failed, errored, unknown])
+
+    assert client.lines[0].split() == ["Server", "Backup", "ID", "State", "Duration", "Size"]
+    assert "failed: disk full" in client.lines[2]
+    assert "error: unreachable" in client.lines[3]
+    assert client.lines[4].split() == ["d", "backup", "id-pending", "pending", "42"]
@@ -0,0 +1,141 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ------------------------------------------------------------------------------
+
+from types import SimpleNamespace
+
+import pytest
+
+from azdata.cli.commands.arc import watch_util
+from azdata.cli.commands.postgres import custom
+from azdata.cli.commands.postgres.custom import _wait_for_postgres_ready
+
+
+def server(state, resource_version, generation=1, observed_generation=1, ready_pods=None):
+    return {"metadata": {"name": "pg", "resourceVersion": resource_version, "generation": generation},
+            "status": {"state": state, "observedGeneration": observed_generation, "readyPods": ready_pods}}
+
+
+class Client(object):
+    def __init__(self):
+        self.lines = []
+
+    def stdout(self, line):
+        self.lines.append(line)
+
+
+class Watches(object):
+    """
+    Stands in for `wait_for_custom_object`. Every call reports the objects of
+    one scripted watch to `on_change` and returns the first one satisfying
+    the predicate, or None like a watch that timed out.
+    """
+
+    def __init__(self, watches):
+        self.watches = list(watches)
+        self.resource_versions = []
+
+    def __call__(self, name, namespace, group, version, plural, predicate, timeout, resource_version=None,
+                 on_change=None):
+        self.resource_versions.append(resource_version)
+        for obj in self.watches.pop(0):
+            on_change(obj)
+            if predicate(obj):
+                return obj
+        return None
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    monkeypatch.setattr(custom, "is_windows", lambda: True)
+
+
+def test_wait_for_postgres_ready_reports_progress_until_ready(monkeypatch, windows):
+    watches = Watches([[server("Pending", "2"), server("Creating", "3", ready_pods="0/2")],
+                       [server("Ready", "4", ready_pods="2/2")]])
+    monkeypatch.setattr(custom, "wait_for_custom_object", watches)
+    client = Client()
+
+    obj = _wait_for_postgres_ready(client, "pg", "ns", "postgresql-12s", "Deploying pg", resource_version="1")
+
+    assert obj["metadata"]["resourceVersion"] == "4"
+    assert watches.resource_versions == ["1", "3"]
+    assert client.lines[0] == "Deploying pg"
+    assert client.lines[1:4] == ["pg is Pending", "pg is Creating (Pending for 0s)", "pg ready pods: 0/2"]
+    assert client.lines[4].startswith("pg is Creating for ")
+    assert client.lines[5:] == ["pg is Ready (Creating for 0s)", "pg ready pods: 2/2"]
+
+
+def test_wait_for_postgres_ready_waits_for_the_latest_generation(monkeypatch, windows):
+    watches = Watches([[server("Ready", "2", generation=2, observed_generation=1),
+                        server("Ready", "3", generation=2, observed_generation=2)]])
+    monkeypatch.setattr(custom, "wait_for_custom_object", watches)
+
+    obj = _wait_for_postgres_ready(Client(), "pg", "ns", "postgresql-12s", "Updating pg")
+
+    assert obj["metadata"]["resourceVersion"] == "3"
+
+
+class CustomObjectsApi(object):
+    def __init__(self, gets):
+        self.gets = list(gets)
+
+    def get_namespaced_custom_object(self, group, version, namespace, plural, name):
+        result = self.gets.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def list_namespaced_custom_object(self, *args, **kwargs):
+        raise AssertionError("Only called through the watch")
+
+
+class Watch(object):
+    """
+    Serves one scripted stream of events per `stream` call, raising the
+    exceptions in it when reached.
+    """
+    streams = []
+
+    def stream(self, func, *args, **kwargs):
+        for event in Watch.streams.pop(0):
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    def setup(gets, streams):
+        api = CustomObjectsApi(gets)
+        Watch.streams = list(streams)
+        monkeypatch.setattr(watch_util, "k8sClient", SimpleNamespace(CustomObjectsApi=lambda: api))
+        monkeypatch.setattr(watch_util, "watch", SimpleNamespace(Watch=Watch))
+        monkeypatch.setattr(watch_util.time, "sleep", lambda seconds: None)
+        return api
+
+    return setup
+
+
+def test_wait_for_restored_server_survives_dropped_connections(cluster):
+    dropped = watch_util.NewConnectionError("connection refused")
+    api = cluster(
+        [server("Ready", "1"), dropped, server("Ready", "2"), server("Restoring", "4"), server("Restoring", "5")],
+        [[dropped],
+         [{"type": "MODIFIED", "object": server("Restoring", "3")}],
+         [watch_util.ProtocolError("connection reset")],
+         [{"type": "MODIFIED", "object": server("Ready", "6")}]])
+
+    custom._wait_for_restored_server("pg", "ns", "postgresql-12s", start=custom.time.monotonic())
+
+    assert api.gets == []
+    assert Watch.streams == []
+
+
+def test_wait_for_restored_server_returns_when_the_server_is_deleted(cluster):
+    cluster([server("Ready", "1")], [[{"type": "DELETED", "object": server("Ready", "2")}]])
+
+    custom._wait_for_restored_server("pg", "ns", "postgresql-12s", start=custom.time.monotonic())
@@ -2,10 +2,11 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ------------------------------------------------------------------------------
 
-import azdata.cli.core.deploy as util
 from azdata.cli.commands.sqlmi.exceptions import CliError
 from azdata.cli.core.clients.kubernetes_client import K8sApiException
-from azdata.cli.commands.arc.constants import DIRECT
+from azdata.cli.commands.arc.constants import DIRECT, CONNECTION_RETRY_ATTEMPTS, RETRY_INTERVAL
+from azdata.cli.commands.arc.resource_cache import list_custom_objects
+from azdata.cli.commands.arc.retry_util import retry
 from azdata.cli.core.constants import (
     ARC_GROUP,
     ARC_API_VERSION,
@@ -94,20 +95,13 @@ def hierarchical_output(command_result):
     return format_json(command_result)
 
 def is_valid_connectivity_mode(client):
-    CONNECTION_RETRY_ATTEMPTS = 12
-    RETRY_INTERVAL = 5
-    
     namespace = client.profile.active_context.namespace
 
-    response = util.retry(lambda: client.apis.kubernetes.list_namespaced_custom_object(
-                                    namespace,
-                                    group=ARC_GROUP,
-                                    version=ARC_API_VERSION,
-                                    plural=DATA_CONTROLLER_PLURAL),
-                            retry_count=CONNECTION_RETRY_ATTEMPTS,
-                            retry_delay=RETRY_INTERVAL,
-                            retry_method="list namespaced custom object",
-                            retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+    response = retry(lambda: list_custom_objects(client, namespace, ARC_GROUP, ARC_API_VERSION, DATA_CONTROLLER_PLURAL),
+                     retry_count=CONNECTION_RETRY_ATTEMPTS,
+                     retry_delay=RETRY_INTERVAL,
+                     retry_method="list namespaced custom object",
+                     retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
     dcs = response.get("items")
     if not dcs:
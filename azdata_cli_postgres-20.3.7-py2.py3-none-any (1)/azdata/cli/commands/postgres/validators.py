@@ -8,3 +8,10 @@ def validate_backup_delete(args):
     elif args.backup_id is None and args.backup_name is None:
         raise ValueError("Either -id or --name must be provided.")
 
+
+def validate_backup_create(args):
+    targets = [t for t in (args.server_name, args.selector, args.all_servers) if t]
+    if len(targets) > 1:
+        raise ValueError("Only one of --server-name, --selector and --all can be provided.")
+    elif not targets:
+        raise ValueError("Either --server-name, --selector or --all must be provided.")
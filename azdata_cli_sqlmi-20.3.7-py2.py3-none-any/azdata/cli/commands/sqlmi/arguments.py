@@ -4,6 +4,7 @@
 
 
 from azdata.cli.commands.sqlmi.constants import SQLMI_LICENSE_TYPE_ALLOWED_VALUES_MSG_CREATE, SQLMI_LICENSE_TYPE_BASE_PRICE, SQLMI_LICENSE_TYPE_LICENSE_INCLUDED, SQLMI_TIER_ALLOWED_VALUES_MSG, SQLMI_TIER_ALLOWED_VALUES_MSG_CREATE, SQLMI_TIER_BUSINESS_CRITICAL, SQLMI_TIER_BUSINESS_CRITICAL_SHORT, SQLMI_TIER_GENERAL_PURPOSE, SQLMI_TIER_GENERAL_PURPOSE_SHORT
+from azdata.cli.commands.arc.trace_util import TRACE_FILE_HELP
 
 
 def load_arguments(self, _):
@@ -169,6 +170,12 @@ def load_arguments(self, _):
             help=_(f"The pricing tier for the instance. {SQLMI_TIER_ALLOWED_VALUES_MSG_CREATE}")
         )
 
+        arg_context.argument(
+            "trace_file",
+            options_list=["--trace-file"],
+            help=_(TRACE_FILE_HELP)
+        )
+
     with ArgumentsContext(self, "arc sql mi edit") as arg_context:
         arg_context.argument(
             "path",
@@ -21,6 +21,11 @@ from azdata.cli.core.constants import (
 from azdata.cli.core.labels import parse_labels
 from azdata.cli.core.prompt import (prompt, prompt_pass)
 from azdata.cli.commands.sqlmi.exceptions import SqlmiError
+from azdata.cli.commands.arc.constants import CONNECTION_RETRY_ATTEMPTS, RETRY_INTERVAL
+from azdata.cli.commands.arc.resource_cache import iter_custom_objects, list_custom_objects
+from azdata.cli.commands.arc.retry_util import retry
+from azdata.cli.commands.arc.template_util import load_template
+from azdata.cli.commands.arc.trace_util import trace_command
 from azdata.cli.commands.sqlmi.util import (
     is_valid_sql_password, 
     is_valid_connectivity_mode,
@@ -42,12 +47,11 @@ from azdata.cli.core.deploy import DeploymentConfigUtil
 from humanfriendly.terminal.spinners import AutomaticSpinner
 from urllib3.exceptions import NewConnectionError, MaxRetryError
 from azdata.cli.core.models.custom_resource import CustomResource
-CONNECTION_RETRY_ATTEMPTS = 12
-RETRY_INTERVAL = 5
 
 logger = get_logger(__name__)
 
 
+@trace_command("arc sql mi create")
 def arc_sql_mi_create(
         client,
         name,
@@ -75,7 +79,8 @@ def arc_sql_mi_create(
         # port=None,
         no_wait=False,
         license_type=None,
-        tier=None):
+        tier=None,
+        trace_file=None):
     """
     Create a SQL managed instance.
     :param client:
@@ -103,6 +108,7 @@ def arc_sql_mi_create(
     :param service_annotations: If specified, applies the set of annotations to all external service specifications.
     :param port: Optional. Default is 31433.
     :param no_wait: If given, the command won't wait for the deployment to be ready before returning.
+    :param trace_file: If given, writes a Chrome trace of the calls made by the command to this file.
     :return:
     """
     args = locals()
@@ -171,27 +177,24 @@ def arc_sql_mi_create(
 
         validate_labels_and_annotations(labels, annotations, service_labels, service_annotations)
 
-        custom_object_exists = util.retry(lambda: client.apis.kubernetes.namespaced_custom_object_exists(
+        custom_object_exists = retry(lambda: client.apis.kubernetes.namespaced_custom_object_exists(
             name, namespace,
             group=API_GROUP,
             version=API_VERSION,
             plural=RESOURCE_KIND_PLURAL),
-                                          retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                          retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                          retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+                                     retry_count=CONNECTION_RETRY_ATTEMPTS,
+                                     retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
+                                     retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
         if custom_object_exists:
             raise ValueError("Arc SQL managed instance `{}` already exists in namespace `{}`.".format(name, namespace))
 
         if not no_external_endpoint:
-            response = util.retry(lambda: client.apis.kubernetes.list_namespaced_custom_object(
-                                            namespace,
-                                            group=ARC_GROUP,
-                                            version=ARC_API_VERSION,
-                                            plural=DATA_CONTROLLER_PLURAL),
-                                  retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                  retry_delay=RETRY_INTERVAL,
-                                  retry_method="list namespaced custom object",
-                                  retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+            response = retry(lambda: list_custom_objects(client, namespace, ARC_GROUP, ARC_API_VERSION,
+                                                         DATA_CONTROLLER_PLURAL),
+                             retry_count=CONNECTION_RETRY_ATTEMPTS,
+                             retry_delay=RETRY_INTERVAL,
+                             retry_method="list namespaced custom object",
+                             retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
             dcs = response.get("items")
             if not dcs:
@@ -206,10 +209,10 @@ def arc_sql_mi_create(
         #
         secret_name = name + "-login-secret"
 
-        secret_exists = util.retry(lambda: client.apis.kubernetes.secret_exists(cr.metadata.namespace, secret_name),
-                                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                   retry_delay=RETRY_INTERVAL, retry_method="secret exists",
-                                   retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
+        secret_exists = retry(lambda: client.apis.kubernetes.secret_exists(cr.metadata.namespace, secret_name),
+                              retry_count=CONNECTION_RETRY_ATTEMPTS,
+                              retry_delay=RETRY_INTERVAL, retry_method="secret exists",
+                              retry_on_exceptions=(NewConnectionError, MaxRetryError, K8sApiException))
 
         if not secret_exists:
 
@@ -255,13 +258,12 @@ def arc_sql_mi_create(
                 bytes(username, encoding)).decode(encoding)
             secrets["base64Password"] = base64.b64encode(
                 bytes(pw, encoding)).decode(encoding)
-            temp = util.get_config_from_template(
+            mssql_secret = load_template(
                 os.path.join(os.path.dirname(os.path.realpath(__file__)), "templates", "useradmin-login.yaml.tmpl"),
                 secrets)
-            mssql_secret = yaml.safe_load(temp)
 
             try:
-                util.retry(
+                retry(
                     lambda: client.apis.kubernetes.create_secret(cr.metadata.namespace, mssql_secret, ignore_conflict=True),
                     retry_count=CONNECTION_RETRY_ATTEMPTS,
                     retry_delay=RETRY_INTERVAL, retry_method="create secret",
@@ -273,10 +275,10 @@ def arc_sql_mi_create(
 
         # Create custom resource
         #
-        util.retry(lambda: client.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=RESOURCE_KIND_PLURAL, ignore_conflict=True),
-                   retry_count=CONNECTION_RETRY_ATTEMPTS,
-                   retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
-                   retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+        retry(lambda: client.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=RESOURCE_KIND_PLURAL, ignore_conflict=True),
+              retry_count=CONNECTION_RETRY_ATTEMPTS,
+              retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
+              retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
 
         if no_wait:
             client.stdout(
@@ -292,28 +294,28 @@ def arc_sql_mi_create(
                                       show_time=True):
                     while not _is_instance_ready(deployed_cr):
                         time.sleep(5)
-                        response = util.retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                                                        cr.metadata.name, cr.metadata.namespace,
-                                                        group=API_GROUP,
-                                                        version=API_VERSION,
-                                                        plural=RESOURCE_KIND_PLURAL),
-                                              retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                              retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                              retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+                        response = retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
+                                                   cr.metadata.name, cr.metadata.namespace,
+                                                   group=API_GROUP,
+                                                   version=API_VERSION,
+                                                   plural=RESOURCE_KIND_PLURAL),
+                                         retry_count=CONNECTION_RETRY_ATTEMPTS,
+                                         retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
+                                         retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
 
                         deployed_cr = CustomResource.decode(SqlmiCustomResource, response)
             else:
                 client.stdout('Deploying {0} in namespace `{1}`'.format(name, namespace))
                 while not _is_instance_ready(deployed_cr):
                     time.sleep(5)
-                    response = util.retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                                                    cr.metadata.name, cr.metadata.namespace,
-                                                    group=API_GROUP,
-                                                    version=API_VERSION,
-                                                    plural=RESOURCE_KIND_PLURAL),
-                                          retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                          retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                          retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+                    response = retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
+                                               cr.metadata.name, cr.metadata.namespace,
+                                               group=API_GROUP,
+                                               version=API_VERSION,
+                                               plural=RESOURCE_KIND_PLURAL),
+                                     retry_count=CONNECTION_RETRY_ATTEMPTS,
+                                     retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
+                                     retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
 
                     deployed_cr = CustomResource.decode(SqlmiCustomResource, response)
 
@@ -537,23 +539,20 @@ def arc_sql_mi_list(client):
         # TODO: Support user supplied namespace when the backend supports it
         namespace = client.profile.active_context.namespace
 
-        response = client.apis.kubernetes.list_namespaced_custom_object(
-            namespace, group=API_GROUP, version=API_VERSION, plural=RESOURCE_KIND_PLURAL
-        )
-
-        items = response.get("items")
-
         result = []
 
         # Temporary, need to discuss what the intended structure is across partners
         #
-        for item in items:
-            cr = CustomResource.decode(SqlmiCustomResource, item)
+        # Only the listed fields are read from each item, without decoding it into a
+        # SqlmiCustomResource, and items are fetched page by page.
+        #
+        for item in iter_custom_objects(namespace, API_GROUP, API_VERSION, RESOURCE_KIND_PLURAL):
+            status = item.get("status") or {}
             result.append(
-                {"name": cr.metadata.name,
-                 "primaryEndpoint": cr.status.primaryEndpoint,
-                 "replicas": cr.status.readyReplicas,
-                 "state": cr.status.state})
+                {"name": item["metadata"]["name"],
+                 "primaryEndpoint": status.get("primaryEndpoint"),
+                 "replicas": status.get("readyReplicas"),
+                 "state": status.get("state")})
 
         return result
 
@@ -750,10 +749,10 @@ def CustomResourceFuntion(client, cr):
     
     # Create custom resource
     #
-    util.retry(lambda: client.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=DAG_RESOURCE_KIND_PLURAL, ignore_conflict=True),
-               retry_count=CONNECTION_RETRY_ATTEMPTS,
-               retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
-               retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+    retry(lambda: client.apis.kubernetes.create_namespaced_custom_object(cr=cr, plural=DAG_RESOURCE_KIND_PLURAL, ignore_conflict=True),
+          retry_count=CONNECTION_RETRY_ATTEMPTS,
+          retry_delay=RETRY_INTERVAL, retry_method="create namespaced custom object",
+          retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
     
     client.stdout('waiting...')
     state = None
@@ -762,14 +761,14 @@ def CustomResourceFuntion(client, cr):
                               show_time=True):
             while state != 'succeeded' and state != 'failed' or state is None:
                 time.sleep(5)
-                response = util.retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                                                cr.metadata.name, cr.metadata.namespace,
-                                                group=DAG_API_GROUP,
-                                                version=DAG_API_VERSION,
-                                                plural=DAG_RESOURCE_KIND_PLURAL),
-                                      retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                      retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                      retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+                response = retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
+                                           cr.metadata.name, cr.metadata.namespace,
+                                           group=DAG_API_GROUP,
+                                           version=DAG_API_VERSION,
+                                           plural=DAG_RESOURCE_KIND_PLURAL),
+                                 retry_count=CONNECTION_RETRY_ATTEMPTS,
+                                 retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
+                                 retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
     
                 deployed_cr = CustomResource.decode(DagCustomResource, response)
                 state = deployed_cr.status.state
@@ -780,14 +779,14 @@ def CustomResourceFuntion(client, cr):
         client.stdout('Deploying {0} in namespace `{1}`'.format(name, namespace))
         while state != 'succeeded' and state != 'failed' or state is None:
             time.sleep(5)
-            response = util.retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
-                                            cr.metadata.name, cr.metadata.namespace,
-                                            group=DAG_API_GROUP,
-                                            version=DAG_API_VERSION,
-                                            plural=DAG_RESOURCE_KIND_PLURAL),
-                                  retry_count=CONNECTION_RETRY_ATTEMPTS,
-                                  retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
-                                  retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
+            response = retry(lambda: client.apis.kubernetes.get_namespaced_custom_object(
+                                       cr.metadata.name, cr.metadata.namespace,
+                                       group=DAG_API_GROUP,
+                                       version=DAG_API_VERSION,
+                                       plural=DAG_RESOURCE_KIND_PLURAL),
+                             retry_count=CONNECTION_RETRY_ATTEMPTS,
+                             retry_delay=RETRY_INTERVAL, retry_method="get namespaced custom object",
+                             retry_on_exceptions=(NewConnectionError, MaxRetryError, KubernetesError))
     
             deployed_cr = CustomResource.decode(DagCustomResource, response)
             state = deployed_cr.status.state